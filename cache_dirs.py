@@ -0,0 +1,34 @@
+"""Location of the on-disk caches.
+
+The caches (config snapshots, openHAB detection, parsed projects, room
+fragments) live below one root outside the source tree: ``$KNX_CACHE_DIR``
+if set, else the user cache directory (``$XDG_CACHE_HOME/knx_to_openhab`` or
+``~/.cache/knx_to_openhab``, ``%LOCALAPPDATA%/knx_to_openhab/cache`` on
+Windows). Each cache can still be moved on its own with its environment
+variable.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+APP_NAME = "knx_to_openhab"
+
+
+def cache_root() -> Path:
+    """Root directory of all caches ($KNX_CACHE_DIR or the user cache directory)."""
+    root = os.environ.get("KNX_CACHE_DIR")
+    if root:
+        return Path(root)
+    if sys.platform == "win32" and os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / APP_NAME / "cache"
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / APP_NAME
+
+
+def cache_dir(name, env_var=None, cache_dir=None) -> Path:
+    """Directory of one cache: ``cache_dir``, then ``$env_var``, then ``<root>/<name>``."""
+    if cache_dir:
+        return Path(cache_dir)
+    if env_var and os.environ.get(env_var):
+        return Path(os.environ[env_var])
+    return cache_root() / name
@@ -1,137 +1,332 @@
+import hashlib
 import json
 import logging
 import os
+import pickle
 import re
 import subprocess
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import Any, Dict, Optional
 
-logger = logging.getLogger(__name__)
-
-config: Dict[str, Any] = {}
+import cache_dirs
+from ets_helpers import NORMALIZE_CACHE_SIZE, normalize_cache_stats, normalize_string  # noqa: F401
 
+logger = logging.getLogger(__name__)
 
-def normalize_string(text: str):
-    """Remove non-alphanumeric characters and convert to lowercase (unicode)."""
-    return re.sub(r"\W+", "", text.casefold())
+CONFIG_FILE = "config.json"
+# bump when compile_config() changes, so cached snapshots are compiled again
+SNAPSHOT_FORMAT = 1
+OPENHAB_CONF_CACHE_NAME = "openhab_conf.json"
+OPENHAB_CONF_TTL = 3600
 
+OPENHAB_PATH_KEYS = (
+    "items_path",
+    "things_path",
+    "sitemaps_path",
+    "influx_path",
+    "fenster_path",
+    "transform_dir_path",
+)
+OPENHAB_KEYS = OPENHAB_PATH_KEYS + ("target_user", "target_group", "openhab_path")
 
-def main():
-    """Main function"""
-    with open("config.json", encoding="utf8") as f:
-        cfg = json.load(f)
+SPECIAL_CHAR_MAP = {
+    ord("Ä"): "Ae",
+    ord("Ü"): "Ue",
+    ord("Ö"): "Oe",
+    ord("ä"): "ae",
+    ord("ü"): "ue",
+    ord("ö"): "oe",
+    ord("ß"): "ss",
+    ord("é"): "e",
+    ord("è"): "e",
+    ord("á"): "a",
+    ord("à"): "a",
+}
 
-    def _normalize(v):
-        if isinstance(v, dict):
-            v = _normalize_dict(v)
-        elif isinstance(v, list):
-            v = _normalize_list(v)
-        elif isinstance(v, tuple):
-            v = _normalize_list(v)
-        elif isinstance(v, str):
-            v = normalize_string(v)
-        return v
+snapshot: Optional["ConfigSnapshot"] = None
+# Mappings für Datenpunkttypen
+datapoint_mappings = MappingProxyType({})
 
-    def _normalize_list(items):
-        """Recursively normalizes strings within a list in-place."""
-        for idx, v in enumerate(items):
-            items[idx] = _normalize(v)
-        return items
+_snapshots: Dict[str, "ConfigSnapshot"] = {}
+_openhab_conf = None  # (detected_at, (conf, user, group))
+_openhab_conf_refresh: Optional[threading.Thread] = None
+_openhab_conf_lock = threading.Lock()
 
-    def _normalize_dict(d):
-        """Recursively normalizes strings within a dictionary in-place."""
-        for k, v in d.items():
-            d[k] = _normalize(v)
-        return d
 
+def compile_config(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize the raw config.json content (suffix lists become frozensets)."""
     for idef in cfg["defines"]:
         if isinstance(cfg["defines"][idef], dict):
             for xidef in cfg["defines"][idef]:
                 if "suffix" in xidef:
                     if isinstance(cfg["defines"][idef][xidef], list):
-                        cfg["defines"][idef][xidef] = [
+                        # normalized and without duplicates
+                        cfg["defines"][idef][xidef] = frozenset(
                             normalize_string(element) for element in cfg["defines"][idef][xidef]
-                        ]
-                        # remove duplicates
-                        cfg["defines"][idef][xidef] = list(set(cfg["defines"][idef][xidef]))
-    global config
-    config = cfg
-
-    # helper for openhab detection
-    def get_openhab_conf():
-        """
-        Detects OPENHAB_CONF, User, and Group.
-        Priority:
-        1. openhab-cli info
-        2. web_ui/backend/config.json
-        3. Default (local 'openhab' dir, current user)
-        """
-        oh_conf = None
-        oh_user = None
-        oh_group = None
-
-        # 1. Try openhab-cli
-        try:
-            # We use shell=True/False depending on OS, but openhab-cli is usually linux specific.
-            # On Windows this will likely fail or require powershell if openhab-cli is in path.
-            # We'll assume standard linux environment for openhab-cli, but wrap in generic subprocess.
-            proc = subprocess.run(
-                ["openhab-cli", "info"], capture_output=True, text=True, timeout=5
-            )
-            if proc.returncode == 0:
-                output = proc.stdout
-                for line in output.splitlines():
-                    if "OPENHAB_CONF" in line:
-                        # expected: OPENHAB_CONF     | /etc/openhab                | ...
-                        parts = line.split("|")
-                        if len(parts) >= 2:
-                            oh_conf = parts[1].strip()
-                    if line.strip().startswith("User:"):
-                        # expected: User:        openhab (Active Process 3201)
-                        # or:       User:        openhab
-                        parts = line.split(":", 1)[1].strip().split(" ")
-                        if parts:
-                            oh_user = parts[0]
-                    if "User Groups:" in line:
-                        # expected: User Groups: openhab tty dialout audio
-                        parts = line.split(":", 1)[1].strip().split(" ")
-                        if parts:
-                            oh_group = parts[0]
-        except (FileNotFoundError, subprocess.SubprocessError, OSError):
-            logger.debug("openhab-cli not found or failed.")
-
-        if oh_conf:
-            logger.info("Detected OPENHAB_CONF via CLI: %s", oh_conf)
-            logger.info("Detected User: %s, Group: %s", oh_user, oh_group)
-            return oh_conf, oh_user, oh_group
-
-        # 2. Try web_ui config fallback
-        try:
-            web_cfg_path = Path(__file__).parent / "web_ui" / "backend" / "config.json"
-            if web_cfg_path.exists():
-                with open(web_cfg_path, "r", encoding="utf-8") as f:
-                    web_cfg = json.load(f)
-                    if "openhab_path" in web_cfg:
-                        fallback_path = web_cfg["openhab_path"]
-                        # If it's relative, make it absolute relative to project?
-                        # Or just take as is. The user request implied searching there.
-                        # Assuming it might be an absolute path or relative to known location.
-                        # If it's just "openhab", it's same as default level 3.
-                        if os.path.isabs(fallback_path):
-                            oh_conf = fallback_path
-        except Exception as e:
-            logger.warning("Failed to read web_ui config: %s", e)
-
-        if oh_conf:
-            logger.info("Detected OPENHAB_CONF via web_ui config: %s", oh_conf)
-            # Default user/group if fallback found but not via CLI
-            return oh_conf, "openhab", "openhab"
-
-        # 3. Default
-        logger.info("Using default local 'openhab' configuration.")
-        return "openhab", None, None  # None implies current user/group
-
-    oh_conf, oh_user, oh_group = get_openhab_conf()
+                        )
+    return cfg
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, (dict, MappingProxyType)):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+class ConfigSnapshot:
+    """Read-only, compiled view of one config.json content.
+
+    ``data`` mirrors config.json with mappings and tuples instead of dicts and
+    lists and frozensets for the ``*_suffix`` lists. ``patterns`` holds the
+    compiled ``regexpattern`` entries, ``datapoint_mappings`` is keyed by DPT.
+    A snapshot pickles to its compiled content, so restoring it from the cache
+    does not normalize again.
+    """
+
+    def __init__(self, compiled: Dict[str, Any], digest: str):
+        self.digest = digest
+        self._compiled = compiled
+        self.data = _freeze(compiled)
+        self.patterns = MappingProxyType(
+            {key: re.compile(value) for key, value in compiled.get("regexpattern", {}).items()}
+        )
+        self.datapoint_mappings = self.data.get("datapoint_mappings", MappingProxyType({}))
+
+    def __reduce__(self):
+        return (ConfigSnapshot, (self._compiled, self.digest))
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Mutable copy for one run; changes to it never reach the snapshot."""
+        return _thaw(self.data)
+
+
+def get_cache_dir(cache_dir=None) -> Path:
+    """Return the config cache directory (argument, $KNX_CONFIG_CACHE_DIR or cache root)."""
+    return cache_dirs.cache_dir("config", "KNX_CONFIG_CACHE_DIR", cache_dir)
+
+
+def _snapshot_path(digest, cache_dir=None) -> Path:
+    return get_cache_dir(cache_dir) / f"{digest[:32]}-v{SNAPSHOT_FORMAT}.pickle"
+
+
+def load_snapshot(path=CONFIG_FILE, cache_dir=None, store=True) -> ConfigSnapshot:
+    """Return the snapshot of ``path``, from the on-disk cache when its content is known.
+
+    A newly compiled snapshot is written to the cache unless ``store`` is False
+    (see save_snapshot()).
+    """
+    raw = Path(path).read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    snapshot = _snapshots.get(digest)
+    if snapshot is not None:
+        return snapshot
+
+    cache_path = _snapshot_path(digest, cache_dir)
+    try:
+        snapshot = pickle.loads(cache_path.read_bytes())
+    except FileNotFoundError:
+        pass
+    except Exception as e:  # corrupt or incompatible entry: compile again
+        logger.warning("Ignoring unreadable config snapshot %s: %s", cache_path, e)
+    if not isinstance(snapshot, ConfigSnapshot) or snapshot.digest != digest:
+        snapshot = ConfigSnapshot(compile_config(json.loads(raw)), digest)
+        if store:
+            save_snapshot(snapshot, cache_dir)
+    _snapshots[digest] = snapshot
+    return snapshot
+
+
+def save_snapshot(snapshot=None, cache_dir=None):
+    """Write ``snapshot`` (default: the loaded one) to the cache if it is not there yet.
+
+    Importing this module only reads the cache; entry points call this so the
+    next process starts without compiling config.json.
+    """
+    snapshot = snapshot if snapshot is not None else globals()["snapshot"]
+    cache_path = _snapshot_path(snapshot.digest, cache_dir)
+    if cache_path.exists():
+        return
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning("Could not write config snapshot %s: %s", cache_path, e)
+
+
+def detect_openhab_conf():
+    """
+    Detects OPENHAB_CONF, User, and Group (uncached, see get_openhab_conf()).
+    Priority:
+    1. openhab-cli info
+    2. web_ui/backend/config.json
+    3. Default (local 'openhab' dir, current user)
+    """
+    oh_conf = None
+    oh_user = None
+    oh_group = None
+
+    # 1. Try openhab-cli
+    try:
+        # We use shell=True/False depending on OS, but openhab-cli is usually linux specific.
+        # On Windows this will likely fail or require powershell if openhab-cli is in path.
+        # We'll assume standard linux environment for openhab-cli, but wrap in generic subprocess.
+        proc = subprocess.run(["openhab-cli", "info"], capture_output=True, text=True, timeout=5)
+        if proc.returncode == 0:
+            output = proc.stdout
+            for line in output.splitlines():
+                if "OPENHAB_CONF" in line:
+                    # expected: OPENHAB_CONF     | /etc/openhab                | ...
+                    parts = line.split("|")
+                    if len(parts) >= 2:
+                        oh_conf = parts[1].strip()
+                if line.strip().startswith("User:"):
+                    # expected: User:        openhab (Active Process 3201)
+                    # or:       User:        openhab
+                    parts = line.split(":", 1)[1].strip().split(" ")
+                    if parts:
+                        oh_user = parts[0]
+                if "User Groups:" in line:
+                    # expected: User Groups: openhab tty dialout audio
+                    parts = line.split(":", 1)[1].strip().split(" ")
+                    if parts:
+                        oh_group = parts[0]
+    except (FileNotFoundError, subprocess.SubprocessError, OSError):
+        logger.debug("openhab-cli not found or failed.")
+
+    if oh_conf:
+        logger.info("Detected OPENHAB_CONF via CLI: %s", oh_conf)
+        logger.info("Detected User: %s, Group: %s", oh_user, oh_group)
+        return oh_conf, oh_user, oh_group
+
+    # 2. Try web_ui config fallback
+    try:
+        web_cfg_path = Path(__file__).parent / "web_ui" / "backend" / "config.json"
+        if web_cfg_path.exists():
+            with open(web_cfg_path, "r", encoding="utf-8") as f:
+                web_cfg = json.load(f)
+                if "openhab_path" in web_cfg:
+                    fallback_path = web_cfg["openhab_path"]
+                    # If it's relative, make it absolute relative to project?
+                    # Or just take as is. The user request implied searching there.
+                    # Assuming it might be an absolute path or relative to known location.
+                    # If it's just "openhab", it's same as default level 3.
+                    if os.path.isabs(fallback_path):
+                        oh_conf = fallback_path
+    except Exception as e:
+        logger.warning("Failed to read web_ui config: %s", e)
+
+    if oh_conf:
+        logger.info("Detected OPENHAB_CONF via web_ui config: %s", oh_conf)
+        # Default user/group if fallback found but not via CLI
+        return oh_conf, "openhab", "openhab"
+
+    # 3. Default
+    logger.info("Using default local 'openhab' configuration.")
+    return "openhab", None, None  # None implies current user/group
+
+
+def _openhab_conf_ttl() -> float:
+    try:
+        return float(os.environ.get("KNX_OPENHAB_CONF_TTL", OPENHAB_CONF_TTL))
+    except ValueError:
+        return OPENHAB_CONF_TTL
+
+
+def _read_openhab_conf_cache(path: Path):
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        return float(entry["detected_at"]), tuple(entry["openhab_conf"])
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning("Ignoring unreadable openHAB detection cache %s: %s", path, e)
+        return None
+
+
+def _refresh_openhab_conf(path: Path):
+    """Run the detection and store its result in memory and in ``path``."""
+    global _openhab_conf
+    result = detect_openhab_conf()
+    entry = (time.time(), tuple(result))
+    with _openhab_conf_lock:
+        _openhab_conf = entry
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(
+            json.dumps({"detected_at": entry[0], "openhab_conf": entry[1]}), encoding="utf-8"
+        )
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not write openHAB detection cache %s: %s", path, e)
+    return entry[1]
+
+
+def _refresh_in_background(path: Path):
+    global _openhab_conf_refresh
+    with _openhab_conf_lock:
+        if _openhab_conf_refresh is not None and _openhab_conf_refresh.is_alive():
+            return
+        _openhab_conf_refresh = threading.Thread(
+            target=_refresh_openhab_conf, args=(path,), name="openhab-conf-refresh", daemon=True
+        )
+        _openhab_conf_refresh.start()
+
+
+def openhab_conf_cache_path(cache_dir=None) -> Path:
+    """File of the cached detection, next to the config snapshots below the cache root."""
+    return get_cache_dir(cache_dir) / OPENHAB_CONF_CACHE_NAME
+
+
+def get_openhab_conf(ttl=None, cache_dir=None):
+    """Cached detect_openhab_conf() result as ``(conf, user, group)``.
+
+    Without a cached result the detection runs right away. A result older than
+    ``ttl`` seconds ($KNX_OPENHAB_CONF_TTL, default one hour) is still returned,
+    while a background thread detects again. ``ttl <= 0`` disables the cache.
+    """
+    global _openhab_conf
+    ttl = _openhab_conf_ttl() if ttl is None else ttl
+    if ttl <= 0:
+        return detect_openhab_conf()
+
+    path = openhab_conf_cache_path(cache_dir)
+    with _openhab_conf_lock:
+        entry = _openhab_conf
+    if entry is None:
+        entry = _read_openhab_conf_cache(path)
+        if entry is None:
+            return _refresh_openhab_conf(path)
+        with _openhab_conf_lock:
+            _openhab_conf = entry
+    detected_at, result = entry
+    if time.time() - detected_at > ttl:
+        _refresh_in_background(path)
+    return result
+
+
+def apply_openhab_conf(values: Dict[str, Any], openhab_conf) -> Dict[str, Any]:
+    """Adapt the raw ``OPENHAB_KEYS`` values of config.json to a detected location."""
+    oh_conf, oh_user, oh_group = openhab_conf
+    cfg = dict(values)
 
     # Update paths in config
     # We will assume that if oh_conf is set, we want to append the subdirectories
@@ -140,35 +335,26 @@ def main():
     #   "items_path": "openhab/items/knx.items",
     # We should replace the leading 'openhab' (or base) with oh_conf if it's absolute.
 
-    paths_to_update = [
-        "items_path",
-        "things_path",
-        "sitemaps_path",
-        "influx_path",
-        "fenster_path",
-        "transform_dir_path",
-    ]
-
     if os.path.isabs(oh_conf):
         # We need to be careful. The keys in config.json already include the folders (things/ items/).
         # Standard OPENHAB_CONF is /etc/openhab.
         # Standard subdirs are /etc/openhab/items, /etc/openhab/things.
         # The existing config values are like "openhab/items/knx.items".
         # We should strip the first component "openhab" and prepend oh_conf.
-        for key in paths_to_update:
-            if key in config:
+        for key in OPENHAB_PATH_KEYS:
+            if key in cfg:
                 # heuristic: strip first part if it matches 'openhab' or just take the rest?
                 # safer: assume the file structure inside OPENHAB_CONF is standard.
                 # items -> items/, things -> things/, etc.
                 # Let's rely on the subdirectory names.
                 # If path contains 'items/', we map to oh_conf/items/filename
-                p = Path(config[key])
+                p = Path(cfg[key])
                 # We want to preserve the relative path structure *after* the base directory.
                 # Current base is 'openhab'.
                 # We can try to use relative_to('openhab') provided the string starts with openhab.
                 try:
                     rel = p.relative_to("openhab")
-                    config[key] = str(Path(oh_conf) / rel)
+                    cfg[key] = str(Path(oh_conf) / rel)
                 except ValueError:
                     # Fallback logic if it doesn't start with openhab
                     # Just append it? Or warn?
@@ -176,42 +362,149 @@ def main():
                     # But if we found OPENHAB_CONF, we probably want to force it there.
                     # Let's map based on parent dir name.
                     if "items" in p.parts:
-                        config[key] = str(Path(oh_conf) / "items" / p.name)
+                        cfg[key] = str(Path(oh_conf) / "items" / p.name)
                     elif "things" in p.parts:
-                        config[key] = str(Path(oh_conf) / "things" / p.name)
+                        cfg[key] = str(Path(oh_conf) / "things" / p.name)
                     elif "sitemaps" in p.parts:
-                        config[key] = str(Path(oh_conf) / "sitemaps" / p.name)
+                        cfg[key] = str(Path(oh_conf) / "sitemaps" / p.name)
                     elif "persistence" in p.parts:
-                        config[key] = str(Path(oh_conf) / "persistence" / p.name)
+                        cfg[key] = str(Path(oh_conf) / "persistence" / p.name)
                     elif "rules" in p.parts:
-                        config[key] = str(Path(oh_conf) / "rules" / p.name)
+                        cfg[key] = str(Path(oh_conf) / "rules" / p.name)
                     elif "transform" in p.parts:
-                        config[key] = str(Path(oh_conf) / "transform" / p.name)
+                        cfg[key] = str(Path(oh_conf) / "transform" / p.name)
                     else:
                         # fallback, just put it in conf root? or keep absolute?
                         # If it is already absolute, do nothing.
                         if not p.is_absolute():
-                            config[key] = str(Path(oh_conf) / p.name)
+                            cfg[key] = str(Path(oh_conf) / p.name)
+
+    cfg["target_user"] = oh_user
+    cfg["target_group"] = oh_group
+    cfg["openhab_path"] = oh_conf
+    return cfg
+
+
+def _resolving(method):
+    """Wrap a dict ``method`` so that it sees the deferred openHAB keys."""
+
+    def wrapper(self, *args, **kwargs):
+        self.resolve_openhab_conf()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+class Config(dict):
+    """Configuration dict whose openHAB location is detected on first use.
+
+    The ``OPENHAB_KEYS`` are filled in from get_openhab_conf() the first time
+    one of them is read, or the first time the whole dict is read (iteration,
+    ``items()``, ``dict(config)``, ``json.dumps(config)``, copies, pickling),
+    so loading the configuration never runs openhab-cli. Values assigned
+    before that are kept.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._unresolved = None
+
+    def defer_openhab_conf(self, values: Dict[str, Any]):
+        """Detect the openHAB location for the raw ``values`` when first needed."""
+        self._unresolved = values
+
+    def resolve_openhab_conf(self):
+        """Fill in the deferred ``OPENHAB_KEYS`` now."""
+        values, self._unresolved = self._unresolved, None
+        if values is not None:
+            for key, value in apply_openhab_conf(values, get_openhab_conf()).items():
+                self.setdefault(key, value)
+
+    def _resolve_key(self, key):
+        if key in OPENHAB_KEYS and self._unresolved is not None:
+            self.resolve_openhab_conf()
+
+    def __missing__(self, key):
+        if key in OPENHAB_KEYS and self._unresolved is not None:
+            self.resolve_openhab_conf()
+            return self[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        self._resolve_key(key)
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        self._resolve_key(key)
+        return super().__contains__(key)
 
-    config["target_user"] = oh_user
-    config["target_group"] = oh_group
-    config["openhab_path"] = oh_conf
+    def __delitem__(self, key):
+        self._resolve_key(key)
+        super().__delitem__(key)
+
+    def pop(self, key, *default):
+        self._resolve_key(key)
+        return super().pop(key, *default)
+
+    # every route that reads the whole dict resolves first
+    keys = _resolving(dict.keys)
+    values = _resolving(dict.values)
+    items = _resolving(dict.items)
+    popitem = _resolving(dict.popitem)
+    __iter__ = _resolving(dict.__iter__)
+    __len__ = _resolving(dict.__len__)
+    __repr__ = _resolving(dict.__repr__)
+    __eq__ = _resolving(dict.__eq__)
+    __ne__ = _resolving(dict.__ne__)
+    __or__ = _resolving(dict.__or__)
+    __ror__ = _resolving(dict.__ror__)
+    __reduce_ex__ = _resolving(dict.__reduce_ex__)
+
+    def copy(self):
+        """Plain dict copy including the openHAB keys."""
+        self.resolve_openhab_conf()
+        return dict(self)
+
+
+config = Config()
+
+
+def resolve_config(snapshot: ConfigSnapshot) -> Dict[str, Any]:
+    """Plain config dict of ``snapshot`` for one run, with the openHAB keys filled in.
+
+    Unlike the shared ``config`` it is built anew for every call, so runs that
+    load the snapshot each time (web UI jobs) follow config.json edits.
+    """
+    cfg = snapshot.to_dict()
+    cfg["special_char_map"] = dict(SPECIAL_CHAR_MAP)
+    unresolved = {key: cfg.pop(key) for key in OPENHAB_KEYS if key in cfg}
+    cfg.update(apply_openhab_conf(unresolved, get_openhab_conf()))
+    return cfg
+
+
+def main(store_snapshot=True):
+    """Load config.json into the shared ``config`` dict.
+
+    The dict is updated in place, so every module that imported it sees the
+    new values and changes made by an earlier run are dropped. The openHAB
+    location is only detected when one of its keys is read. With
+    ``store_snapshot`` a newly compiled snapshot is written to the cache.
+    """
+    global snapshot, datapoint_mappings
+    snapshot = load_snapshot(store=store_snapshot)
+    cfg = snapshot.to_dict()
+    cfg["special_char_map"] = dict(SPECIAL_CHAR_MAP)
+    unresolved = {key: cfg.pop(key) for key in OPENHAB_KEYS if key in cfg}
+
+    config.update(cfg)
+    for key in set(config) - set(cfg):
+        del config[key]
+    config.defer_openhab_conf(unresolved)
+    datapoint_mappings = snapshot.datapoint_mappings
 
 
 # if __name__ == "__main__":
-main()
-config["special_char_map"] = {
-    ord("Ä"): "Ae",
-    ord("Ü"): "Ue",
-    ord("Ö"): "Oe",
-    ord("ä"): "ae",
-    ord("ü"): "ue",
-    ord("ö"): "oe",
-    ord("ß"): "ss",
-    ord("é"): "e",
-    ord("è"): "e",
-    ord("á"): "a",
-    ord("à"): "a",
-}
-# Mappings für Datenpunkttypen
-datapoint_mappings = config["datapoint_mappings"]
+# loading on import never writes the cache, see save_snapshot()
+main(store_snapshot=False)
@@ -4,14 +4,41 @@ This module contains functions extracted from gen_building() to allow
 proper unit testing and code reusability. These functions handle:
 
 - Communication object flag extraction and matching
+- Normalized strings and function texts of communication objects
 - Data point type (DPT) extraction from device communication objects
 - Address filtering based on flags and DPT types
+- Cleanup of item labels
 
 These utilities are critical for correctly mapping KNX datapoints to
 OpenHAB items in the code generator.
 """
 
-from typing import Any, Dict, Optional
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# distinct texts kept by the normalize_string() memo
+NORMALIZE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_string(text: str):
+    """Remove non-alphanumeric characters and convert to lowercase (unicode).
+
+    Results are memoized; ``normalize_cache_stats()`` reports the hit rate.
+    """
+    return re.sub(r"\W+", "", text.casefold())
+
+
+def normalize_cache_stats() -> Dict[str, int]:
+    """Hits, misses and size of the normalize_string() memo (cumulative per process)."""
+    info = normalize_string.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+    }
 
 
 def get_co_flags(co: Dict[str, Any]) -> Optional[Dict[str, bool]]:
@@ -113,6 +140,31 @@ def flags_match(
     return True
 
 
+def get_normalized_function_text(co: Dict[str, Any]) -> str:
+    """Return the normalized function text of a communication object.
+
+    ``get_addresses()`` stores the normalized text on every extracted
+    communication object as ``function_text_normalized``, so it is computed
+    once per object instead of once per lookup. Objects without it (e.g. from
+    hand-built test data) are normalized on the fly.
+
+    Args:
+        co: Communication object dictionary with optional 'function_text' key.
+
+    Returns:
+        The function text without non-alphanumeric characters in lower case,
+        an empty string if the CO has no function text.
+
+    Example:
+        >>> get_normalized_function_text({'function_text': 'Dimmen, Status'})
+        'dimmenstatus'
+    """
+    text = co.get("function_text_normalized")
+    if text is None:
+        text = normalize_string(co.get("function_text") or "")
+    return text
+
+
 def get_dpt_from_dco(dco: Dict[str, Any]) -> Optional[str]:
     """Extract and format DPT from a device communication object.
 
@@ -171,3 +223,83 @@ def get_dpt_from_dco(dco: Dict[str, Any]) -> Optional[str]:
 
     # Format as "main.sub" with sub zero-padded to 3 digits
     return f"{main}.{sub:03d}"
+
+
+class ItemLabelCleaner:
+    """Turn the group name of a GA into the label of its openHAB item.
+
+    All patterns are compiled once per generation and results are memoized
+    per (label, floor, room), since many GAs of a room share the same label
+    stem. The steps and their order are exactly those gen_building() applied
+    inline before:
+
+    1. Remove the generic ``drop_words``, the short floor name and the
+       ``items_Label`` pattern; ``|`` becomes a space. If nothing is left,
+       the label is kept as it was.
+    2. Replace the room's group name by its display name.
+    3. Remove ``[...]`` and ``|...:`` parts, then non-word characters at the
+       start and end.
+
+    Drop words are removed one after another in config order (a removal can
+    join the text around it into another drop word). The precompiled
+    alternation of all drop words therefore decides whether a label contains
+    any of them at all, which is the rare case.
+
+    Args:
+        drop_words: Words removed from labels (``config['defines']['drop_words']``).
+        label_pattern: Compiled ``items_Label`` pattern of the configuration.
+
+    Example:
+        >>> cleaner = ItemLabelCleaner(['Licht'], re.compile(r':\\(.*\\)\\s?'))
+        >>> cleaner.clean('Licht Decke', 'EG', '+RM1', 'Küche')
+        'Decke'
+    """
+
+    RE_BRACKETS = re.compile(r"\[.*\]")
+    RE_PIPE_COLON = re.compile(r"\|.*\:")
+    RE_EDGE_NON_WORD = re.compile(r"^\W+|\W+$")
+
+    def __init__(self, drop_words: Iterable[str], label_pattern: "re.Pattern[str]"):
+        self.drop_words = tuple(drop_words)
+        self.drop_pattern = (
+            re.compile("|".join(re.escape(word) for word in self.drop_words))
+            if any(self.drop_words)
+            else None
+        )
+        self.label_pattern = label_pattern
+        self.memo: Dict[Tuple[str, str, str, str], str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def clean(self, label: str, floor_short: str, room_group_name: str, room_name: str) -> str:
+        """Return the cleaned label (memoized)."""
+        key = (label, floor_short, room_group_name, room_name)
+        cleaned = self.memo.get(key)
+        if cleaned is not None:
+            self.hits += 1
+            return cleaned
+        self.misses += 1
+        cleaned = self.memo[key] = self._clean(label, floor_short, room_group_name, room_name)
+        return cleaned
+
+    def _clean(self, label, floor_short, room_group_name, room_name):
+        # remove generic description if unneccessary
+        label_short = label
+        if self.drop_pattern is not None and self.drop_pattern.search(label_short):
+            for drop in self.drop_words:
+                label_short = label_short.replace(drop, "")
+        # remove floor and room from label
+        if floor_short:
+            label_short = label_short.replace(floor_short, "")
+        # remove text by item_label pattern
+        label_short = self.label_pattern.sub("", label_short)
+        label_short = label_short.replace("|", " ")
+        label_short = label_short.replace("  ", " ")
+        if label_short != "":
+            label = label_short
+
+        label = label.replace(room_group_name, room_name)
+        label = self.RE_BRACKETS.sub("", label)
+        label = self.RE_PIPE_COLON.sub("", label)
+        label = self.RE_EDGE_NON_WORD.sub("", label)  # removes special chars on start/end
+        return label.strip()
@@ -1,26 +1,36 @@
 """Module providing a collection of function to generate openhab things/items/sitemap from a knxproject"""
 
+import io
 import logging
 import os
 import re
 import shutil
 from typing import Any
 
-from config import config, datapoint_mappings, normalize_string
+import config as config_module
+import fragment_cache as fragment_cache_module
+from config import config, normalize_cache_stats
+from ets_helpers import ItemLabelCleaner, get_normalized_function_text
+from output_writers import (
+    PartWriter,
+    StreamWriter,
+    read_template,
+    remove_stale_parts,
+    split_template,
+    write_manifest,
+)
+from stage_timing import StageTimer
 from utils import get_datapoint_type
 
 logger = logging.getLogger(__name__)
 
-pattern_items_Name: str = config["regexpattern"]["items_Name"]
-pattern_items_Label: str = config["regexpattern"]["items_Label"]
-
-# global house,all_addresses,used_addresses
+# Run state of callers that set it here instead of passing a GenerationContext
 GWIP = None
 B_HOMEKIT = False
 B_ALEXA = False
 HOMEKIT_MAX_ACCESSORIES_PER_INSTANCE = 130
 floors: list[dict[str, Any]] = []
-all_addresses: list[dict[str, Any]] = []
+all_addresses: "list[dict[str, Any]] | AddressStore" = []
 export_to_influx: list[dict[str, Any]] = []
 used_addresses: list[dict[str, Any]] = []
 partial_dimmers: list[dict[str, Any]] = []  # collect incomplete dimmer definitions
@@ -28,11 +38,226 @@ partial_unknowns: list[dict[str, Any]] = []  # collect other partials if needed
 
 equipments = {}
 FENSTERKONTAKTE = []
-PRJ_NAME = "Our Home"
+OUTPUT_PATH_KEYS = {"items": "items_path", "sitemap": "sitemaps_path", "things": "things_path"}
+OUTPUT_SPLIT_MODES = ("building", "floor")
+WINDOW_RULE_MODES = ("cron", "event")
+WINDOW_CONTACT_GROUP = "Base_Fensterkontakte"  # members trigger the event driven window rule
+KNX_BRIDGE_UID = "knx:ip:bridge"  # as defined in things.template
+GENERIC_THING_UID = "knx:device:bridge:generic"  # the Thing inside the bridge
+DEFAULT_PRJ_NAME = "Our Home"
+PRJ_NAME = DEFAULT_PRJ_NAME
+_worker_context: "GenerationContext | None" = None  # context of a floor worker process
+_initial_consumed: frozenset[str] = frozenset()  # address state a floor worker starts from
+
+
+class AddressStore:
+    """Group addresses keyed by GA string, with the set of GAs already consumed.
+
+    Replaces the plain list that gen_building() used to shrink with
+    ``list.remove``: membership, lookup and consumption are constant time and
+    iterating yields the addresses not consumed yet in their original order.
+    Group addresses are unique in an ETS project, later duplicates are ignored.
+
+    If ``observed`` is a set, every GA whose state a lookup depended on is
+    added to it (used to validate floors generated in parallel and cached
+    room fragments); ``observed_names`` likewise collects the Group names
+    looked up.
+    """
+
+    def __init__(self, addresses=()):
+        self.by_address: dict[str, dict[str, Any]] = {}
+        self.position: dict[str, int] = {}
+        self.by_name: dict[str, list[str]] = {}
+        self.consumed: set[str] = set()
+        self.observed: set[str] | None = None
+        self.observed_names: set[str] | None = None
+        for address in addresses:
+            group_address = address["Address"]
+            if group_address not in self.by_address:
+                self.position[group_address] = len(self.by_address)
+                self.by_address[group_address] = address
+                self.by_name.setdefault(address["Group name"], []).append(group_address)
+
+    def __contains__(self, group_address):
+        if self.observed is not None:
+            self.observed.add(group_address)
+        return group_address in self.by_address and group_address not in self.consumed
+
+    def __iter__(self):
+        return (
+            address
+            for group_address, address in self.by_address.items()
+            if group_address not in self.consumed
+        )
+
+    def __len__(self):
+        return len(self.by_address) - len(self.consumed)
+
+    def get(self, group_address):
+        """Return the address dict for a group address string, None if unknown or consumed."""
+        if self.observed is not None:
+            self.observed.add(group_address)
+        if group_address in self.consumed:
+            return None
+        return self.by_address.get(group_address)
+
+    def consume(self, group_address):
+        """Mark a group address as used; unknown addresses are ignored."""
+        if group_address in self.by_address:
+            self.consumed.add(group_address)
+
+    def find_by_name(self, names):
+        """Return the first not consumed address whose Group name is one of ``names``."""
+        found = None
+        for name in names:
+            if self.observed is not None:
+                self.observed.update(self.by_name.get(name, ()))
+            if self.observed_names is not None:
+                self.observed_names.add(name)
+            for group_address in self.by_name.get(name, ()):
+                if group_address in self.consumed:
+                    continue
+                if found is None or self.position[group_address] < self.position[found]:
+                    found = group_address
+                break
+        return self.by_address[found] if found is not None else None
+
+    def linked(self, group_address_links):
+        """Return the not consumed addresses of ``group_address_links`` in store order."""
+        found = {group_address for group_address in group_address_links if group_address in self}
+        return [self.by_address[ga] for ga in sorted(found, key=self.position.__getitem__)]
+
+    def lookup_state(self, group_addresses, names, address_digest, consumed=None):
+        """State of GAs and Group names as seen by lookups, comparable between runs.
+
+        Contains for every GA whether it is available (not in ``consumed``,
+        default: the consumed GAs) and ``address_digest`` of its data, in store
+        order (independent of unrelated addresses), and the GAs of every Group
+        name.
+        """
+        consumed = self.consumed if consumed is None else consumed
+        known = sorted(
+            (ga for ga in group_addresses if ga in self.by_address), key=self.position.__getitem__
+        )
+        return (
+            [(ga, ga not in consumed, address_digest(self.by_address[ga])) for ga in known],
+            sorted(ga for ga in group_addresses if ga not in self.by_address),
+            {name: self.by_name.get(name, []) for name in sorted(names)},
+        )
 
 
-def gen_building():
-    """Generates a Building from an ETS Project"""
+def get_address_store(addresses) -> AddressStore:
+    """Return ``addresses`` as AddressStore, building the index if necessary."""
+    if isinstance(addresses, AddressStore):
+        return addresses
+    return AddressStore(addresses)
+
+
+class GenerationContext:
+    """Input and results of one generation run.
+
+    gen_building(), check_unused_addresses() and export_output() read the
+    project data from the context and collect their results in it, so several
+    runs (web jobs, batch projects, tests) can share one process. The config
+    ``snapshot`` defaults to the one loaded when the context is created. Callers
+    that still set the module-level variables get a context of those
+    (``from_globals``).
+    """
+
+    def __init__(
+        self,
+        floors=None,
+        addresses=(),
+        gwip=None,
+        homekit=False,
+        alexa=False,
+        prj_name=DEFAULT_PRJ_NAME,
+        configuration=None,
+        floor_workers=None,
+        fragment_cache=None,
+        snapshot=None,
+    ):
+        self.floors: list[dict[str, Any]] = floors if floors is not None else []
+        self.all_addresses = get_address_store(addresses)
+        self.gwip = gwip
+        self.homekit = homekit
+        self.alexa = alexa
+        self.prj_name = prj_name
+        self.config = configuration if configuration is not None else config
+        self.snapshot = snapshot if snapshot is not None else config_module.snapshot
+        self.floor_workers = floor_workers
+        self.fragment_cache = fragment_cache
+        self._config_digest = None
+        self.digester = fragment_cache_module.Digester()
+        self.equipments: dict[str, str] = {}
+        self.windows: list[dict[str, str]] = []
+        self.export_to_influx: list[str] = []
+        self.partial_dimmers: list[dict[str, Any]] = []
+        self.partial_unknowns: list[dict[str, Any]] = []
+
+    @classmethod
+    def from_globals(cls, configuration=None):
+        """Context sharing the module-level variables (results are added to them)."""
+        global all_addresses
+        all_addresses = get_address_store(all_addresses)
+        context = cls(floors, all_addresses, GWIP, B_HOMEKIT, B_ALEXA, PRJ_NAME, configuration)
+        context.equipments = equipments
+        context.windows = FENSTERKONTAKTE
+        context.export_to_influx = export_to_influx
+        context.partial_dimmers = partial_dimmers
+        context.partial_unknowns = partial_unknowns
+        return context
+
+    @property
+    def report_dir(self):
+        """Directory of the reports of this run (``openhab_path`` of its config)."""
+        return self.config.get("openhab_path", "openhab")
+
+    @property
+    def patterns(self):
+        """Compiled ``regexpattern`` entries of the config snapshot."""
+        return self.snapshot.patterns
+
+    @property
+    def datapoint_mappings(self):
+        """``datapoint_mappings`` of the config snapshot, keyed by DPT."""
+        return self.snapshot.datapoint_mappings
+
+    def room_fingerprint(self, floor, floor_nr, room, room_nr):
+        """Key of the cached fragments of a room (see fragment_cache)."""
+        if self._config_digest is None:
+            self._config_digest = fragment_cache_module.config_digest(
+                self.config, self.datapoint_mappings
+            )
+        return fragment_cache_module.digest(
+            {
+                "code": fragment_cache_module.code_digest(),
+                "config": self._config_digest,
+                "homekit": self.homekit,
+                "alexa": self.alexa,
+                "floor": {key: value for key, value in floor.items() if key != "rooms"},
+                "floor_nr": floor_nr,
+                "room": room,
+                "room_nr": room_nr,
+            }
+        )
+
+
+def default_fragment_cache(configuration, cache_dir=None):
+    """FragmentCache if ``general.fragment_cache`` is enabled in the configuration, else None."""
+    if configuration["general"].get("fragment_cache", False):
+        return fragment_cache_module.FragmentCache(cache_dir)
+    return None
+
+
+def generate_floor(context, floor, floor_nr):
+    """Generate the item, thing and sitemap fragments of one floor.
+
+    Only the consumed addresses are shared with other floors; everything else
+    that depends on earlier floors (equipments, HomeKit instances) is left to
+    render_building().
+    """
+    used_addresses = []  # claimed by the address being processed
 
     def get_co_by_functiontext(cos, config_functiontexts, checkwriteflag=True):
         """
@@ -56,7 +281,7 @@ def gen_building():
                             if not co["flags"]["write"]:
                                 continue
                 # Überprüfen, ob der Funktions-Text in der Konfiguration vorhanden ist
-                if normalize_string(co["function_text"]) in config_functiontexts:
+                if get_normalized_function_text(co) in config_functiontexts:
                     return co
         return None
 
@@ -190,13 +415,11 @@ def gen_building():
             if not expected_dpts and not expected_flags:
                 # No DPT/flag filtering - use function_text as primary filter
                 if function_texts:
-                    if normalize_string(dco.get("function_text", "")) not in function_texts:
+                    if get_normalized_function_text(dco) not in function_texts:
                         continue
 
             # Search for group address
-            search_address = [
-                x for x in all_addresses if x["Address"] in dco.get("group_address_links", [])
-            ]
+            search_address = context.all_addresses.linked(dco.get("group_address_links", []))
 
             if search_address:
                 candidates.append(
@@ -257,11 +480,9 @@ def gen_building():
                         if group_text != y["text"]:
                             continue
                 # Überprüfen, ob der Funktions-Text in der Konfiguration vorhanden ist
-                if normalize_string(y["function_text"]) in config_functiontexts:
+                if get_normalized_function_text(y) in config_functiontexts:
                     # Suche nach der Adresse, die mit den Gruppenadressen verknüpft ist
-                    search_address = [
-                        x for x in all_addresses if x["Address"] in y["group_address_links"]
-                    ]
+                    search_address = context.all_addresses.linked(y["group_address_links"])
                     # Wenn genau eine Adresse gefunden wurde, gib sie zurück
                     if len(search_address) == 1:
                         return search_address[0]
@@ -306,7 +527,7 @@ def gen_building():
         """
         floor_configuration = ""
         floor_name = floor["Group name"]
-        if config["general"]["FloorNameFromDescription"] and floor["Description"] != "":
+        if context.config["general"]["FloorNameFromDescription"] and floor["Description"] != "":
             floor_name = floor["Description"]
         description = floor["Description"].split(";")
         floor_variables = {
@@ -332,7 +553,7 @@ def gen_building():
         """
         room_configuration = ""
         room_name = room["Group name"]
-        if config["general"]["RoomNameFromDescription"] and room["Description"] != "":
+        if context.config["general"]["RoomNameFromDescription"] and room["Description"] != "":
             room_name = room["Description"]
         # room_name_original = room_name
         description = room["Description"].split(";")
@@ -348,509 +569,812 @@ def gen_building():
         room_configuration += f"Group   map{floor_nr}_{room_nr}   \"{room_variables['name']}\"  {room_variables['icon']}  (map{floor_nr})   {room_variables['semantic']} {room_variables['synonyms']}\n"
         return room_configuration, room_name, room_variables
 
-    items = ""
-    sitemap = ""
-    things = ""
-    floor_nr = 0
-    homekit_instance = 1
-    homekit_accessorie = 0
-    for floor in floors:
-        floor_nr += 1
-        floor_configuration, floor_name = generate_floor_configuration(floor, floor_nr)
-        items += floor_configuration
-        sitemap += f'Frame label="{floor_name}" {{\n'
-
-        room_nr = 0
-        for room in floor["rooms"]:
-            room_nr += 1
-            room_configuration, room_name, room_variables = generate_room_configuration(
-                room, floor_nr, room_nr
+    def handle_dimmer(address, state):
+        """Dimmer with its status, relative and switch GAs (phase 0)."""
+        define = context.config["defines"]["dimmer"]
+        state["define"] = define
+        # bol = [x for x in define['absolut_suffix'] if x in address['Group name']]
+        co = get_co_by_functiontext(address, define["absolut_suffix"])
+        if not co:
+            return False
+
+        basename = address["Group name"]
+        dimmwert_status = get_address_from_dco_enhanced(co, "status_suffix", define)
+        for drop_name in define["drop"]:
+            drop_addr = data_of_name(
+                context.all_addresses,
+                basename,
+                drop_name,
+                define["absolut_suffix"],
             )
-            items += room_configuration
-            sitemap += f"     Group item=map{floor_nr}_{room_nr} {room_variables['visibility']} label=\"{room_name}\" "
-            group = ""
+            if drop_addr:
+                used_addresses.append(drop_addr["Address"])
+        relative_option = ""
+        switch_option = ""
+        switch_option_status = ""
+        if dimmwert_status:
+            state["used"] = True
+            used_addresses.append(dimmwert_status["Address"])
+            relative_command = get_address_from_dco_enhanced(co, "relativ_suffix", define)
+            if relative_command:
+                used_addresses.append(relative_command["Address"])
+                relative_option = f", increaseDecrease=\"{relative_command['Address']}\""
+            switch_command = get_address_from_dco_enhanced(co, "switch_suffix", define)
+            if switch_command:
+                used_addresses.append(switch_command["Address"])
+                switch_status_command = get_address_from_dco_enhanced(
+                    co, "switch_status_suffix", define
+                )
+                if switch_status_command:
+                    used_addresses.append(switch_status_command["Address"])
+                    switch_option_status = f"+<{switch_status_command['Address']}"
+                switch_option = f", switch=\"{switch_command['Address']}{switch_option_status}\""
+
+            state["auto_add"] = True
+            state["item_type"] = "Dimmer"
+            state["thing_address_info"] = (
+                f"position=\"{address['Address']}+<{dimmwert_status['Address']}\""
+                f"{switch_option}{relative_option}"
+            )
+            state["equipment"] = "Lightbulb"
+            state["semantic_info"] = '["Light"]'
+            state["item_icon"] = "light"
+            if context.homekit:
+                state["meta_homekit"] = ', homekit="Lighting, Lighting.Brightness"'
+            if context.alexa:
+                state["meta_alexa"] = ', alexa = "Light"'
+        else:
+            logger.warning(
+                "incomplete dimmer: %s / %s",
+                basename,
+                address["Address"],
+            )
+            partials.append(
+                {
+                    "name": basename,
+                    "address": address["Address"],
+                    "dpt": address.get("DatapointType"),
+                }
+            )
+        return True
 
-            addresses = room["Addresses"]
-            logger.debug("Room: %s and %s Adresses", room_name, len(addresses))
-            # the loop has to be executed twice.
-            # - during the first run, all GAs are processed which can have a reference to another GA (e.g. a switch with status feedback)
-            #   and also all GAs which can not have a reference to another GA. (e.g. temperatures)
-            # - during the second run, all not marked componentes are processed directly with no reference check
-            for run in range(3):
-                for i in range(len(addresses)):
-
-                    address = room["Addresses"][i]
-                    # in the second run: only process not already used addresses
-                    # if run > 0:
-                    if not any(item["Address"] == address["Address"] for item in all_addresses):
-                        # if address['Address'] not in all_addresses:
-                        continue
-                    if address["Address"] == "3/1/11":
-                        logger.debug("Adress found - Breakpoint?")
-
-                    used = False
-                    auto_add = False
-                    item_icon = None
-                    co = None
-                    sitemap_type = "Default"
-                    mappings = ""
-                    metadata = ""
-                    meta_homekit = ""
-                    meta_alexa = ""
-                    semantic_info = ""
-                    # lovely_name = ' '.join(address['Group name'].replace(house[floor_nr]['rooms'][room_nr]['Group name'],'').replace(house[floor_nr]['Group name'],'').split())
-                    lovely_name = address["Group name"]
-                    item_label = lovely_name
-                    item_type = ""
-                    thing_address_info = ""
-                    description = address["Description"].casefold().split(";")
-                    equipment = ""
-                    equip_homekit = ""
-                    equip_alexa = ""
-                    grp_metadata = ""
-                    floor_grp = None
-                    define = None
-
-                    # print(f"--- processing: {lovely_name}")
-                    # print(address)
-
-                    if "ignore" in description:
-                        continue
+    def handle_rollershutter(address, state):
+        """Rollershutter / blinds with stop and position GAs (phase 0)."""
+        define = context.config["defines"]["rollershutter"]
+        state["define"] = define
+        co = get_co_by_functiontext(address, define["up_down_suffix"])
+        if not co:
+            return False
+
+        basename = address["Group name"]
+        fahren_auf_ab = address
+        for drop_name in define["drop"]:
+            drop_addr = data_of_name(
+                context.all_addresses,
+                basename,
+                drop_name,
+                define["up_down_suffix"],
+            )
+            if drop_addr:
+                used_addresses.append(drop_addr["Address"])
+        option_stop = ""
+        option_position = ""
+        option_position_absolute = ""
+        option_position_status = ""
+        if fahren_auf_ab:
+            used_addresses.append(fahren_auf_ab["Address"])
+            fahren_stop = get_address_from_dco_enhanced(co, "stop_suffix", define)
+            if fahren_stop:
+                used_addresses.append(fahren_stop["Address"])
+                option_stop = f", stopMove=\"{fahren_stop['Address']}\""
+            absolute_position = get_address_from_dco_enhanced(
+                co, "absolute_position_suffix", define
+            )
+            absolute_position_status = get_address_from_dco_enhanced(co, "status_suffix", define)
+            if absolute_position or absolute_position_status:
+                if absolute_position:
+                    used_addresses.append(absolute_position["Address"])
+                    option_position_absolute = f"{absolute_position['Address']}"
+                if absolute_position_status:
+                    used_addresses.append(absolute_position_status["Address"])
+                    if absolute_position:
+                        option_position_status = f"+<{absolute_position_status['Address']}"
+                    else:
+                        option_position_status = f"<{absolute_position_status['Address']}"
+                option_position = f', position="{option_position_absolute}{option_position_status}"'
+
+            state["auto_add"] = True
+            state["item_type"] = "Rollershutter"
+            state["thing_address_info"] = (
+                f"upDown=\"{fahren_auf_ab['Address']}\"{option_stop}{option_position}"
+            )
+            state["equipment"] = "Blinds"
+            state["semantic_info"] = '["Blinds"]'
+            state["item_icon"] = "rollershutter"
+            if context.homekit:
+                state["equip_homekit"] = 'homekit = "WindowCovering"'
+                state["meta_homekit"] = (
+                    ', homekit = "CurrentPosition, TargetPosition, PositionState"'
+                )
+            if context.alexa:
+                state["equip_alexa"] = 'alexa = "Blind"'
+                state["meta_alexa"] = ', alexa = "PositionState"'
+        else:
+            logger.error("incomplete rollershutter: %s", basename)
+        return True
 
-                    shortened_name = " ".join(
-                        address["Group name"]
-                        .replace(room["Group name"], "")
-                        .replace(room["name_short"], "")
-                        .replace(floor["Group name"], "")
-                        .replace(floor["name_short"], "")
-                        .split()
-                    )
-                    item_name = f"i_{floor['name_short']}_{room['name_short']}_{shortened_name}"
-                    item_name = item_name.translate(config["special_char_map"])
-                    item_name = re.sub(pattern_items_Name, "", item_name)
-                    if run == 0:
-                        # dimmer
-                        if address["DatapointType"] == get_datapoint_type("dimmer"):
-                            define = config["defines"]["dimmer"]
-                            # bol = [x for x in define['absolut_suffix'] if x in address['Group name']]
-                            co = get_co_by_functiontext(address, define["absolut_suffix"])
-                            if not co:
-                                continue
+    def handle_heating(address, state):
+        """Heating operating mode with its status GA (phase 0)."""
+        define = context.config["defines"]["heating"]
+        state["define"] = define
+        co = get_co_by_functiontext(address, define["level_suffix"])
+        if not co:
+            return False
+        basename = address["Group name"]
+        betriebsmodus = address
+        option_status_betriebsmodus = ""
+        if betriebsmodus:
+            used_addresses.append(betriebsmodus["Address"])
+            betriebsmodus_status = get_address_from_dco_enhanced(co, "status_level_suffix", define)
+            if betriebsmodus_status:
+                used_addresses.append(betriebsmodus_status["Address"])
+                option_status_betriebsmodus = f"+<{betriebsmodus_status['Address']}"
+            state["auto_add"] = True
+            state["item_type"] = "Number:Dimensionless"
+            ga = "5.010"
+            if address["DatapointType"] == "DPST-20-102":
+                state["item_type"] = "Number"
+                ga = "20.102"
+            state["thing_address_info"] = (
+                f"ga=\"{ga}:{address['Address']}{option_status_betriebsmodus}\""
+            )
+            state["item_label"] = f"{state['lovely_name']}"
+            state["equipment"] = "HVAC"
+            if context.homekit:
+                state["equip_homekit"] = 'homekit = "Thermostat"'
+                state["meta_homekit"] = (
+                    ', homekit = "CurrentHeatingCoolingMode, TargetHeatingCoolingMode"'
+                    ' [OFF="4", HEAT="1", COOL="2"]'
+                )
+            if context.alexa:
+                state["equip_alexa"] = 'alexa = "Thermostat"'
+                state["meta_alexa"] = ', alexa = "HeatingCoolingMode" [OFF="4", HEAT="1", COOL="2"]'
+            state["semantic_info"] = '["HVAC"]'
+            state["item_icon"] = "heating_mode"
+            state["metadata"] = (
+                ', stateDescription=""[options="NULL=unbekannt ...,1=Komfort,2=Standby,3=Nacht,'
+                '4=Frostschutz"], commandDescription=""[options="1=Komfort,2=Standby,3=Nacht,'
+                '4=Frostschutz"], listWidget=""[iconUseState="true"]'
+            )
 
-                            basename = address["Group name"]
-                            dimmwert_status = get_address_from_dco_enhanced(
-                                co, "status_suffix", define
-                            )
-                            for drop_name in define["drop"]:
-                                drop_addr = data_of_name(
-                                    all_addresses,
-                                    basename,
-                                    drop_name,
-                                    define["absolut_suffix"],
-                                )
-                                if drop_addr:
-                                    used_addresses.append(drop_addr["Address"])
-                            relative_option = ""
-                            switch_option = ""
-                            switch_option_status = ""
-                            if dimmwert_status:
-                                used = True
-                                used_addresses.append(dimmwert_status["Address"])
-                                relative_command = get_address_from_dco_enhanced(
-                                    co, "relativ_suffix", define
-                                )
-                                if relative_command:
-                                    used_addresses.append(relative_command["Address"])
-                                    relative_option = (
-                                        f", increaseDecrease=\"{relative_command['Address']}\""
-                                    )
-                                switch_command = get_address_from_dco_enhanced(
-                                    co, "switch_suffix", define
-                                )
-                                if switch_command:
-                                    used_addresses.append(switch_command["Address"])
-                                    switch_status_command = get_address_from_dco_enhanced(
-                                        co, "switch_status_suffix", define
-                                    )
-                                    if switch_status_command:
-                                        used_addresses.append(switch_status_command["Address"])
-                                        switch_option_status = (
-                                            f"+<{switch_status_command['Address']}"
-                                        )
-                                    switch_option = f", switch=\"{switch_command['Address']}{switch_option_status}\""
-
-                                auto_add = True
-                                item_type = "Dimmer"
-                                thing_address_info = f"position=\"{address['Address']}+<{dimmwert_status['Address']}\"{switch_option}{relative_option}"
-                                equipment = "Lightbulb"
-                                semantic_info = '["Light"]'
-                                item_icon = "light"
-                                if B_HOMEKIT:
-                                    meta_homekit = ', homekit="Lighting, Lighting.Brightness"'
-                                if B_ALEXA:
-                                    meta_alexa = ', alexa = "Light"'
-                            else:
-                                logger.warning(
-                                    "incomplete dimmer: %s / %s",
-                                    basename,
-                                    address["Address"],
-                                )
-                                partial_dimmers.append(
-                                    {
-                                        "name": basename,
-                                        "address": address["Address"],
-                                        "dpt": address.get("DatapointType"),
-                                    }
-                                )
-
-                        # rollos / jalousien
-                        elif address["DatapointType"] == get_datapoint_type("rollershutter"):
-                            define = config["defines"]["rollershutter"]
-                            co = get_co_by_functiontext(address, define["up_down_suffix"])
-                            if not co:
-                                continue
+        else:
+            logger.error("incomplete heating: %s", basename)
+        return True
 
-                            basename = address["Group name"]
-                            fahren_auf_ab = address
-                            for drop_name in define["drop"]:
-                                drop_addr = data_of_name(
-                                    all_addresses,
-                                    basename,
-                                    drop_name,
-                                    define["up_down_suffix"],
-                                )
-                                if drop_addr:
-                                    used_addresses.append(drop_addr["Address"])
-                            option_stop = ""
-                            option_position = ""
-                            option_position_absolute = ""
-                            option_position_status = ""
-                            if fahren_auf_ab:
-                                used_addresses.append(fahren_auf_ab["Address"])
-                                fahren_stop = get_address_from_dco_enhanced(
-                                    co, "stop_suffix", define
-                                )
-                                if fahren_stop:
-                                    used_addresses.append(fahren_stop["Address"])
-                                    option_stop = f", stopMove=\"{fahren_stop['Address']}\""
-                                absolute_position = get_address_from_dco_enhanced(
-                                    co, "absolute_position_suffix", define
-                                )
-                                absolute_position_status = get_address_from_dco_enhanced(
-                                    co, "status_suffix", define
-                                )
-                                if absolute_position or absolute_position_status:
-                                    if absolute_position:
-                                        used_addresses.append(absolute_position["Address"])
-                                        option_position_absolute = f"{absolute_position['Address']}"
-                                    if absolute_position_status:
-                                        used_addresses.append(absolute_position_status["Address"])
-                                        if absolute_position:
-                                            option_position_status = (
-                                                f"+<{absolute_position_status['Address']}"
-                                            )
-                                        else:
-                                            option_position_status = (
-                                                f"<{absolute_position_status['Address']}"
-                                            )
-                                    option_position = f', position="{option_position_absolute}{option_position_status}"'
-
-                                auto_add = True
-                                item_type = "Rollershutter"
-                                thing_address_info = f"upDown=\"{fahren_auf_ab['Address']}\"{option_stop}{option_position}"
-                                equipment = "Blinds"
-                                semantic_info = '["Blinds"]'
-                                item_icon = "rollershutter"
-                                if B_HOMEKIT:
-                                    equip_homekit = 'homekit = "WindowCovering"'
-                                    meta_homekit = ', homekit = "CurrentPosition, TargetPosition, PositionState"'
-                                if B_ALEXA:
-                                    equip_alexa = 'alexa = "Blind"'
-                                    meta_alexa = ', alexa = "PositionState"'
-                            else:
-                                logger.error("incomplete rollershutter: %s", basename)
-
-                        # Heizung
-                        elif address["DatapointType"] in (
-                            get_datapoint_type("heating"),
-                            get_datapoint_type("heating_mode"),
-                        ):
-                            define = config["defines"]["heating"]
-                            co = get_co_by_functiontext(address, define["level_suffix"])
-                            if not co:
-                                continue
-                            basename = address["Group name"]
-                            betriebsmodus = address
-                            option_status_betriebsmodus = ""
-                            if betriebsmodus:
-                                used_addresses.append(betriebsmodus["Address"])
-                                betriebsmodus_status = get_address_from_dco_enhanced(
-                                    co, "status_level_suffix", define
-                                )
-                                if betriebsmodus_status:
-                                    used_addresses.append(betriebsmodus_status["Address"])
-                                    option_status_betriebsmodus = (
-                                        f"+<{betriebsmodus_status['Address']}"
-                                    )
-                                auto_add = True
-                                item_type = "Number:Dimensionless"
-                                ga = "5.010"
-                                if address["DatapointType"] == "DPST-20-102":
-                                    item_type = "Number"
-                                    ga = "20.102"
-                                thing_address_info = (
-                                    f"ga=\"{ga}:{address['Address']}{option_status_betriebsmodus}\""
-                                )
-                                item_label = f"{lovely_name}"
-                                equipment = "HVAC"
-                                if B_HOMEKIT:
-                                    equip_homekit = 'homekit = "Thermostat"'
-                                    meta_homekit = ', homekit = "CurrentHeatingCoolingMode, TargetHeatingCoolingMode" [OFF="4", HEAT="1", COOL="2"]'
-                                if B_ALEXA:
-                                    equip_alexa = 'alexa = "Thermostat"'
-                                    meta_alexa = ', alexa = "HeatingCoolingMode" [OFF="4", HEAT="1", COOL="2"]'
-                                semantic_info = '["HVAC"]'
-                                item_icon = "heating_mode"
-                                metadata = ', stateDescription=""[options="NULL=unbekannt ...,1=Komfort,2=Standby,3=Nacht,4=Frostschutz"], commandDescription=""[options="1=Komfort,2=Standby,3=Nacht,4=Frostschutz"], listWidget=""[iconUseState="true"]'
-
-                            else:
-                                logger.error("incomplete heating: %s", basename)
-
-                    #  erst im zweiten durchlauf prüfen damit integrierte Schaltobjekte (z.B. dimmen) vorher schon erkannt werden.
-                    if run > 0:
-                        # Schalten or bool
-                        if address["DatapointType"] == get_datapoint_type("switch"):
-                            define = config["defines"]["switch"]
-                            item_type = "Switch"
-                            item_label = lovely_name
-                            co = get_co_by_functiontext(address, define["switch_suffix"])
-                            if not co:
-                                continue
+    def handle_switch(address, state):
+        """Switch with optional status feedback (phase 1)."""
+        define = context.config["defines"]["switch"]
+        state["define"] = define
+        state["item_type"] = "Switch"
+        state["item_label"] = state["lovely_name"]
+        co = get_co_by_functiontext(address, define["switch_suffix"])
+        if not co:
+            return False
+
+        status = get_address_from_dco_enhanced(co, "status_suffix", define)
+        if status:
+            state["auto_add"] = True
+            used_addresses.append(status["Address"])
+            state["thing_address_info"] = f"ga=\"{address['Address']}+<{status['Address']}\""
+        else:
+            state["auto_add"] = True
+            state["thing_address_info"] = f"ga=\"{address['Address']}\""
+        state["semantic_info"] = '["Switch"]'
+        state["item_icon"] = "switch"
+        if context.homekit:
+            state["meta_homekit"] = ', homekit="Switchable"'
+        if context.alexa:
+            state["meta_alexa"] = ', alexa = "Switch"'
+        return True
+
+    def handle_mapping(address, state):
+        """Item determined only by its datapoint type via ``datapoint_mappings`` (phase 2)."""
+        lovely_name = state["lovely_name"]
+        mapping_info = context.datapoint_mappings[address["DatapointType"]]
+        state["auto_add"] = True
+        item_type = mapping_info["item_type"]
+        state["item_type"] = item_type
+        if item_type.casefold() in context.config["defines"]:
+            state["define"] = context.config["defines"][item_type.casefold()]
+        state["thing_address_info"] = f"ga=\"{mapping_info['ga_prefix']}:{address['Address']}\""
+        if "=" in mapping_info["ga_prefix"]:
+            split_info = mapping_info["ga_prefix"].split("=")
+            state["thing_address_info"] = (
+                f"{split_info[0]}=\"{split_info[1]}:{address['Address']}\""
+            )
+        state["item_label"] = f"{lovely_name}"
+        state["metadata"] = f"{mapping_info['metadata']}"
+        if context.homekit:
+            state["meta_homekit"] = f"{mapping_info['homekit']}"
+        if context.alexa:
+            state["meta_alexa"] = f"{mapping_info['alexa']}"
+        state["semantic_info"] = f"{mapping_info['semantic_info']}"
+        state["item_icon"] = mapping_info["item_icon"]
+        if "Soll" in lovely_name:
+            state["semantic_info"] = state["semantic_info"].replace("Measurement", "Setpoint")
+            state["meta_homekit"] = state["meta_homekit"].replace(
+                "CurrentTemperature", "TargetTemperature"
+            )
+        return True
+
+    def handle_window_contact(address, state):
+        """Window/door contact, also collected for the window rules (phase 2)."""
+        state["equipment"] = "Window"
+        windows.append({"item_name": state["item_name"], "name": address["Group name"]})
+        return True
+
+    def handle_scene(address, state):
+        """Scene number with its mapping from the GA description (phase 2)."""
+        state["used"] = True
+        ga = "17.001"
+        if address["DatapointType"] == "DPST-18-1":
+            ga = "18.001"
+
+        mappings = ""
+        for idescription in state["description"]:
+            if "=" in idescription:
+                mappings = idescription
+                break
+
+        if mappings != "":
+            data_map = mappings.replace("'", "").split(",")
+            for index, word in enumerate(data_map):
+                number_part, word_part = word.strip().split("=")
+                data_map[index] = f"{(int(number_part) - 1)}.0={word_part}"
+
+            data_str = ",".join(data_map)
+            state["metadata"] = (
+                f', stateDescription=""[options="NULL=unbekannt ...,{data_str}"],'
+                f' commandDescription=""[options="{data_str}"]'
+            )
+            state["item_label"] = state["lovely_name"]
+
+            state["auto_add"] = True
+            state["item_type"] = "Number"
+            state["thing_address_info"] = f"ga=\"{ga}:{address['Address']}\""
+            state["semantic_info"] = '["Equipment"]'
+            state["item_icon"] = "movecontrol"
+            state["sitemap_type"] = "Selection"
+        else:
+            logger.info(
+                "no mapping for scene %s %s",
+                address["Address"],
+                address["Group name"],
+            )
+        return True
 
-                            basename = address["Group name"]
-                            status = get_address_from_dco_enhanced(co, "status_suffix", define)
-                            if status:
-                                auto_add = True
-                                used_addresses.append(status["Address"])
-                                thing_address_info = (
-                                    f"ga=\"{address['Address']}+<{status['Address']}\""
-                                )
-                            else:
-                                auto_add = True
-                                thing_address_info = f"ga=\"{address['Address']}\""
-                            semantic_info = '["Switch"]'
-                            item_icon = "switch"
-                            if B_HOMEKIT:
-                                meta_homekit = ', homekit="Switchable"'
-                            if B_ALEXA:
-                                meta_alexa = ', alexa = "Switch"'
-
-                    # determined only by datapoint
-                    # do this only after items with multiple addresses are processed:
-                    # e.g. the state datapoint could be an own thing or the feedback from a switch or so
-                    if run > 1:
-                        # Iterate über die Mappings
-                        for datapoint_type, mapping_info in datapoint_mappings.items():
-                            if address["DatapointType"] == datapoint_type:
-                                auto_add = True
-                                item_type = mapping_info["item_type"]
-                                if item_type.casefold() in config["defines"]:
-                                    define = config["defines"][item_type.casefold()]
-                                thing_address_info = (
-                                    f"ga=\"{mapping_info['ga_prefix']}:{address['Address']}\""
-                                )
-                                if "=" in mapping_info["ga_prefix"]:
-                                    split_info = mapping_info["ga_prefix"].split("=")
-                                    thing_address_info = (
-                                        f"{split_info[0]}=\"{split_info[1]}:{address['Address']}\""
-                                    )
-                                item_label = f"{lovely_name}"
-                                metadata = f"{mapping_info['metadata']}"
-                                if B_HOMEKIT:
-                                    meta_homekit = f"{mapping_info['homekit']}"
-                                if B_ALEXA:
-                                    meta_alexa = f"{mapping_info['alexa']}"
-                                semantic_info = f"{mapping_info['semantic_info']}"
-                                item_icon = mapping_info["item_icon"]
-                                if "Soll" in lovely_name:
-                                    semantic_info = semantic_info.replace("Measurement", "Setpoint")
-                                    meta_homekit = meta_homekit.replace(
-                                        "CurrentTemperature", "TargetTemperature"
-                                    )
-                                break
-                        # window/door
-                        if address["DatapointType"] == get_datapoint_type("window_contact"):
-                            equipment = "Window"
-                            FENSTERKONTAKTE.append(
-                                {"item_name": item_name, "name": address["Group name"]}
-                            )
-
-                        # Szene
-                        if address["DatapointType"] == get_datapoint_type("scene"):
-                            used = True
-                            ga = "17.001"
-                            if address["DatapointType"] == "DPST-18-1":
-                                ga = "18.001"
-
-                            for idescription in description:
-                                if "=" in idescription:
-                                    mappings = idescription
-                                    break
-
-                            if mappings != "":
-                                data_map = mappings.replace("'", "").split(",")
-                                for index, word in enumerate(data_map):
-                                    number_part, word_part = word.strip().split("=")
-                                    data_map[index] = f"{(int(number_part) - 1)}.0={word_part}"
-
-                                data_str = ",".join(data_map)
-                                metadata = f', stateDescription=""[options="NULL=unbekannt ...,{data_str}"], commandDescription=""[options="{data_str}"]'
-                                item_label = lovely_name
-
-                                auto_add = True
-                                item_type = "Number"
-                                thing_address_info = f"ga=\"{ga}:{address['Address']}\""
-                                semantic_info = '["Equipment"]'
-                                item_icon = "movecontrol"
-                                sitemap_type = "Selection"
-                            else:
-                                logger.info(
-                                    "no mapping for scene %s %s",
-                                    address["Address"],
-                                    address["Group name"],
-                                )
-
-                    if define and "change_metadata" in define:
-                        for item in define["change_metadata"]:
-                            if item in address["Group name"]:
-                                for var in define["change_metadata"][item]:
-                                    match var:
-                                        case "semantic_info":
-                                            semantic_info = define["change_metadata"][item][var]
-                                        case "item_icon":
-                                            item_icon = define["change_metadata"][item][var]
-                                        case "equipment":
-                                            equipment = define["change_metadata"][item][var]
-                                        case "homekit":
-                                            if B_HOMEKIT:
-                                                meta_homekit = define["change_metadata"][item][var]
-                                        case "alexa":
-                                            if B_ALEXA:
-                                                meta_alexa = define["change_metadata"][item][var]
-
-                    if used:
-                        used_addresses.append(address["Address"])
-
-                    if auto_add:
-                        used_addresses.append(address["Address"])
-                        item_variables = {
-                            "visibility": "",
-                            "semantic": semantic_info,
-                            "synonyms": "",
-                            "icon": item_icon,
-                            "name": item_label,
+    def build_dispatch_table():
+        """Map each datapoint type to its handlers per phase.
+
+        Phase 0 handles composite devices (dimmer, rollershutter, heating) so
+        they claim their feedback GAs first, phase 1 switches with their status
+        GAs, phase 2 all items determined by the datapoint type alone. Handlers
+        of one phase run in order; one returning False skips the address in
+        that phase.
+        """
+        switch_dpt = get_datapoint_type("switch")
+        table = {}
+
+        def add(dpt, phase, handler):
+            handlers = table.setdefault(dpt, ([], [], []))[phase]
+            # composite devices are exclusive (first match wins)
+            if phase == 0 and handlers:
+                return
+            # a switch left over after phase 1 has no matching CO and is skipped for good
+            if phase == 2 and dpt == switch_dpt:
+                return
+            handlers.append(handler)
+
+        add(get_datapoint_type("dimmer"), 0, handle_dimmer)
+        add(get_datapoint_type("rollershutter"), 0, handle_rollershutter)
+        add(get_datapoint_type("heating"), 0, handle_heating)
+        add(get_datapoint_type("heating_mode"), 0, handle_heating)
+        add(switch_dpt, 1, handle_switch)
+        for dpt in context.datapoint_mappings:
+            add(dpt, 2, handle_mapping)
+        add(get_datapoint_type("window_contact"), 2, handle_window_contact)
+        add(get_datapoint_type("scene"), 2, handle_scene)
+        return table
+
+    def route_addresses(addresses, floor, room, dispatch):
+        """Classify the addresses of a room once: (address, state, handlers) per phase."""
+        routes = ([], [], [])
+        for address in addresses:
+            handlers = dispatch.get(address["DatapointType"])
+            if handlers is None:
+                continue
+            description = address["Description"].casefold().split(";")
+            if "ignore" in description:
+                continue
+            shortened_name = " ".join(
+                address["Group name"]
+                .replace(room["Group name"], "")
+                .replace(room["name_short"], "")
+                .replace(floor["Group name"], "")
+                .replace(floor["name_short"], "")
+                .split()
+            )
+            item_name = f"i_{floor['name_short']}_{room['name_short']}_{shortened_name}"
+            item_name = item_name.translate(context.config["special_char_map"])
+            item_name = context.patterns["items_Name"].sub("", item_name)
+            names = {
+                # lovely_name = ' '.join(address['Group name'].replace(house[floor_nr]['rooms'][room_nr]['Group name'],'').replace(house[floor_nr]['Group name'],'').split())
+                "lovely_name": address["Group name"],
+                "description": description,
+                "item_name": item_name,
+            }
+            for phase, phase_handlers in enumerate(handlers):
+                if phase_handlers:
+                    routes[phase].append((address, names, phase_handlers))
+        return routes
+
+    dispatch = build_dispatch_table()
+    label_cleaner = ItemLabelCleaner(
+        context.config["defines"]["drop_words"], context.patterns["items_Label"]
+    )
+    windows = []
+    partials = []
+    floor_configuration, floor_name = generate_floor_configuration(floor, floor_nr)
+    rooms = []
+
+    def generate_room(room, room_nr):
+        """Generate the fragments of one room; windows and partials go to the floor lists."""
+        room_configuration, room_name, room_variables = generate_room_configuration(
+            room, floor_nr, room_nr
+        )
+        room_items = []
+
+        addresses = room["Addresses"]
+        logger.debug("Room: %s and %s Adresses", room_name, len(addresses))
+        # Every address is classified once and only visited in the phases that have a
+        # handler for its datapoint type. The phases keep the original run order:
+        # - phase 0: GAs which can have a reference to another GA (e.g. a dimmer with status feedback)
+        # - phase 1: switches, after integrated switch objects (e.g. of dimmers) were claimed
+        # - phase 2: all not claimed GAs, determined only by datapoint
+        for phase_routes in route_addresses(addresses, floor, room, dispatch):
+            for address, names, handlers in phase_routes:
+                # only process not already used addresses
+                if address["Address"] not in context.all_addresses:
+                    continue
+                if address["Address"] == "3/1/11":
+                    logger.debug("Adress found - Breakpoint?")
+
+                state = {
+                    "used": False,
+                    "auto_add": False,
+                    "item_icon": None,
+                    "sitemap_type": "Default",
+                    "metadata": "",
+                    "meta_homekit": "",
+                    "meta_alexa": "",
+                    "semantic_info": "",
+                    "item_label": names["lovely_name"],
+                    "item_type": "",
+                    "thing_address_info": "",
+                    "equipment": "",
+                    "equip_homekit": "",
+                    "equip_alexa": "",
+                    "define": None,
+                    **names,
+                }
+                if not all(handler(address, state) for handler in handlers):
+                    continue
+
+                used = state["used"]
+                auto_add = state["auto_add"]
+                item_icon = state["item_icon"]
+                sitemap_type = state["sitemap_type"]
+                metadata = state["metadata"]
+                meta_homekit = state["meta_homekit"]
+                meta_alexa = state["meta_alexa"]
+                semantic_info = state["semantic_info"]
+                item_label = state["item_label"]
+                item_type = state["item_type"]
+                thing_address_info = state["thing_address_info"]
+                equipment = state["equipment"]
+                equip_homekit = state["equip_homekit"]
+                equip_alexa = state["equip_alexa"]
+                define = state["define"]
+                description = names["description"]
+                item_name = names["item_name"]
+                floor_grp = None
+
+                if define and "change_metadata" in define:
+                    for item in define["change_metadata"]:
+                        if item in address["Group name"]:
+                            for var in define["change_metadata"][item]:
+                                match var:
+                                    case "semantic_info":
+                                        semantic_info = define["change_metadata"][item][var]
+                                    case "item_icon":
+                                        item_icon = define["change_metadata"][item][var]
+                                    case "equipment":
+                                        equipment = define["change_metadata"][item][var]
+                                    case "homekit":
+                                        if context.homekit:
+                                            meta_homekit = define["change_metadata"][item][var]
+                                    case "alexa":
+                                        if context.alexa:
+                                            meta_alexa = define["change_metadata"][item][var]
+
+                if used:
+                    used_addresses.append(address["Address"])
+
+                if auto_add:
+                    used_addresses.append(address["Address"])
+                    item_variables = {
+                        "visibility": "",
+                        "semantic": semantic_info,
+                        "synonyms": "",
+                        "icon": item_icon,
+                        "name": item_label,
+                    }
+                    item_variables = process_description(description, item_variables)
+                    semantic_info = item_variables["semantic"]
+                    item_icon = item_variables["icon"]
+                    item_label = label_cleaner.clean(
+                        item_variables["name"], floor["name_short"], room["Group name"], room_name
+                    )
+
+                    if not item_icon:
+                        item_icon = ""
+                    elif not item_icon.startswith("<"):
+                        item_icon = f"<{item_icon}>"
+
+                    thing_type = item_type.lower().split(":")[0]
+                    room_items.append(
+                        {
+                            "thing": f"Type {thing_type}    :   {item_name}   \"{address['Group name']}\"   [ {thing_address_info} ]\n",
+                            "item_type": item_type,
+                            "item_name": item_name,
+                            "item_label": item_label,
+                            "item_icon": item_icon,
+                            "semantic_info": semantic_info,
+                            "synonyms": item_variables["synonyms"],
+                            "visibility": item_variables["visibility"],
+                            "metadata": metadata,
+                            "meta_homekit": meta_homekit,
+                            "meta_alexa": meta_alexa,
+                            "equipment": equipment,
+                            "equip_homekit": equip_homekit,
+                            "equip_alexa": equip_alexa,
+                            "floor_grp": floor_grp,
+                            "sitemap_type": sitemap_type,
+                            "influx": "influx" in address["Description"],
                         }
-                        item_variables = process_description(description, item_variables)
-                        semantic_info = item_variables["semantic"]
-                        item_icon = item_variables["icon"]
-                        synonyms = item_variables["synonyms"]
-                        item_label = item_variables["name"]
-                        # remove generic description if unneccessary
-                        item_label_short = item_label
-                        for drop in config["defines"]["drop_words"]:
-                            item_label_short = item_label_short.replace(drop, "")
-                        # remvoe floor and room from label
-                        if floor["name_short"]:
-                            item_label_short = item_label_short.replace(floor["name_short"], "")
-                        # remove text by item_label pattern
-                        item_label_short = re.sub(pattern_items_Label, "", item_label_short)
-                        item_label_short = item_label_short.replace("|", " ")
-                        item_label_short = item_label_short.replace("  ", " ")
-                        if item_label_short != "":
-                            item_label = item_label_short
-
-                        if not item_icon:
-                            item_icon = ""
-                        elif not item_icon.startswith("<"):
-                            item_icon = f"<{item_icon}>"
-
-                        item_label = item_label.replace(room["Group name"], room_name)
-                        item_label = re.sub(r"\[.*\]", "", item_label)
-                        item_label = re.sub(r"\|.*\:", "", item_label)
-                        item_label = re.sub(
-                            r"^\W+|\W+$", "", item_label
-                        )  # removes special cahrs on start/end
-                        item_label = item_label.strip()
-
-                        thing_type = item_type.lower().split(":")[0]
-                        things += f"Type {thing_type}    :   {item_name}   \"{address['Group name']}\"   [ {thing_address_info} ]\n"
-
-                        root = f"map{floor_nr}_{room_nr}"
-                        
-                        # Central function override for OpenHAB group
-                        #keyword = config.get("general", {}).get("central_function_keyword", "zentral")
-                        #if address["Group name"].casefold().startswith(keyword.casefold()):
-                        #    root = config.get("general", {}).get("central_function_group", "Base")
-
-                        if equipment != "":
-                            if item_label not in equipments:
-                                equipments[item_label] = item_name
-                                if equip_homekit:
-                                    equip_homekit += f" [Instance={homekit_instance}]"
-                                    grp_metadata += equip_homekit
-                                if equip_alexa:
-                                    if grp_metadata:
-                                        grp_metadata += ", "
-                                    grp_metadata += equip_alexa
-                                if grp_metadata:
-                                    grp_metadata = f"{{ {grp_metadata} }}"
-                                items += f'Group   equipment_{item_name}   "{item_label}"  {item_icon}  ({root})   ["{equipment}"] {grp_metadata}\n'
-                                root = f"equipment_{item_name}"
-                            else:
-                                root = f"equipment_{equipments[item_label]}"
-                        if item_label in equipments:
-                            root = f"equipment_{equipments[item_label]}"
-                        if B_HOMEKIT and meta_homekit:
-                            if "]" in meta_homekit:
-                                meta_homekit = meta_homekit.replace(
-                                    "]", f" ,Instance={homekit_instance}]"
-                                )
-                            else:
-                                meta_homekit += f" [Instance={homekit_instance}]"
-                            metadata += meta_homekit
-                            homekit_accessorie += 1
-                        if B_ALEXA and meta_alexa:
-                            metadata += meta_alexa
-                        if floor_grp:
-                            root = f"{root},{floor_grp}"
-
-                        items += f'{item_type}   {item_name}   "{item_label}"   {item_icon}   ({root})   {semantic_info}    {{ channel="knx:device:bridge:generic:{item_name}" {metadata}{synonyms} }}\n'
-                        group += f"        {sitemap_type} item={item_name} label=\"{item_label}\" {item_variables['visibility']}\n"
-
-                        if homekit_accessorie >= HOMEKIT_MAX_ACCESSORIES_PER_INSTANCE:
-                            homekit_accessorie = 0
-                            homekit_instance += 1
-                        if "influx" in address["Description"]:
-                            export_to_influx.append(item_name)
-                    while used_addresses:
-                        a = used_addresses.pop()
-                        found_item = next(
-                            (item for item in all_addresses if item["Address"] == a),
-                            None,
+                    )
+                while used_addresses:
+                    context.all_addresses.consume(used_addresses.pop())
+        return {
+            "configuration": room_configuration,
+            "name": room_name,
+            "visibility": room_variables["visibility"],
+            "items": room_items,
+        }
+
+    def generate_cached_room(room, room_nr):
+        """generate_room() through the fragment cache of the context."""
+        cache = context.fragment_cache
+        store = context.all_addresses
+        key = context.room_fingerprint(floor, floor_nr, room, room_nr)
+        own_addresses = {address["Address"] for address in room["Addresses"]}
+
+        def address_digest(address):
+            # the fingerprint already covers the addresses of the room itself
+            if address["Address"] in own_addresses:
+                return None
+            return context.digester.address(address)
+
+        entry = cache.load(key)
+        if entry is not None and entry["lookups"] == store.lookup_state(
+            entry["observed"], entry["observed_names"], address_digest
+        ):
+            cache.hits += 1
+            windows.extend(entry["windows"])
+            partials.extend(entry["partial_dimmers"])
+            store.consumed |= entry["consumed"]
+            if store.observed is not None:
+                store.observed |= entry["observed"]
+            return entry["room"]
+
+        cache.misses += 1
+        outer_observed, outer_names = store.observed, store.observed_names
+        store.observed, store.observed_names = set(), set()
+        consumed_before = set(store.consumed)
+        windows_before, partials_before = len(windows), len(partials)
+        try:
+            room_fragment = generate_room(room, room_nr)
+            observed, observed_names = store.observed, store.observed_names
+        finally:
+            store.observed, store.observed_names = outer_observed, outer_names
+        if outer_observed is not None:
+            outer_observed |= observed
+        if outer_names is not None:
+            outer_names |= observed_names
+        consumed = store.consumed - consumed_before
+        # the lookups as they were before this room consumed its addresses
+        lookups = store.lookup_state(observed, observed_names, address_digest, consumed_before)
+        cache.store(
+            key,
+            {
+                "room": room_fragment,
+                "windows": windows[windows_before:],
+                "partial_dimmers": partials[partials_before:],
+                "consumed": consumed,
+                "observed": observed,
+                "observed_names": observed_names,
+                "lookups": lookups,
+            },
+        )
+        return room_fragment
+
+    for room_nr, room in enumerate(floor["rooms"], 1):
+        if context.fragment_cache is None:
+            rooms.append(generate_room(room, room_nr))
+        else:
+            rooms.append(generate_cached_room(room, room_nr))
+
+    return {
+        "configuration": floor_configuration,
+        "name": floor_name,
+        "rooms": rooms,
+        "windows": windows,
+        "partial_dimmers": partials,
+    }
+
+
+def render_building(context, floor_results, items, sitemap, things):
+    """Join the floor fragments of generate_floor() into the items, sitemap and things.
+
+    Everything shared between floors is resolved here, in floor order: the
+    equipment groups (one per label), the HomeKit instance numbers and the
+    window contact, partial dimmer and influx lists. The fragments are
+    written to ``items``, ``sitemap`` and ``things`` (file-like, only
+    ``write`` is used) as soon as they are complete.
+
+    If ``items`` and ``things`` are PartWriters, every floor goes into its own
+    part files with its own generic Thing (see open_output_writers()). Each
+    part then defines its own equipment groups and starts a new HomeKit
+    instance, so a floor file never refers to a group of another floor and a
+    change only renumbers later floors when it needs another instance. With
+    ``general.window_rules`` "event" the window contacts are also put into
+    the WINDOW_CONTACT_GROUP that triggers the window rule.
+    """
+    split = isinstance(items, PartWriter) and isinstance(things, PartWriter)
+    event_windows = window_rules(context.config) == "event"
+    thing_uid = GENERIC_THING_UID
+    equipments = context.equipments
+    homekit_instance = 1
+    homekit_accessorie = 0
+    if event_windows:
+        items.write(
+            f'Group:Contact:OR(OPEN, CLOSED)   {WINDOW_CONTACT_GROUP}   "Fensterkontakte"   <window>\n'
+        )
+    for floor_nr, floor_result in enumerate(floor_results, 1):
+        context.windows.extend(floor_result["windows"])
+        context.partial_dimmers.extend(floor_result["partial_dimmers"])
+        window_items = set()
+        if event_windows:
+            window_items = {window["item_name"] for window in floor_result["windows"]}
+        if split:
+            key = f"map{floor_nr}"
+            thing_uid = f"{GENERIC_THING_UID}_{key}"
+            items.open_part(key)
+            equipments = {}
+            if homekit_accessorie:
+                homekit_instance += 1
+                homekit_accessorie = 0
+            things.open_part(
+                key,
+                head=f'Thing {thing_uid} "{floor_result["name"]}" ({KNX_BRIDGE_UID}) [\n] {{\n',
+                tail="}\n",
+            )
+        items.write(floor_result["configuration"])
+        sitemap.write(f'Frame label="{floor_result["name"]}" {{\n')
+
+        for room_nr, room in enumerate(floor_result["rooms"], 1):
+            items.write(room["configuration"])
+            sitemap.write(
+                f"     Group item=map{floor_nr}_{room_nr} {room['visibility']} label=\"{room['name']}\" "
+            )
+            group = ""
+
+            for record in room["items"]:
+                item_name = record["item_name"]
+                item_label = record["item_label"]
+                item_icon = record["item_icon"]
+                metadata = record["metadata"]
+                meta_homekit = record["meta_homekit"]
+                equip_homekit = record["equip_homekit"]
+                grp_metadata = ""
+                things.write(record["thing"])
+
+                root = f"map{floor_nr}_{room_nr}"
+
+                # Central function override for OpenHAB group
+                # keyword = config.get("general", {}).get("central_function_keyword", "zentral")
+                # if address["Group name"].casefold().startswith(keyword.casefold()):
+                #    root = config.get("general", {}).get("central_function_group", "Base")
+
+                if record["equipment"] != "":
+                    if item_label not in equipments:
+                        equipments[item_label] = item_name
+                        if equip_homekit:
+                            equip_homekit += f" [Instance={homekit_instance}]"
+                            grp_metadata += equip_homekit
+                        if record["equip_alexa"]:
+                            if grp_metadata:
+                                grp_metadata += ", "
+                            grp_metadata += record["equip_alexa"]
+                        if grp_metadata:
+                            grp_metadata = f"{{ {grp_metadata} }}"
+                        items.write(
+                            f'Group   equipment_{item_name}   "{item_label}"  {item_icon}  ({root})   ["{record["equipment"]}"] {grp_metadata}\n'
                         )
-                        if found_item:
-                            all_addresses.remove(found_item)
+                        root = f"equipment_{item_name}"
+                    else:
+                        root = f"equipment_{equipments[item_label]}"
+                if item_label in equipments:
+                    root = f"equipment_{equipments[item_label]}"
+                if context.homekit and meta_homekit:
+                    if "]" in meta_homekit:
+                        meta_homekit = meta_homekit.replace("]", f" ,Instance={homekit_instance}]")
+                    else:
+                        meta_homekit += f" [Instance={homekit_instance}]"
+                    metadata += meta_homekit
+                    homekit_accessorie += 1
+                if context.alexa and record["meta_alexa"]:
+                    metadata += record["meta_alexa"]
+                if record["floor_grp"]:
+                    root = f"{root},{record['floor_grp']}"
+                if item_name in window_items:
+                    root = f"{root},{WINDOW_CONTACT_GROUP}"
+
+                items.write(
+                    f'{record["item_type"]}   {item_name}   "{item_label}"   {item_icon}   ({root})   {record["semantic_info"]}    {{ channel="{thing_uid}:{item_name}" {metadata}{record["synonyms"]} }}\n'
+                )
+                group += f"        {record['sitemap_type']} item={item_name} label=\"{item_label}\" {record['visibility']}\n"
+
+                if homekit_accessorie >= HOMEKIT_MAX_ACCESSORIES_PER_INSTANCE:
+                    homekit_accessorie = 0
+                    homekit_instance += 1
+                if record["influx"]:
+                    context.export_to_influx.append(item_name)
 
             if group != "":
-                sitemap += f" {{\n{group}\n    }}\n"
+                sitemap.write(f" {{\n{group}\n    }}\n")
             else:
-                sitemap += "\n"
-        sitemap += "}\n"
-    return items, sitemap, things
+                sitemap.write("\n")
+        sitemap.write("}\n")
+
+
+def _init_floor_worker(context):
+    """Install the generation context of the parent process in a floor worker."""
+    global _worker_context, _initial_consumed
+    _worker_context = context
+    _initial_consumed = frozenset(context.all_addresses.consumed)
+
+
+def _generate_floor_task(floor_nr):
+    """Generate one floor against the initial address state (runs in a floor worker)."""
+    context = _worker_context
+    store = context.all_addresses
+    store.consumed = set(_initial_consumed)
+    store.observed = set()
+    cache = context.fragment_cache
+    if cache is not None:
+        cache.hits = cache.misses = 0
+    result = generate_floor(context, context.floors[floor_nr - 1], floor_nr)
+    result["observed"] = store.observed
+    result["consumed"] = store.consumed - _initial_consumed
+    # the counters of the worker's copy of the cache go back with the floor
+    result["fragment_cache"] = cache.stats() if cache is not None else None
+    return result
+
+
+def generate_floors_parallel(context, workers):
+    """Generate all floors in worker processes and merge them as a serial run would.
+
+    Every worker starts from the address state before the first floor. Floors
+    can claim addresses of other floors (e.g. a status GA placed elsewhere),
+    so the results are merged in floor order: a floor that looked at an
+    address claimed by an earlier floor is generated again in this process
+    with the merged state, all other floors just add their claimed addresses.
+    The fragment cache hits and misses of the kept worker results are added
+    to the context's cache.
+
+    The workers are started with forkserver (spawn where it is missing), never
+    fork: the web backend calls this from one of its threads.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    start_method = (
+        "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    )
+    floors = context.floors
+    store = context.all_addresses
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(floors)),
+        mp_context=multiprocessing.get_context(start_method),
+        initializer=_init_floor_worker,
+        initargs=(context,),
+    ) as pool:
+        results = list(pool.map(_generate_floor_task, range(1, len(floors) + 1)))
+
+    claimed = set()
+    for floor_nr, result in enumerate(results, 1):
+        observed = result.pop("observed")
+        consumed = result.pop("consumed")
+        cache_stats = result.pop("fragment_cache")
+        if observed.isdisjoint(claimed):
+            store.consumed |= consumed
+            if cache_stats is not None:
+                context.fragment_cache.hits += cache_stats["hits"]
+                context.fragment_cache.misses += cache_stats["misses"]
+        else:
+            logger.debug("Floor %s uses addresses of earlier floors, generating it again", floor_nr)
+            before = set(store.consumed)
+            results[floor_nr - 1] = generate_floor(context, floors[floor_nr - 1], floor_nr)
+            consumed = store.consumed - before
+        claimed |= consumed
+    return results
 
 
-def data_of_name(data, name, suffix, replace=""):
-    """Function get data from a Name"""
+def gen_building(context=None, floor_workers=None, writers=None):
+    """Generates a Building from an ETS Project
+
+    Without ``context`` the module-level variables are used. With
+    ``floor_workers`` > 1 (default: the context's ``floor_workers``, then
+    ``floor_workers`` of the general config) the floors are generated in that
+    many worker processes; the output is the same as in serial mode.
+
+    The items, sitemap and things are streamed into ``writers`` (see
+    open_output_writers()), which are returned. Without writers they are
+    returned as strings.
+    """
+    if context is None:
+        context = GenerationContext.from_globals()
+    if floor_workers is None:
+        floor_workers = context.floor_workers
+    if floor_workers is None:
+        floor_workers = context.config["general"].get("floor_workers", 0)
+    if floor_workers > 1 and len(context.floors) > 1:
+        floor_results = generate_floors_parallel(context, floor_workers)
+    else:
+        # one floor at a time, each is written out before the next is generated
+        floor_results = (
+            generate_floor(context, floor, floor_nr)
+            for floor_nr, floor in enumerate(context.floors, 1)
+        )
+    if writers is not None:
+        render_building(context, floor_results, *writers)
+        outputs = writers
+    else:
+        buffers = (io.StringIO(), io.StringIO(), io.StringIO())
+        render_building(context, floor_results, *buffers)
+        outputs = tuple(buffer.getvalue() for buffer in buffers)
+    if context.fragment_cache is not None:
+        context.fragment_cache.evict()
+    return outputs
+
+
+def name_candidates(name, suffix, replace=""):
+    """Group names which belong to ``name`` with one of the suffixes.
+
+    A candidate is ``name`` followed by the suffix (with or without a space)
+    or ``name`` with one of the ``replace`` texts replaced by the suffix.
+    """
     if isinstance(suffix, str):
         suffix = [
             suffix,
@@ -859,24 +1383,27 @@ def data_of_name(data, name, suffix, replace=""):
         replace = [
             replace,
         ]
-    for x in data:
-        if x["Group name"] == name:
-            continue
-        for s in suffix:
-            if x["Group name"] == name + s:
-                return x
-            if x["Group name"] == name + " " + s:
-                return x
-            for r in replace:
-                if x["Group name"] == name.replace(r, s):
-                    return x
-    return None
+    candidates = set()
+    for s in suffix:
+        candidates.add(name + s)
+        candidates.add(name + " " + s)
+        for r in replace:
+            candidates.add(name.replace(r, s))
+    candidates.discard(name)
+    return candidates
+
+
+def data_of_name(data, name, suffix, replace=""):
+    """Function get data from a Name"""
+    return get_address_store(data).find_by_name(name_candidates(name, suffix, replace))
 
 
-def check_unused_addresses():
+def check_unused_addresses(context=None):
     """Logs all unused addresses for further manual actions"""
+    if context is None:
+        context = GenerationContext.from_globals()
     # process all addresses which were not used
-    for address in all_addresses:
+    for address in context.all_addresses:
         logger.debug(
             "unused: %s: %s with type %s",
             address["Address"],
@@ -904,93 +1431,230 @@ def set_permissions(file_path, configuration=None):
         logger.warning("Failed to set permissions for %s: %s", file_path, e)
 
 
-def write_partial_report(cfg):
+def write_partial_report(cfg, context=None):
     """Write report for partial/incomplete detections."""
-    if not partial_dimmers and not partial_unknowns:
+    if context is None:
+        context = GenerationContext.from_globals()
+    if not context.partial_dimmers and not context.partial_unknowns:
         return
     import json
     from pathlib import Path
 
     report = {
-        "partial_dimmers": partial_dimmers,
-        "partial_other": partial_unknowns,
+        "partial_dimmers": context.partial_dimmers,
+        "partial_other": context.partial_unknowns,
     }
     try:
-        out_path = cfg.get("openhab_path", "openhab")
+        out_path = cfg.get("openhab_path", context.report_dir)
         Path(out_path).mkdir(parents=True, exist_ok=True)
         Path(out_path, "partial_report.json").write_text(
             json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8"
         )
-        logger.info("Wrote partial_report.json with %d dimmers", len(partial_dimmers))
+        logger.info("Wrote partial_report.json with %d dimmers", len(context.partial_dimmers))
     except Exception as e:
         logger.warning("Failed to write partial_report.json: %s", e)
 
 
-def export_output(items, sitemap, things, configuration=None):
-    """Exports things / items / sitemap / ...  Files"""
-    # Use provided configuration or fallback to global config
-    cfg = configuration if configuration is not None else config
+def _things_template(context):
+    """things.template with the gateway settings of the project filled in."""
+    things_template = read_template("things.template")
+    if context.gwip:
+        return things_template.replace("###gwip###", context.gwip)
+    logger.info("No Gateway IP found. Using KNX Router mode (multicast).")
+    things_template = things_template.replace('type="TUNNEL"', 'type="ROUTER"')
+    things_template = re.sub(r'.*ipAddress="###gwip###",.*\n', "", things_template)
+    things_template = re.sub(r".*portNumber=3671,.*\n", "", things_template)
+    return things_template.replace("autoReconnectPeriod=30", "autoReconnectPeriod=60")
 
-    # write partial report if any
-    write_partial_report(cfg)
 
-    # export things:
-    try:
-        things_template = open("things.template", "r", encoding="utf8").read()
-        if GWIP:
-            things_template = things_template.replace("###gwip###", GWIP)
-        else:
-            logger.info("No Gateway IP found. Using KNX Router mode (multicast).")
-            things_template = things_template.replace('type="TUNNEL"', 'type="ROUTER"')
-            things_template = re.sub(r'.*ipAddress="###gwip###",.*\n', "", things_template)
-            things_template = re.sub(r".*portNumber=3671,.*\n", "", things_template)
-            things_template = things_template.replace(
-                "autoReconnectPeriod=30", "autoReconnectPeriod=60"
-            )
+def _general_mode(configuration, key, modes):
+    """Value of the ``general`` option ``key``, the first of ``modes`` if unset or unknown."""
+    mode = configuration["general"].get(key, modes[0])
+    if mode not in modes:
+        logger.warning(f"Unknown {key} {mode!r}, using {modes[0]!r}")
+        return modes[0]
+    return mode
 
-        things = things_template.replace("###things###", things)
-        os.makedirs(os.path.dirname(cfg["things_path"]), exist_ok=True)
-        with open(cfg["things_path"], "w", encoding="utf8") as f:
-            f.write(things)
-        logger.info(
-            f"Successfully wrote things file to {cfg['things_path']} with {things.count(chr(10)) + 1} lines"
-        )
-    except Exception as e:
-        logger.error(f"Failed to write things file to {cfg['things_path']}: {e}")
+
+def output_split(configuration) -> str:
+    """The ``general.output_split`` mode: one items/things file per building or per floor."""
+    return _general_mode(configuration, "output_split", OUTPUT_SPLIT_MODES)
+
+
+def window_rules(configuration) -> str:
+    """The ``general.window_rules`` mode: a cron rule over all contacts or an event rule."""
+    return _general_mode(configuration, "window_rules", WINDOW_RULE_MODES)
+
+
+def open_output_writers(cfg, context, split=None):
+    """Open streaming writers for the items, sitemap and things files (in that order).
+
+    The templates are split once at their markers and the project name is
+    filled in; the generated fragments go between head and tail.
+
+    With ``split`` (default: ``general.output_split`` is "floor") the items and
+    things get PartWriters: the template files only hold the Base group and
+    the bridge, every floor is written to ``knx_map<n>.items`` and
+    ``knx_map<n>.things`` next to them.
+    """
+    if split is None:
+        split = output_split(context.config) == "floor"
+    writers = []
+    try:
+        for marker, values in (
+            ("items", {"NAME": context.prj_name}),
+            ("sitemap", {}),
+            ("things", {}),
+        ):
+            path = cfg[OUTPUT_PATH_KEYS[marker]]
+            try:
+                if marker == "things":
+                    text = _things_template(context)
+                else:
+                    text = read_template(f"{marker}.template")
+                head, tail = split_template(text).split(marker, values)
+                if split and marker in ("items", "things"):
+                    writers.append(PartWriter(path, head, tail))
+                else:
+                    writers.append(StreamWriter(path, head, tail))
+            except Exception as e:
+                logger.error(f"Failed to write {marker} file to {path}: {e}")
+                raise
+    except Exception:
+        for writer in writers:
+            writer.abort()
         raise
-    # export items:
+    return tuple(writers)
+
+
+def _log_output(kind, writer):
+    """Log the size of a closed output file and whether it was rewritten."""
+    if writer.changed:
+        logger.info(f"Successfully wrote {kind} file to {writer.path} with {writer.lines} lines")
+    else:
+        logger.info(f"Unchanged {kind} file {writer.path} with {writer.lines} lines, not rewritten")
+
+
+def _finish_output(kind, writer):
+    """Close a streamed output file and log its size.
+
+    Returns the closed files by manifest name: ``kind``, plus ``<kind>_<key>``
+    for the parts of a PartWriter.
+    """
     try:
-        items_template = open("items.template", "r", encoding="utf8").read()
-        items = items_template.replace("###items###", items)
-        items = items.replace("###NAME###", PRJ_NAME)
-        os.makedirs(os.path.dirname(cfg["items_path"]), exist_ok=True)
-        with open(cfg["items_path"], "w", encoding="utf8") as f:
-            f.write(items)
-        logger.info(
-            f"Successfully wrote items file to {cfg['items_path']} with {items.count(chr(10)) + 1} lines"
-        )
+        writer.close()
     except Exception as e:
-        logger.error(f"Failed to write items file to {cfg['items_path']}: {e}")
+        logger.error(f"Failed to write {kind} file to {writer.path}: {e}")
         raise
-    # export sitemap:
-    try:
-        sitemap_template = open("sitemap.template", "r", encoding="utf8").read()
-        sitemap = sitemap_template.replace("###sitemap###", sitemap)
-        os.makedirs(os.path.dirname(cfg["sitemaps_path"]), exist_ok=True)
-        with open(cfg["sitemaps_path"], "w", encoding="utf8") as f:
-            f.write(sitemap)
-        logger.info(
-            f"Successfully wrote sitemap file to {cfg['sitemaps_path']} with {sitemap.count(chr(10)) + 1} lines"
+    if isinstance(writer, PartWriter):
+        files = {f"{kind}_{key}" if key else kind: part for key, part in writer.writers().items()}
+    else:
+        files = {kind: writer}
+        if kind in ("items", "things"):
+            # part files of an earlier run split per floor
+            remove_stale_parts(writer.path)
+    for name, part in files.items():
+        _log_output(name, part)
+    return files
+
+
+def write_cron_window_rules(writer, windows):
+    """Write the window rule that reports contacts open for 15 minutes, checked every minute."""
+    for i in windows:
+        writer.write(f'var save_fk_count_{i["item_name"]} = 0 \n')
+    writer.write("""\n    rule "fensterkontakt check"
+    when
+        Time cron "0 * * * * ? *"
+    then
+    """)
+    for i in windows:
+        writer.write(
+            f'    if({i["item_name"]}.state == OPEN){{ \n'
+            f'         save_fk_count_{i["item_name"]} += 1\n'
+            f'         if(save_fk_count_{i["item_name"]} == 15) {{\n'
+            '             val telegramAction = getActions("telegram","telegram:telegramBot:Telegram_Bot"); \n'
+            f'             telegramAction.sendTelegram("{i["name"]} seit über 15 Minuten offen!");\n'
+            "         }\n"
+            "    } else { \n"
+            f'        save_fk_count_{i["item_name"]} = 0; \n'
+            "    } \n"
         )
-    except Exception as e:
-        logger.error(f"Failed to write sitemap file to {cfg['sitemaps_path']}: {e}")
+
+
+def write_event_window_rules(writer, windows):
+    """Write the window rule that reports contacts open for 15 minutes, driven by events.
+
+    The cron rule of the default mode checks every contact every minute. This
+    rule is triggered by state changes of the WINDOW_CONTACT_GROUP members
+    only: opening a contact starts a timer for it, closing it cancels the timer.
+    """
+    names = ",\n".join(f'    "{window["item_name"]}" -> "{window["name"]}"' for window in windows)
+    writer.write(f"""val java.util.Map<String, Timer> fensterTimer = newHashMap
+val java.util.Map<String, String> fensterName = newHashMap(
+{names}
+)
+
+rule "fensterkontakt check"
+when
+    Member of {WINDOW_CONTACT_GROUP} changed
+then
+    val itemName = triggeringItem.name
+    fensterTimer.remove(itemName)?.cancel
+    if (triggeringItem.state == OPEN) {{
+        fensterTimer.put(itemName, createTimer(now.plusMinutes(15), [ |
+            fensterTimer.remove(itemName)
+            val telegramAction = getActions("telegram","telegram:telegramBot:Telegram_Bot")
+            telegramAction.sendTelegram(fensterName.get(itemName) + " seit über 15 Minuten offen!")
+        ]))
+    }}
+end
+""")
+
+
+def export_output(items, sitemap, things, configuration=None, context=None):
+    """Exports things / items / sitemap / ...  Files
+
+    ``items``, ``sitemap`` and ``things`` are either the generated text or the
+    writers gen_building() streamed it into. Text is always written to one
+    file per kind. Files with unchanged content are not rewritten; returns the
+    manifest of the written files (see output_writers.write_manifest()).
+    """
+    if context is None:
+        context = GenerationContext.from_globals(configuration)
+    # Use provided configuration or fallback to the configuration of the run
+    cfg = configuration if configuration is not None else context.config
+
+    # write partial report if any
+    write_partial_report(cfg, context)
+
+    # export things, items and sitemap:
+    outputs = (items, sitemap, things)
+    if all(isinstance(output, str) for output in outputs):
+        writers = open_output_writers(cfg, context, split=False)
+        for writer, output in zip(writers, outputs):
+            writer.write(output)
+    else:
+        writers = outputs
+    written = {}
+    try:
+        for kind, writer in (
+            ("things", writers[2]),
+            ("items", writers[0]),
+            ("sitemap", writers[1]),
+        ):
+            written.update(_finish_output(kind, writer))
+    except Exception:
+        for writer in writers:
+            writer.abort()
         raise
 
     # export persistent
     private_persistence = ""
     if os.path.isfile("private_persistence"):
         private_persistence = open("private_persistence", "r", encoding="utf8").read()
-    persist = """Strategies {
+    try:
+        with StreamWriter(cfg["influx_path"], tail=private_persistence + "\n}") as persist:
+            persist.write("""Strategies {
     everyMinute : "0 * * * * ?"
     everyHour : "0 0 * * * ?"
     everyDay : "0 0 0 * * ?"
@@ -998,60 +1662,75 @@ def export_output(items, sitemap, things, configuration=None):
     }
 
     Items {
-    """
-    for i in export_to_influx:
-        persist += f"{i}: strategy = everyUpdate\n"
-    persist += private_persistence + "\n}"
-
-    try:
-        os.makedirs(os.path.dirname(cfg["influx_path"]), exist_ok=True)
-        with open(cfg["influx_path"], "w", encoding="utf8") as f:
-            f.write(persist)
-        logger.info(
-            f"Successfully wrote persistence file to {cfg['influx_path']} with {persist.count(chr(10)) + 1} lines"
-        )
+    """)
+            for i in context.export_to_influx:
+                persist.write(f"{i}: strategy = everyUpdate\n")
+        _log_output("persistence", persist)
+        written["persistence"] = persist
     except Exception as e:
         logger.error(f"Failed to write persistence file to {cfg['influx_path']}: {e}")
         raise
 
-    fenster_rule = ""
-    for i in FENSTERKONTAKTE:
-        fenster_rule += f'var save_fk_count_{i["item_name"]} = 0 \n'
-    fenster_rule += """\n    rule "fensterkontakt check"
-    when
-        Time cron "0 * * * * ? *"
-    then
-    """
-    for i in FENSTERKONTAKTE:
-        fenster_rule += f'    if({i["item_name"]}.state == OPEN){{ \n'
-        fenster_rule += f'         save_fk_count_{i["item_name"]} += 1\n'
-        fenster_rule += f'         if(save_fk_count_{i["item_name"]} == 15) {{\n'
-        fenster_rule += '             val telegramAction = getActions("telegram","telegram:telegramBot:Telegram_Bot"); \n'
-        fenster_rule += f'             telegramAction.sendTelegram("{i["name"]} seit über 15 Minuten offen!");\n'
-        fenster_rule += "         }\n"
-        fenster_rule += "    } else { \n"
-        fenster_rule += f'        save_fk_count_{i["item_name"]} = 0; \n'
-        fenster_rule += "    } \n"
-    fenster_rule += """\n    end
-    """
     try:
-        os.makedirs(os.path.dirname(cfg["fenster_path"]), exist_ok=True)
-        with open(cfg["fenster_path"], "w", encoding="utf8") as f:
-            f.write(fenster_rule)
-        logger.info(
-            f"Successfully wrote window rule file to {cfg['fenster_path']} with {fenster_rule.count(chr(10)) + 1} lines"
-        )
+        if window_rules(context.config) == "event":
+            fenster_rule = StreamWriter(cfg["fenster_path"])
+            write_rules = write_event_window_rules
+        else:
+            fenster_rule = StreamWriter(cfg["fenster_path"], tail="\n    end\n    ")
+            write_rules = write_cron_window_rules
+        with fenster_rule:
+            write_rules(fenster_rule, context.windows)
+        _log_output("window rule", fenster_rule)
+        written["window_rules"] = fenster_rule
     except Exception as e:
         logger.error(f"Failed to write window rule file to {cfg['fenster_path']}: {e}")
         # This is not critical, so we don't raise an exception
 
+    return write_manifest(cfg.get("openhab_path", "openhab"), written)
+
 
-def main(configuration=None):
+def main(configuration=None, timer=None, context=None):
     """Main function"""
     logging.basicConfig()
-    items, sitemap, things = gen_building()
-    check_unused_addresses()
-    export_output(items, sitemap, things, configuration=configuration)
+    if context is None:
+        context = GenerationContext.from_globals(configuration)
+    generate(context, timer, configuration)
+
+
+def generate(context, timer=None, configuration=None):
+    """Generate the openHAB files of ``context``; never falls back to the module globals.
+
+    ``configuration`` (default: ``context.config``) names the output files.
+    """
+    if not isinstance(context, GenerationContext):
+        raise TypeError(f"generate() needs a GenerationContext, got {type(context).__name__}")
+    timer = timer or StageTimer()
+    cfg = configuration if configuration is not None else context.config
+    normalize_before = normalize_cache_stats()
+    with timer.stage("gen_building"):
+        # items, sitemap and things are streamed to their files while generating
+        writers = open_output_writers(cfg, context)
+        try:
+            gen_building(context, writers=writers)
+        except Exception:
+            for writer in writers:
+                writer.abort()
+            raise
+    normalize_after = normalize_cache_stats()
+    timer.counters["normalize_string"] = {
+        key: normalize_after[key] - normalize_before[key] for key in ("hits", "misses")
+    }
+    if context.fragment_cache is not None:
+        timer.counters["fragment_cache"] = context.fragment_cache.stats()
+    try:
+        with timer.stage("check_unused_addresses"):
+            check_unused_addresses(context)
+    except Exception:
+        for writer in writers:
+            writer.abort()
+        raise
+    with timer.stage("export_output"):
+        export_output(*writers, configuration=configuration, context=context)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,177 @@
+"""Persistent cache of generated room fragments.
+
+Renaming one room in ETS and uploading the project again used to regenerate
+every item, thing and sitemap line. gen_building() now stores the fragments
+of each room (before HomeKit instances and equipment groups are resolved, so
+those stay consistent) under a fingerprint of everything the room is
+generated from: its addresses and communication objects, the floor it is on,
+its position, the config subset used by the generator, the HomeKit/Alexa
+switches and the generator code.
+
+A room can also depend on addresses of other rooms (status addresses are
+looked up by name or by linked group addresses). The state of every address
+and Group name the room looked at is stored with the entry; the fragments are
+only reused if all of them are still the same.
+
+Entries are kept in a pickle_cache directory (see project_cache).
+
+Invalidation::
+
+    python fragment_cache.py clear
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import pickle
+import sys
+from collections.abc import Mapping
+from functools import lru_cache
+from pathlib import Path
+
+import cache_dirs
+import pickle_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+CACHE_SUFFIX = pickle_cache.CACHE_SUFFIX
+LABEL = "fragment cache"
+DIGEST_PROTOCOL = 4
+
+# config sections the generated fragments depend on (paths and parser settings are not)
+FINGERPRINT_CONFIG_KEYS = (
+    "general",
+    "defines",
+    "datapoint_types",
+    "datapoint_mappings",
+    "regexpattern",
+    "special_char_map",
+)
+# modules whose code generates the fragments
+CODE_FILES = ("ets_to_openhab.py", "ets_helpers.py", "config.py", "utils.py")
+
+
+def get_cache_dir(cache_dir=None) -> Path:
+    """Return the cache directory (argument, $KNX_FRAGMENT_CACHE_DIR or cache root)."""
+    return cache_dirs.cache_dir("fragments", "KNX_FRAGMENT_CACHE_DIR", cache_dir)
+
+
+def digest(value) -> str:
+    """SHA-256 of a value made of dicts, lists and scalars.
+
+    The value is pickled, which is fast and handles the cycles between
+    communication objects and the object list of their device. Equal data
+    built in the same way gives the same digest; anything else can only make
+    a cache entry miss. Sets pickle in hash order, which changes between
+    interpreters, so values with sets go through config_digest() instead.
+    """
+    return hashlib.sha256(pickle.dumps(value, protocol=DIGEST_PROTOCOL)).hexdigest()
+
+
+class Digester:
+    """Memoized digests of the group addresses of one run.
+
+    The digested addresses must not change during the run.
+    """
+
+    def __init__(self):
+        self._addresses = {}  # id -> (address, digest), the reference keeps the id valid
+
+    def address(self, address):
+        """Digest of a group address dict including its communication objects."""
+        memo = self._addresses.get(id(address))
+        if memo is None:
+            memo = self._addresses[id(address)] = (address, digest(address))
+        return memo[1]
+
+
+@lru_cache(maxsize=1)
+def code_digest() -> str:
+    """SHA-256 of the generator code, so new code never reuses old fragments."""
+    sha = hashlib.sha256(sys.version.encode("utf-8"))
+    for name in CODE_FILES:
+        try:
+            sha.update(Path(__file__).with_name(name).read_bytes())
+        except OSError:
+            sha.update(name.encode("utf-8"))
+    return sha.hexdigest()
+
+
+def config_digest(configuration, datapoint_mappings=None) -> str:
+    """Fingerprint of the config sections the generator uses.
+
+    Hashed as canonical JSON (sorted keys, sets as sorted lists), so it is the
+    same in every process whatever its hash seed.
+    """
+    subset = {key: configuration.get(key) for key in FINGERPRINT_CONFIG_KEYS}
+    if datapoint_mappings is not None:
+        subset["datapoint_mappings"] = datapoint_mappings
+    text = json.dumps(_plain(subset), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _plain(value):
+    """Config views (mappingproxy, tuples, frozensets) as plain dicts and lists."""
+    if isinstance(value, Mapping):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(_plain(item) for item in value)
+    return value
+
+
+class FragmentCache:
+    """Room fragments by fingerprint, with hit/miss counters of the current run."""
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = get_cache_dir(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Hits and misses since the cache was created."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def load(self, key):
+        """Return the entry stored under ``key`` or None."""
+        return pickle_cache.load(self.cache_dir, key, LABEL)
+
+    def store(self, key, entry):
+        """Store ``entry`` under ``key``; call evict() once the run is done."""
+        pickle_cache.store(self.cache_dir, key, entry, LABEL)
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits into ``max_bytes``."""
+        evict(self.cache_dir, self.max_bytes)
+
+
+def evict(cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+    """Remove least recently used entries until the cache fits into ``max_bytes``."""
+    pickle_cache.evict(get_cache_dir(cache_dir), max_bytes, LABEL)
+
+
+def clear(cache_dir=None) -> int:
+    """Remove all entries. Returns the number removed."""
+    return pickle_cache.clear(get_cache_dir(cache_dir))
+
+
+def main():
+    """Command line entry point for cache maintenance."""
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Manage the cache of generated room fragments")
+    parser.add_argument("--cache-dir", type=Path, help="Cache directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("clear", help="Remove cached fragments")
+    args = parser.parse_args()
+
+    if args.command == "clear":
+        removed = clear(args.cache_dir)
+        logger.info("Removed %d cached fragment(s) from %s", removed, get_cache_dir(args.cache_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Import time per module, measured with ``python -X importtime``.
+
+Every measurement runs in a fresh interpreter, so modules that are already
+imported by the caller are measured as well. Used by ``--import-profile`` of
+the CLI and by the startup budget test.
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent
+
+RE_IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)\s*$")
+
+
+def profile_imports(modules, python=None, cwd=PROJECT_ROOT):
+    """Import ``modules`` in a fresh interpreter and return one record per imported module.
+
+    Records are dicts with ``module``, ``self_us``, ``cumulative_us`` and the
+    nesting ``depth`` (0 for modules imported directly), in import order.
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    proc = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{proc.stderr[-2000:]}")
+    records = []
+    for line in proc.stderr.splitlines():
+        match = RE_IMPORT_TIME.match(line)
+        if match:
+            records.append(
+                {
+                    "module": match.group(4),
+                    "self_us": int(match.group(1)),
+                    "cumulative_us": int(match.group(2)),
+                    "depth": (len(match.group(3)) - 1) // 2,
+                }
+            )
+    return records
+
+
+def imported_modules(records):
+    """Names of all modules imported in a profile."""
+    return {record["module"] for record in records}
+
+
+def total_import_us(records, modules):
+    """Cumulative import time of ``modules`` (imported directly) in microseconds."""
+    return sum(r["cumulative_us"] for r in records if r["depth"] == 0 and r["module"] in modules)
+
+
+def format_import_profile(records, modules, limit=25):
+    """Table of the slowest imports by cumulative time, followed by the totals of ``modules``."""
+    rows = [("Module", "Self [ms]", "Cumulative [ms]")]
+    for record in sorted(records, key=lambda r: r["cumulative_us"], reverse=True)[:limit]:
+        rows.append(
+            (
+                record["module"],
+                f"{record['self_us'] / 1000:.1f}",
+                f"{record['cumulative_us'] / 1000:.1f}",
+            )
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(3)]
+    lines = [
+        "  ".join(
+            cell.ljust(width) if i == 0 else cell.rjust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in rows
+    ]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    lines.append("")
+    for module in modules:
+        lines.append(f"{module}: {total_import_us(records, [module]) / 1000:.1f} ms")
+    return "\n".join(lines)
+
+
+class ImportProfileAction(argparse.Action):
+    """Print the import profile of ``modules`` and exit, like ``--version``."""
+
+    def __init__(self, option_strings, dest, modules, **kwargs):
+        kwargs.setdefault("default", argparse.SUPPRESS)
+        super().__init__(option_strings, dest, nargs=0, **kwargs)
+        self.modules = modules
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        records = profile_imports(self.modules)
+        print(format_import_profile(records, self.modules))
+        parser.exit()
@@ -4,29 +4,75 @@ import argparse
 import json
 import logging
 import re
+import time
 from pathlib import Path
-from typing import Any
-
-from xknxproject.models.knxproject import KNXProject
-from xknxproject.xknxproj import XKNXProj
+from typing import TYPE_CHECKING, Any
 
 import ets_to_openhab
-from config import config, normalize_string
+import import_profile
+import project_cache
+import project_dump
+from config import config, normalize_string, save_snapshot
+from stage_timing import StageTimer
+
+if TYPE_CHECKING:
+    from xknxproject.models.knxproject import KNXProject
 
 logger = logging.getLogger(__name__)
 
-# Compile regular expressions once for reuse
-RE_ITEM_ROOM = re.compile(config["regexpattern"]["item_Room"])
-RE_ITEM_FLOOR = re.compile(config["regexpattern"]["item_Floor"])
-RE_FLOOR_NAME_SHORT = re.compile(config["regexpattern"]["item_Floor_nameshort"])
+# xknxproject dominates the startup time and is only needed to parse .knxproj
+# archives: project_cache imports it on first use unless a parser is set here.
+XKNXProj = None
+
+# Input files accepted by --batch: KNX archives and (compressed) JSON dumps
+BATCH_PROJECT_SUFFIXES = (".knxproj", ".json", ".json.gz", ".json.zst")
+# Generated files that --batch redirects into the per-project output directory
+OUTPUT_PATH_KEYS = (
+    "items_path",
+    "things_path",
+    "sitemaps_path",
+    "influx_path",
+    "fenster_path",
+    "transform_dir_path",
+)
+
+
+class PlacementSettings:
+    """Settings of the floor/room placement, read from one configuration.
+
+    Built per run from the configuration it is given (default: the shared
+    ``config``), so a changed config.json reaches the placement without
+    reimporting this module. ``re.compile`` caches the patterns, so building
+    the settings again is cheap.
+    """
 
-ITEM_FLOOR_NAME_SHORT_PREFIX = config["general"]["item_Floor_nameshort_prefix"]
-ITEM_ROOM_NAME_SHORT_PREFIX = config["general"]["item_Room_nameshort_prefix"]
-UNKNOWN_FLOOR_NAME = config["general"]["unknown_floorname"]
-UNKNOWN_ROOM_NAME = config["general"]["unknown_roomname"]
-ADD_MISSING_ITEMS = config["general"]["addMissingItems"]
-FloorNameAsItIs = config["general"]["FloorNameAsItIs"]
-RoomNameAsItIs = config["general"]["RoomNameAsItIs"]
+    def __init__(self, configuration=None):
+        cfg = configuration if configuration is not None else config
+        general = cfg["general"]
+        patterns = cfg["regexpattern"]
+        self.config = cfg
+        self.re_item_room = re.compile(patterns["item_Room"])
+        self.re_item_floor = re.compile(patterns["item_Floor"])
+        self.re_floor_name_short = re.compile(patterns["item_Floor_nameshort"])
+        self.floor_prefix = general["item_Floor_nameshort_prefix"]
+        self.room_prefix = general["item_Room_nameshort_prefix"]
+        self.unknown_floor = general["unknown_floorname"]
+        self.unknown_room = general["unknown_roomname"]
+        self.add_missing_items = general["addMissingItems"]
+        self.floor_name_as_it_is = general["FloorNameAsItIs"]
+        self.room_name_as_it_is = general["RoomNameAsItIs"]
+        self.auto_place_unknown = general.get("auto_place_unknown")
+        self.central_keyword = general.get("central_function_keyword", "zentral")
+        self.sensor_keyword = general.get("notification_sensor_keyword", "Sensor")
+
+    def is_unknown(self, floor, room):
+        """True if ``floor`` or ``room`` is the configured unknown name."""
+        return floor == self.unknown_floor or room == self.unknown_room
+
+
+def get_placement_settings(settings=None) -> PlacementSettings:
+    """Return ``settings`` or the settings of the shared ``config``."""
+    return settings if settings is not None else PlacementSettings()
 
 
 def find_floors(spaces: dict) -> list:
@@ -53,13 +99,14 @@ def find_floors(spaces: dict) -> list:
     return floors
 
 
-def create_building(project: KNXProject) -> list[dict[str, Any]]:
-    """Create a building with all floors and rooms."""
+def create_building(project: "KNXProject", configuration=None) -> list[dict[str, Any]]:
+    """Create a building with all floors and rooms (names as set in ``configuration``)."""
     # get name / description from knxproj object
     # extract Groupname = "Erdgeschoss"
     # name short = EG / = EG
     # name long = =EG or =EG+RM1 ... (floorshort / floorshort+roomshort)
     #
+    settings = PlacementSettings(configuration)
     locations = project["locations"]
     if not locations:
         logger.error("'locations' is empty.")
@@ -80,7 +127,7 @@ def create_building(project: KNXProject) -> list[dict[str, Any]]:
             logger.debug("Added building: %s", loc["name"])
 
         for floor in find_floors(loc.get("spaces", {})):
-            floor_short_name, floor_long_name, floor_name_plain = get_floor_name(floor)
+            floor_short_name, floor_long_name, floor_name_plain = get_floor_name(floor, settings)
             floor_description = floor["description"] or floor["name"]
             floor_data = {
                 "Description": floor_description,
@@ -95,7 +142,7 @@ def create_building(project: KNXProject) -> list[dict[str, Any]]:
             for room in floor["spaces"].values():
                 if room["type"] in ("Room", "Corridor", "Stairway"):
                     room_short_name, room_long_name, room_name_plain = get_room_name(
-                        room, floor_data
+                        room, floor_data, settings
                     )
                     room_description = (
                         room["description"] or room_name_plain or room["usage_text"] or room["name"]
@@ -118,35 +165,38 @@ def create_building(project: KNXProject) -> list[dict[str, Any]]:
     return buildings
 
 
-def get_floor_name(floor):
+def get_floor_name(floor, settings=None):
     """Extract short name for a floor."""
+    settings = get_placement_settings(settings)
+    prefix = settings.floor_prefix
     floor_name = floor["name"]
-    res_floor = RE_FLOOR_NAME_SHORT.search(floor_name)
+    res_floor = settings.re_floor_name_short.search(floor_name)
     floor_name_plain = floor["name"]
     floor_long_name = ""
     floor_short_name = ""
-    if FloorNameAsItIs:
+    if settings.floor_name_as_it_is:
         return floor["name"], floor["name"], floor["name"]
     if res_floor:
         floor_short_name = res_floor.group(0)
         floor_name_plain = floor_name_plain.replace(res_floor.group(0), "").strip()
-        if not floor_short_name.startswith(ITEM_FLOOR_NAME_SHORT_PREFIX):
-            floor_short_name = ITEM_FLOOR_NAME_SHORT_PREFIX + floor_short_name
-    # return ITEM_FLOOR_NAME_SHORT_PREFIX + floor_name if len(floor_name) < 6 else ITEM_FLOOR_NAME_SHORT_PREFIX + floor_name
+        if not floor_short_name.startswith(prefix):
+            floor_short_name = prefix + floor_short_name
+    # return prefix + floor_name if len(floor_name) < 6 else prefix + floor_name
     if not floor_long_name:
         floor_long_name = floor_short_name
     return floor_short_name, floor_long_name, floor_name_plain
 
 
-def get_room_name(room, floor_data):
+def get_room_name(room, floor_data, settings=None):
     """Extract short name for a room."""
-    res_floor = RE_ITEM_FLOOR.search(room["name"])
-    res_room = RE_ITEM_ROOM.search(room["name"])
+    settings = get_placement_settings(settings)
+    res_floor = settings.re_item_floor.search(room["name"])
+    res_room = settings.re_item_room.search(room["name"])
     room_name_plain = room["name"]
     room_long_name = ""
     room_short_name = ""
 
-    if RoomNameAsItIs:
+    if settings.room_name_as_it_is:
         return room["name"], room["name"], room["name"]
     if res_floor:
         if not floor_data["name_short"]:
@@ -155,7 +205,7 @@ def get_room_name(room, floor_data):
         room_name_plain = room_name_plain.replace(res_floor.group(0), "").strip()
         if floor_data["name_short"] in (
             room["name"],
-            ITEM_FLOOR_NAME_SHORT_PREFIX + room["name"],
+            settings.floor_prefix + room["name"],
         ):
             floor_data["name_short"] = res_floor.group(0)
             floor_data["Description"] = room["name"].replace(res_floor.group(0), "").strip()
@@ -165,14 +215,94 @@ def get_room_name(room, floor_data):
         room_name_plain = room_name_plain.replace(res_room.group(0), "").strip()
         room_short_name = res_room.group(0)
     else:
-        room_short_name = ITEM_ROOM_NAME_SHORT_PREFIX + "RMxx"
-        room_long_name += ITEM_ROOM_NAME_SHORT_PREFIX + "RMxx"
+        room_short_name = settings.room_prefix + "RMxx"
+        room_long_name += settings.room_prefix + "RMxx"
 
     return room_short_name, room_long_name, room_name_plain
 
 
-def get_addresses(project: KNXProject):
-    """Extract and process information from a KNX project."""
+class AddressRegistry:
+    """Extracted addresses with hash indexes for constant-time lookups.
+
+    Holds the list returned by ``get_addresses`` and keeps an index by group
+    address string (``by_address``) and a reverse index from device address to
+    all addresses linked to it (``by_device``). Placement helpers use these
+    indexes instead of rescanning the whole list for every sub-address or
+    device sibling. Only ``append`` and ``remove`` change the addresses, so the
+    indexes always match them.
+    """
+
+    def __init__(self, addresses=()):
+        self.addresses: list[dict[str, Any]] = []
+        self.by_address: dict[str, dict[str, Any]] = {}
+        self.by_device: dict[str, list[dict[str, Any]]] = {}
+        for address in addresses:
+            self.append(address)
+
+    def __iter__(self):
+        return iter(self.addresses)
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def __getitem__(self, index):
+        return self.addresses[index]
+
+    @staticmethod
+    def _device_addresses(address):
+        devices = []
+        for co in address.get("communication_object", []):
+            device_address = co.get("device_address")
+            if device_address and device_address not in devices:
+                devices.append(device_address)
+        return devices
+
+    def _index(self, address):
+        self.by_address.setdefault(address["Address"], address)
+        for device_address in self._device_addresses(address):
+            self.by_device.setdefault(device_address, []).append(address)
+
+    def _unindex(self, address):
+        group_address = address["Address"]
+        if self.by_address.get(group_address) is address:
+            del self.by_address[group_address]
+            for other in self.addresses:  # a later duplicate of the GA takes over
+                if other["Address"] == group_address:
+                    self.by_address[group_address] = other
+                    break
+        for device_address in self._device_addresses(address):
+            linked = self.by_device.get(device_address, [])
+            linked[:] = [item for item in linked if item is not address]
+
+    def append(self, address):
+        """Add an address to the end and to the indexes."""
+        self.addresses.append(address)
+        self._index(address)
+
+    def remove(self, address):
+        """Remove an address (ValueError if it is not registered) and unindex it."""
+        self.addresses.remove(address)
+        self._unindex(address)
+
+    def get_address(self, group_address):
+        """Return the address dict for a group address string or None."""
+        return self.by_address.get(group_address)
+
+    def get_by_device(self, device_address):
+        """Return all addresses linked to a device (empty list if none)."""
+        return self.by_device.get(device_address, [])
+
+
+def get_address_registry(addresses) -> AddressRegistry:
+    """Return ``addresses`` as AddressRegistry, building the indexes if necessary."""
+    if isinstance(addresses, AddressRegistry):
+        return addresses
+    return AddressRegistry(addresses)
+
+
+def get_addresses(project: "KNXProject", configuration=None) -> list:
+    """Extract and process information from a KNX project (as set in ``configuration``)."""
+    settings = PlacementSettings(configuration)
     group_addresses = project["group_addresses"]
     communication_objects = project["communication_objects"]
     devices = project["devices"]
@@ -182,15 +312,19 @@ def get_addresses(project: KNXProject):
         logger.error("One or more essential data structures are empty.")
         raise ValueError("One or more essential data structures are empty.")
 
+    range_table = build_group_range_table(group_ranges, settings)
+    device_index = DeviceCommunicationIndex(communication_objects, devices)
     addresses = []
     for address in group_addresses.values():
         if should_ignore_address(address):
             continue
 
-        res_floor = find_floor_in_address(address, group_ranges)
-        res_room = RE_ITEM_ROOM.search(address["name"])
-        is_central_function= check_is_centralFunction(address,group_ranges)
-        is_notification_sensor = check_is_notification_sensor(address, group_ranges)
+        res_floor = find_floor_in_address(address, group_ranges, range_table, settings)
+        res_room = settings.re_item_room.search(address["name"])
+        is_central_function = check_is_centralFunction(address, group_ranges, range_table, settings)
+        is_notification_sensor = check_is_notification_sensor(
+            address, group_ranges, range_table, settings
+        )
 
         # For debugging
         if address["address"] in ("3/1/4", "3/1/43"):
@@ -202,10 +336,10 @@ def get_addresses(project: KNXProject):
                 "Address": address["address"],
                 "Description": address["description"],
                 "communication_object": extract_communication_objects(
-                    address, communication_objects, devices
+                    address, communication_objects, devices, device_index
                 ),
-                "Floor": get_short_floor_name(res_floor),
-                "Room": res_room.group(0) if res_room else UNKNOWN_ROOM_NAME,
+                "Floor": get_short_floor_name(res_floor, settings),
+                "Room": res_room.group(0) if res_room else settings.unknown_room,
                 "DatapointType": format_datapoint_type(address),
                 "is_central_function": is_central_function,
                 "is_notification_sensor": is_notification_sensor,
@@ -226,90 +360,166 @@ def should_ignore_address(address):
         return True
     return False
 
-def check_is_centralFunction(address, group_ranges):
-    """Check if an address is part of a central function based on its group name and group range."""
-    keyword = config.get("general", {}).get("central_function_keyword", "zentral")
-    if address["name"].casefold().startswith(keyword.casefold()):
-        return True
+
+def _keyword_matches(name, keyword):
+    return name.casefold().startswith(keyword.casefold())
+
+
+def _classify_group_range(gr_top, gr_middle, settings):
+    """Evaluate the keyword and floor checks for one main/middle group range."""
+    central_keyword = settings.central_keyword
+    sensor_keyword = settings.sensor_keyword
+    names = [gr["name"] for gr in (gr_middle, gr_top) if gr]
+    res_floor = None
+    for pattern in (settings.re_item_floor, settings.re_floor_name_short):
+        for name in names:
+            res_floor = res_floor or pattern.search(name)
+    return {
+        "is_central_function": any(_keyword_matches(name, central_keyword) for name in names),
+        "is_notification_sensor": any(_keyword_matches(name, sensor_keyword) for name in names),
+        "floor": res_floor,
+    }
+
+
+def build_group_range_table(group_ranges, settings=None):
+    """Precompute central/notification flags and floor matches per (main, middle) group.
+
+    The group range names are the same for all addresses below a middle group, so
+    the casefold and regex work is done once per range instead of once per address.
+    """
+    settings = get_placement_settings(settings)
+    table = {}
+    for main, gr_top in group_ranges.items():
+        for middle_key, gr_middle in gr_top.get("group_ranges", {}).items():
+            middle = middle_key.split("/")[1] if "/" in middle_key else middle_key
+            table[(main, middle)] = _classify_group_range(gr_top, gr_middle, settings)
+    return table
+
+
+def get_group_range_info(address, group_ranges, range_table=None, settings=None):
+    """Return the group range classification for an address."""
     address_split = address["address"].split("/")
-    gr_top = group_ranges.get(address_split[0])
-    gr_middle = gr_top["group_ranges"].get(address_split[0] + "/" + address_split[1])
-    if gr_middle and gr_middle["name"].casefold().startswith(keyword.casefold()):
-        return True
-    if gr_top and gr_top["name"].casefold().startswith(keyword.casefold()):
+    key = (address_split[0], address_split[1] if len(address_split) > 1 else "")
+    if range_table is not None and key in range_table:
+        return range_table[key]
+    gr_top = group_ranges.get(key[0])
+    gr_middle = gr_top["group_ranges"].get(key[0] + "/" + key[1]) if gr_top else None
+    return _classify_group_range(gr_top, gr_middle, get_placement_settings(settings))
+
+
+def check_is_centralFunction(address, group_ranges, range_table=None, settings=None):
+    """Check if an address is part of a central function based on its group name and group range."""
+    settings = get_placement_settings(settings)
+    if _keyword_matches(address["name"], settings.central_keyword):
         return True
-    return False
+    info = get_group_range_info(address, group_ranges, range_table, settings)
+    return info["is_central_function"]
+
 
-def check_is_notification_sensor(address, group_ranges):
+def check_is_notification_sensor(address, group_ranges, range_table=None, settings=None):
     """Check if an address is a notification sensor based on its group name and group range."""
-    keyword = config.get("general", {}).get("notification_sensor_keyword", "Sensor")
-    if address["name"].casefold().startswith(keyword.casefold()):
+    settings = get_placement_settings(settings)
+    if _keyword_matches(address["name"], settings.sensor_keyword):
         return True
-    address_split = address["address"].split("/")
-    gr_top = group_ranges.get(address_split[0])
-    gr_middle = gr_top["group_ranges"].get(address_split[0] + "/" + address_split[1])
-    if gr_middle and gr_middle["name"].casefold().startswith(keyword.casefold()):
-        return True
-    if gr_top and gr_top["name"].casefold().startswith(keyword.casefold()):
-        return True
-    return False
+    info = get_group_range_info(address, group_ranges, range_table, settings)
+    return info["is_notification_sensor"]
 
-def find_floor_in_address(address, group_ranges):
+
+def find_floor_in_address(address, group_ranges, range_table=None, settings=None):
     """Find the floor associated with an address."""
-    res_floor = RE_ITEM_FLOOR.search(address["name"])
+    settings = get_placement_settings(settings)
+    res_floor = settings.re_item_floor.search(address["name"])
     if not res_floor:
-        address_split = address["address"].split("/")
-        gr_top = group_ranges.get(address_split[0])
-        gr_middle = gr_top["group_ranges"].get(address_split[0] + "/" + address_split[1])
-        res_floor = (
-            RE_ITEM_FLOOR.search(gr_middle["name"])
-            or RE_ITEM_FLOOR.search(gr_top["name"])
-            or RE_FLOOR_NAME_SHORT.search(gr_middle["name"])
-            or RE_FLOOR_NAME_SHORT.search(gr_top["name"])
-        )
+        res_floor = get_group_range_info(address, group_ranges, range_table, settings)["floor"]
     return res_floor
 
 
-def extract_communication_objects(address, communication_objects, devices):
+class DeviceCommunicationIndex:
+    """Sibling lookup for communication objects of the same device.
+
+    For each device the communication objects are grouped once by channel and
+    by text. ``siblings`` then returns the objects of the device sharing the
+    channel or text of a given object, in the device's own order. Results are
+    memoized per (device, channel, text), so large actuators are scanned only
+    once no matter how many group addresses link to them.
+    """
+
+    def __init__(self, communication_objects, devices):
+        self.communication_objects = communication_objects
+        self.devices = devices
+        self._by_device = {}
+        self._siblings = {}
+
+    def _index_device(self, device_id):
+        index = self._by_device.get(device_id)
+        if index is None:
+            by_channel = {}
+            by_text = {}
+            device = self.devices[device_id]
+            for pos, device_co_id in enumerate(device["communication_object_ids"]):
+                device_co = self.communication_objects.get(device_co_id)
+                if not device_co:
+                    continue
+                set_normalized_function_text(device_co)
+                if device_co.get("channel"):
+                    by_channel.setdefault(device_co["channel"], []).append((pos, device_co))
+                if device_co.get("text"):
+                    by_text.setdefault(device_co["text"], []).append((pos, device_co))
+            index = self._by_device[device_id] = (by_channel, by_text)
+        return index
+
+    def siblings(self, co):
+        """Return a new list of the device's objects matching ``co`` by channel or text."""
+        device_id = co["device_address"]
+        key = (device_id, co.get("channel"), co.get("text"))
+        matches = self._siblings.get(key)
+        if matches is None:
+            by_channel, by_text = self._index_device(device_id)
+            by_position = dict(by_channel.get(key[1], []))
+            by_position.update(by_text.get(key[2], []))
+            matches = [by_position[pos] for pos in sorted(by_position)]
+            self._siblings[key] = matches
+        return list(matches)
+
+
+def set_normalized_function_text(co):
+    """Store the normalized function text on ``co`` (once) for the generator's suffix checks."""
+    if "function_text_normalized" not in co:
+        co["function_text_normalized"] = normalize_string(co.get("function_text") or "")
+
+
+def extract_communication_objects(address, communication_objects, devices, device_index=None):
     """Extract communication objects for an address."""
+    if device_index is None:
+        device_index = DeviceCommunicationIndex(communication_objects, devices)
     comm_objects = []
     for co_id in address["communication_object_ids"]:
         co = communication_objects[co_id]
         if co["flags"] and (co["flags"]["read"] or co["flags"]["write"]):
+            set_normalized_function_text(co)
             if co.get("device_communication_objects"):
+                for device_co in co["device_communication_objects"]:
+                    set_normalized_function_text(device_co)
                 comm_objects.append(co)
                 continue
-            device_id = co["device_address"]
-            device = devices[device_id]
+            device = devices[co["device_address"]]
             if device and device.get("communication_object_ids"):
-                matching_device_comms = []
-                for device_co_id in device["communication_object_ids"]:
-                    device_co = communication_objects.get(device_co_id)
-                    if device_co:
-                        if device_co.get("channel") and co["channel"] == device_co["channel"]:
-                            matching_device_comms.append(device_co)
-                        elif device_co.get("text") and co["text"] == device_co["text"]:
-                            matching_device_comms.append(device_co)
-                co["device_communication_objects"] = matching_device_comms
-                # co["device_communication_objects"] = [
-                #    communication_objects[device_co_id]
-                #    for device_co_id in device['communication_object_ids']
-                #    if co['channel'] == communication_objects[device_co_id].get("channel", co['channel'])
-                # ]
+                co["device_communication_objects"] = device_index.siblings(co)
         comm_objects.append(co)
     return comm_objects
 
 
-def get_short_floor_name(res_floor):
+def get_short_floor_name(res_floor, settings=None):
     """Get short name for a floor."""
+    settings = get_placement_settings(settings)
     if res_floor:
         floor_name = res_floor.group(0)
         return (
             floor_name
-            if floor_name.startswith(ITEM_FLOOR_NAME_SHORT_PREFIX) and len(floor_name) < 6
-            else ITEM_FLOOR_NAME_SHORT_PREFIX + floor_name
+            if floor_name.startswith(settings.floor_prefix) and len(floor_name) < 6
+            else settings.floor_prefix + floor_name
         )
-    return UNKNOWN_FLOOR_NAME
+    return settings.unknown_floor
 
 
 def format_datapoint_type(address):
@@ -318,12 +528,102 @@ def format_datapoint_type(address):
     return f'DPST-{dpt["main"]}-{dpt["sub"]}' if dpt["sub"] else f'DPT-{dpt["main"]}'
 
 
-def put_addresses_in_building(building, addresses, project: KNXProject):
-    """Place addresses in a building object based on their associated floors and rooms."""
+class LocationIndex:
+    """Lookup tables for placing addresses into the building structure.
+
+    Built once per placement run so that every lookup is a dictionary hit
+    instead of a walk over all buildings, floors and rooms:
+
+    - ``rooms``: (floor short name, room short name) -> (floor, room)
+    - ``device_rooms``: device address -> (floor, room) containing the device
+    - ``cabinet_devices``: set of devices mounted in distribution boards
+
+    The first match in building/floor/room order wins, just like the linear
+    search it replaces. Rooms created on the fly via ``get_or_create_room`` are
+    added to the index incrementally.
+    """
+
+    def __init__(self, building, cabinet_devices=()):
+        self.building = building
+        self.cabinet_devices = set(cabinet_devices)
+        self.rooms: dict[tuple[str, str], tuple[dict, dict]] = {}
+        self.device_rooms: dict[str, tuple[dict, dict]] = {}
+        self._main_floors: dict[str, dict] = {}
+        self._floor_rooms: dict[int, dict[str, dict]] = {}
+        for nr, building_data in enumerate(building):
+            for floor in building_data["floors"]:
+                if nr == 0:
+                    self._main_floors.setdefault(floor.get("name_short"), floor)
+                self._index_floor(floor)
+
+    def _index_floor(self, floor):
+        floor_rooms = self._floor_rooms.setdefault(id(floor), {})
+        for room in floor.get("rooms", []):
+            floor_rooms.setdefault(room.get("name_short"), room)
+            self.rooms.setdefault((floor.get("name_short"), room.get("name_short")), (floor, room))
+            for device in room.get("devices", []):
+                self.device_rooms.setdefault(device, (floor, room))
+
+    def find_room(self, floor_name, room_name):
+        """Return (floor, room) for the given short names or None."""
+        return self.rooms.get((floor_name, room_name))
+
+    def find_device_room(self, device_address):
+        """Return (floor, room) of the room the device is located in or None."""
+        return self.device_rooms.get(device_address)
+
+    def get_or_create_room(self, floor_name, room_name):
+        """Return the room in the first building, creating floor and room if missing."""
+        if not self.building:
+            return None
+        target_floor = self._main_floors.get(floor_name)
+        if target_floor is None:
+            target_floor = {
+                "Description": floor_name,
+                "Group name": floor_name,
+                "name_long": floor_name,
+                "name_short": floor_name,
+                "rooms": [],
+            }
+            self.building[0].setdefault("floors", []).append(target_floor)
+            self._main_floors[floor_name] = target_floor
+        floor_rooms = self._floor_rooms.setdefault(id(target_floor), {})
+        target_room = floor_rooms.get(room_name)
+        if target_room is None:
+            target_room = {
+                "Description": room_name,
+                "Group name": room_name,
+                "name_long": room_name,
+                "name_short": room_name,
+                "Addresses": [],
+            }
+            target_floor.setdefault("rooms", []).append(target_room)
+            floor_rooms[room_name] = target_room
+            # the first building is traversed first, so the new room takes precedence
+            self.rooms[(floor_name, room_name)] = (target_floor, target_room)
+        return target_room
+
+
+def get_location_index(building, project: "KNXProject") -> LocationIndex:
+    """Build the LocationIndex for a building and its project locations."""
+    return LocationIndex(building, get_distribution_board_devices(project))
+
+
+def put_addresses_in_building(
+    building, addresses, project: "KNXProject", report_dir=None, configuration=None
+):
+    """Place addresses in a building object based on their associated floors and rooms.
+
+    The placement follows ``configuration`` (default: the shared ``config``); the
+    unknown address report goes to ``report_dir`` (default: its ``openhab_path``).
+    """
     if not (building and addresses and project):
         raise ValueError("One or more input data structures are empty.")
 
-    cabinet_devices = get_distribution_board_devices(project)
+    settings = PlacementSettings(configuration)
+    location_index = get_location_index(building, project)
+    cabinet_devices = location_index.cabinet_devices
+    addresses = get_address_registry(addresses)
     unknown_addresses = []
 
     for address in addresses:
@@ -337,24 +637,24 @@ def put_addresses_in_building(building, addresses, project: KNXProject):
             # but will be overridden to the configured group in ets_to_openhab.py
             address["Floor"] = "Zentral"
             address["Room"] = "Zentral"
-            if create_floor_room_if_missing(building, address):
+            if create_floor_room_if_missing(building, address, location_index, settings):
                 continue
         if address['is_notification_sensor']:
             # Place in a special floor and room so they are grouped in the sitemap
             # but will be overridden to the configured group in ets_to_openhab.py
             address["Floor"] = "Zentral"
             address["Room"] = "Melden/Sensor"
-            if create_floor_room_if_missing(building, address):
+            if create_floor_room_if_missing(building, address, location_index, settings):
                 continue
 
-        if place_address_in_building(building, address, cabinet_devices):
+        if place_address_in_building(building, address, location_index, settings):
             continue
         read_co = get_sensor_communication_object(address, cabinet_devices)
-        if place_address_by_device(building, address, read_co, addresses):
+        if place_address_by_device(building, address, read_co, addresses, location_index, settings):
             continue
 
         # Try to create floor/room dynamically if names exist but not in structure yet
-        if create_floor_room_if_missing(building, address):
+        if create_floor_room_if_missing(building, address, location_index, settings):
             continue
 
         logger.warning("No Room found for %s", address["Group name"])
@@ -362,80 +662,85 @@ def put_addresses_in_building(building, addresses, project: KNXProject):
     # TODO: Loop over unknown_addresses to identify Groups/Channels in the same "level"
 
     # Optional auto-placement for unknown addresses
-    if config.get("general", {}).get("auto_place_unknown"):
-        auto_place_unknowns(building, unknown_addresses, addresses, cabinet_devices)
+    if settings.auto_place_unknown:
+        auto_place_unknowns(building, unknown_addresses, addresses, cabinet_devices, settings)
 
     # Always write report for remaining unknowns (for UI/CLI visibility)
-    write_unknown_report(unknown_addresses)
+    write_unknown_report(
+        unknown_addresses, report_dir or settings.config.get("openhab_path", "openhab")
+    )
 
-    if ADD_MISSING_ITEMS:
-        add_unknown_addresses(building, unknown_addresses)
+    if settings.add_missing_items:
+        add_unknown_addresses(building, unknown_addresses, settings)
     else:
         logger.info("Unknown addresses: %s", unknown_addresses)
         logger.info("Total unknown addresses: %d", len(unknown_addresses))
     return building
 
 
-def place_address_in_building(building, address, cabinet_devices):
+def place_address_in_building(building, address, location_index=None, settings=None):
     """Place a single address in the appropriate location in the building."""
+    settings = get_placement_settings(settings)
     if (
         address["Floor"]
         and address["Room"]
-        and address["Floor"] != UNKNOWN_FLOOR_NAME
-        and address["Room"] != UNKNOWN_ROOM_NAME
+        and not settings.is_unknown(address["Floor"], address["Room"])
     ):
-        for building_data in building:
-            for floor in building_data["floors"]:
-                if floor["name_short"] == address["Floor"]:
-                    for room in floor["rooms"]:
-                        if room["name_short"] == address["Room"]:
-                            room.setdefault("Addresses", []).append(address)
-                            logger.debug(
-                                "Address %s placed in Room: %s, Floor: %s",
-                                address["Address"],
-                                room["name_short"],
-                                floor["name_short"],
-                            )
-                            return True
+        location_index = location_index or LocationIndex(building)
+        location = location_index.find_room(address["Floor"], address["Room"])
+        if location:
+            floor, room = location
+            room.setdefault("Addresses", []).append(address)
+            logger.debug(
+                "Address %s placed in Room: %s, Floor: %s",
+                address["Address"],
+                room["name_short"],
+                floor["name_short"],
+            )
+            return True
     return False
 
 
-def place_address_by_device(building, address, read_co, addresses):
+def place_address_by_device(
+    building, address, read_co, addresses, location_index=None, settings=None
+):
     """Place address in building based on device association."""
     if read_co:
-        for building_data in building:
-            for floor in building_data["floors"]:
-                for room in floor["rooms"]:
-                    if "devices" in room and read_co["device_address"] in room["devices"]:
-                        put_address_to_right_place(
-                            address, floor["name_short"], room["name_short"], addresses
-                        )
-                        room["Addresses"].append(address)
-                        logger.debug(
-                            "Address %s placed in Room (via device association): %s, Floor: %s",
-                            address["Address"],
-                            room["name_short"],
-                            floor["name_short"],
-                        )
-                        return True
+        location_index = location_index or LocationIndex(building)
+        location = location_index.find_device_room(read_co["device_address"])
+        if location:
+            floor, room = location
+            put_address_to_right_place(
+                address, floor["name_short"], room["name_short"], addresses, settings
+            )
+            room["Addresses"].append(address)
+            logger.debug(
+                "Address %s placed in Room (via device association): %s, Floor: %s",
+                address["Address"],
+                room["name_short"],
+                floor["name_short"],
+            )
+            return True
     return False
 
 
-def put_address_to_right_place(address, floor_name, room_name, addresses):
+def put_address_to_right_place(address, floor_name, room_name, addresses, settings=None):
     """Set floor and room for address and all subaddresses."""
+    settings = get_placement_settings(settings)
     address["Floor"] = floor_name
     address["Room"] = room_name
+    registry = get_address_registry(addresses)
     item_subaddress = []
     for co in address.get("communication_object"):
         if co.get("device_communication_objects"):
             for dco in co.get("device_communication_objects"):
                 for sub_address in dco.get("group_address_links"):
-                    item_subaddress += [
-                        item for item in addresses if item.get("Address") == sub_address
-                    ]
+                    item = registry.get_address(sub_address)
+                    if item is not None:
+                        item_subaddress.append(item)
     if item_subaddress:
         for item in item_subaddress:
-            if item["Floor"] != UNKNOWN_FLOOR_NAME and item["Room"] != UNKNOWN_ROOM_NAME:
+            if not settings.is_unknown(item["Floor"], item["Room"]):
                 continue
             item["Floor"] = floor_name
             item["Room"] = room_name
@@ -445,72 +750,44 @@ def put_address_to_right_place(address, floor_name, room_name, addresses):
 
 
 # Heuristic: create missing floor/room nodes if names are known but not yet in structure
-def create_floor_room_if_missing(building, address):
+def create_floor_room_if_missing(building, address, location_index=None, settings=None):
     """If floor/room names exist (not unknown), create them and place address."""
     floor = address.get("Floor")
     room = address.get("Room")
     if not floor or not room:
         return False
-    if floor == UNKNOWN_FLOOR_NAME or room == UNKNOWN_ROOM_NAME:
+    if get_placement_settings(settings).is_unknown(floor, room):
         return False
 
-    for building_data in building:
-        # find or create floor
-        target_floor = None
-        for fl in building_data.get("floors", []):
-            if fl.get("name_short") == floor:
-                target_floor = fl
-                break
-        if target_floor is None:
-            target_floor = {
-                "Description": floor,
-                "Group name": floor,
-                "name_long": floor,
-                "name_short": floor,
-                "rooms": [],
-            }
-            building_data.setdefault("floors", []).append(target_floor)
-
-        # find or create room
-        target_room = None
-        for rm in target_floor.get("rooms", []):
-            if rm.get("name_short") == room:
-                target_room = rm
-                break
-        if target_room is None:
-            target_room = {
-                "Description": room,
-                "Group name": room,
-                "name_long": room,
-                "name_short": room,
-                "Addresses": [],
-            }
-            target_floor.setdefault("rooms", []).append(target_room)
-
-        target_room.setdefault("Addresses", []).append(address)
-        logger.debug(
-            "Created floor/room on-the-fly and placed %s in %s/%s",
-            address.get("Address"),
-            floor,
-            room,
-        )
-        return True
+    location_index = location_index or LocationIndex(building)
+    target_room = location_index.get_or_create_room(floor, room)
+    if target_room is None:
+        return False
 
-    return False
+    target_room.setdefault("Addresses", []).append(address)
+    logger.debug(
+        "Created floor/room on-the-fly and placed %s in %s/%s",
+        address.get("Address"),
+        floor,
+        room,
+    )
+    return True
 
 
-def auto_place_unknowns(building, unknown_addresses, all_addresses, cabinet_devices):
+def auto_place_unknowns(building, unknown_addresses, all_addresses, cabinet_devices, settings=None):
     """Heuristisch unbekannte Adressen zuordnen (opt-in per config.general.auto_place_unknown)."""
+    settings = get_placement_settings(settings)
     placed = 0
     report = []
-    floor_pref = config.get("general", {}).get("item_Floor_nameshort_prefix", "=")
-    room_pref = config.get("general", {}).get("item_Room_nameshort_prefix", "+")
+    all_addresses = get_address_registry(all_addresses)
+    floor_pref = settings.floor_prefix
+    room_pref = settings.room_prefix
 
     def try_assign(addr, floor, room, reason):
         nonlocal placed
         if not floor or not room:
             return False
-        if floor == UNKNOWN_FLOOR_NAME or room == UNKNOWN_ROOM_NAME:
+        if settings.is_unknown(floor, room):
             return False
         addr["Floor"] = floor
         addr["Room"] = room
@@ -523,7 +800,7 @@ def auto_place_unknowns(building, unknown_addresses, all_addresses, cabinet_devi
         except ValueError:
             pass
         # Auch Subadressen übernehmen
-        put_address_to_right_place(addr, floor, room, all_addresses)
+        put_address_to_right_place(addr, floor, room, all_addresses, settings)
         return True
 
     # 1) Device-basierte Vererbung: gleiche device_address wie bekannte Adresse
@@ -536,17 +813,16 @@ def auto_place_unknowns(building, unknown_addresses, all_addresses, cabinet_devi
         if not device_ids:
             continue
         candidates = set()
-        for other in all_addresses:
-            if other is addr:
-                continue
-            if other.get("Floor") in (UNKNOWN_FLOOR_NAME, None) or other.get("Room") in (
-                UNKNOWN_ROOM_NAME,
-                None,
-            ):
-                continue
-            for co in other.get("communication_object", []):
-                if co.get("device_address") in device_ids:
-                    candidates.add((other["Floor"], other["Room"]))
+        for device_id in device_ids:
+            for other in all_addresses.get_by_device(device_id):
+                if other is addr:
+                    continue
+                if other.get("Floor") in (settings.unknown_floor, None) or other.get("Room") in (
+                    settings.unknown_room,
+                    None,
+                ):
+                    continue
+                candidates.add((other["Floor"], other["Room"]))
         if len(candidates) == 1:
             floor, room = next(iter(candidates))
             try_assign(addr, floor, room, "device-match")
@@ -578,8 +854,8 @@ def auto_place_unknowns(building, unknown_addresses, all_addresses, cabinet_devi
         logger.info("auto_place_unknown: nothing placed")
 
 
-def write_unknown_report(unknown_addresses):
-    """Write report for remaining unknown addresses."""
+def write_unknown_report(unknown_addresses, report_dir=None):
+    """Write report for remaining unknown addresses to ``report_dir`` (default: ``openhab_path``)."""
     if not unknown_addresses:
         return
     try:
@@ -599,7 +875,7 @@ def write_unknown_report(unknown_addresses):
                 for a in unknown_addresses
             ],
         }
-        base = config.get("openhab_path", "openhab")
+        base = report_dir or config.get("openhab_path", "openhab")
         Path(base).mkdir(parents=True, exist_ok=True)
         Path(base, "unknown_report.json").write_text(
             json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8"
@@ -608,19 +884,21 @@ def write_unknown_report(unknown_addresses):
         logger.warning("Failed to write unknown_report.json: %s", e)
 
 
-def add_unknown_addresses(building, unknown_addresses):
+def add_unknown_addresses(building, unknown_addresses, settings=None):
     """Add unknown addresses to a default floor and room in the building."""
+    settings = get_placement_settings(settings)
+    unknown_floor, unknown_room = settings.unknown_floor, settings.unknown_room
     default_floor = {
-        "Description": UNKNOWN_FLOOR_NAME,
-        "Group name": UNKNOWN_FLOOR_NAME,
-        "name_long": UNKNOWN_FLOOR_NAME,
-        "name_short": UNKNOWN_FLOOR_NAME,
+        "Description": unknown_floor,
+        "Group name": unknown_floor,
+        "name_long": unknown_floor,
+        "name_short": unknown_floor,
         "rooms": [
             {
-                "Description": UNKNOWN_ROOM_NAME,
-                "Group name": UNKNOWN_ROOM_NAME,
-                "name_long": UNKNOWN_ROOM_NAME,
-                "name_short": UNKNOWN_ROOM_NAME,
+                "Description": unknown_room,
+                "Group name": unknown_room,
+                "name_long": unknown_room,
+                "name_short": unknown_room,
                 "Addresses": unknown_addresses,
             }
         ],
@@ -628,8 +906,8 @@ def add_unknown_addresses(building, unknown_addresses):
     building[0]["floors"].append(default_floor)
     logger.info(
         "Added default Floor and Room for unknown addresses: %s, %s",
-        UNKNOWN_FLOOR_NAME,
-        UNKNOWN_ROOM_NAME,
+        unknown_floor,
+        unknown_room,
     )
 
 
@@ -645,14 +923,27 @@ def get_sensor_communication_object(address, cabinet_devices):
     return None
 
 
-def create_json_dump(project: KNXProject, file_path: Path):
-    """Create a JSON dump from a KNX project file."""
-    with open(f"tests/{file_path.name}.json", "w", encoding="utf8") as f:
-        json.dump(project, f, indent=2, ensure_ascii=False)
+def create_json_dump(project: "KNXProject", file_path: Path, dump_dir=None, compression=None):
+    """Create a JSON dump from a KNX project file as configured in ``project_dump``.
 
+    Returns the background writer thread (None if dumping is disabled).
+    """
+    dump_cfg = config.get("project_dump", {})
+    if not dump_cfg.get("enabled", True):
+        return None
+    return project_dump.write_project_dump(
+        project,
+        file_path,
+        dump_dir or dump_cfg.get("dir", "tests"),
+        compression=compression or dump_cfg.get("compression", "none"),
+        compact=dump_cfg.get("compact", False),
+        background=True,
+    )
 
-def get_gateway_ip(project: KNXProject):
-    """Get the IP address of the gateway device."""
+
+def get_gateway_ip(project: "KNXProject", configuration=None):
+    """Get the IP address of the gateway device (hardware names from ``configuration``)."""
+    cfg = configuration if configuration is not None else config
     devices = project["devices"]
     if not devices:
         logger.error("'devices' is empty.")
@@ -660,7 +951,7 @@ def get_gateway_ip(project: KNXProject):
 
     for device in devices.values():
         hw_name_lower = device["hardware_name"].strip().lower()
-        for hw_name in config["devices"]["gateway"]["hardware_name"]:
+        for hw_name in cfg["devices"]["gateway"]["hardware_name"]:
             if hw_name.lower() in hw_name_lower:  # Prüft auf Teilstring
                 description = device["description"].strip()
                 ip_match = re.search(r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}", description)
@@ -670,7 +961,7 @@ def get_gateway_ip(project: KNXProject):
     return None
 
 
-def get_distribution_board_devices(project: KNXProject):
+def get_distribution_board_devices(project: "KNXProject"):
     """Get a list of devices in distribution boards."""
     locations = project["locations"]
     return get_recursive_spaces(locations)
@@ -687,7 +978,7 @@ def get_recursive_spaces(spaces):
     return devices
 
 
-def is_homekit_enabled(project: KNXProject):
+def is_homekit_enabled(project: "KNXProject"):
     """Determine if HomeKit is enabled for the project."""
     # TODO: Read project info or some other method to get Homekit enabled status
     comment_value = project["info"].get("comment")
@@ -701,7 +992,7 @@ def is_homekit_enabled(project: KNXProject):
     return False
 
 
-def is_alexa_enabled(project: KNXProject):
+def is_alexa_enabled(project: "KNXProject"):
     """Determine if Alexa is enabled for the project."""
     comment_value = project["info"].get("comment")
     if isinstance(comment_value, str) and comment_value:
@@ -722,6 +1013,195 @@ def str2bool(v):
     return normalize_string(v) in ("yes", "true", "t", "1")
 
 
+def run_project(
+    file_path,
+    read_dump=False,
+    password=None,
+    use_cache=True,
+    dump_dir=None,
+    dump_compression=None,
+    timer=None,
+):
+    """Load one KNX project (archive or JSON dump) and generate the openHAB files for it.
+
+    Stage timings are written to ``timing_report.json`` next to the other reports;
+    the StageTimer is returned.
+    """
+    timer = timer or StageTimer()
+    dump_thread = None
+    if read_dump:
+        with timer.stage("load_dump"):
+            project = project_dump.load_project_dump(file_path)
+    else:
+        with timer.stage("parse"):
+            project, _ = project_cache.parse_project(
+                file_path,
+                password=password,
+                language="de-DE",
+                parser=XKNXProj,
+                use_cache=use_cache,
+            )
+        dump_thread = create_json_dump(project, file_path, dump_dir, dump_compression)
+
+    with timer.stage("create_building"):
+        building = create_building(project)
+    with timer.stage("get_addresses"):
+        addresses = get_addresses(project)
+    with timer.stage("put_addresses_in_building"):
+        house = put_addresses_in_building(building, addresses, project)
+    prj_name = house[0]["name_long"]
+    ip = get_gateway_ip(project)
+    homekit_enabled = is_homekit_enabled(project)
+    alexa_enabled = is_alexa_enabled(project)
+
+    context = ets_to_openhab.GenerationContext(
+        floors=house[0]["floors"],
+        addresses=addresses,
+        gwip=ip,
+        homekit=homekit_enabled,
+        alexa=alexa_enabled,
+        prj_name=prj_name or ets_to_openhab.DEFAULT_PRJ_NAME,
+        fragment_cache=ets_to_openhab.default_fragment_cache(config),
+    )
+
+    logger.info("Calling ets_to_openhab.main()")
+    ets_to_openhab.main(timer=timer, context=context)
+    if dump_thread:
+        with timer.stage("write_dump"):
+            dump_thread.join()
+    timer.write_report(config.get("openhab_path", "openhab"))
+    return timer
+
+
+def is_project_dump(path) -> bool:
+    """True for (possibly compressed) JSON dumps, False for .knxproj archives."""
+    return Path(path).name.endswith(BATCH_PROJECT_SUFFIXES[1:])
+
+
+def get_project_name(path) -> str:
+    """File name of a project without its project/dump suffix."""
+    name = Path(path).name
+    for suffix in BATCH_PROJECT_SUFFIXES:
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+def find_project_files(paths):
+    """Expand files and directories into a de-duplicated list of project files."""
+    found = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            found.extend(
+                p for p in sorted(path.iterdir()) if p.name.endswith(BATCH_PROJECT_SUFFIXES)
+            )
+        else:
+            found.append(path)
+    return list(dict.fromkeys(found))
+
+
+def redirect_output_paths(output_dir):
+    """Point all generated files and reports of this process into ``output_dir``."""
+    base = Path(config.get("openhab_path", "openhab"))
+    for key in OUTPUT_PATH_KEYS:
+        if not config.get(key):
+            continue
+        path = Path(config[key])
+        try:
+            rel = path.relative_to(base)
+        except ValueError:
+            rel = Path(*path.parts[-2:])
+        config[key] = str(Path(output_dir, rel))
+    config["openhab_path"] = str(output_dir)
+
+
+def _count_report_entries(path, *keys):
+    """Number of entries in a report file (0 if it was not written)."""
+    try:
+        report = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return 0
+    return sum(len(report.get(key, [])) for key in keys)
+
+
+def run_batch_project(file_path, output_dir, password=None, use_cache=True):
+    """Generate one project of a batch run into ``output_dir`` (runs in a worker process)."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO, filename=output_dir / "generation.log", filemode="w", force=True
+    )
+    redirect_output_paths(output_dir)
+    result = {"project": str(file_path), "output": str(output_dir), "status": "ok", "error": None}
+    start = time.perf_counter()
+    try:
+        run_project(
+            file_path,
+            read_dump=is_project_dump(file_path),
+            password=password,
+            use_cache=use_cache,
+            dump_dir=output_dir,
+        )
+    except Exception as e:  # report it and carry on with the other projects
+        logger.exception("Generation failed for %s", file_path)
+        result["status"] = "failed"
+        result["error"] = str(e)
+    result["seconds"] = time.perf_counter() - start
+    result["unknown"] = _count_report_entries(output_dir / "unknown_report.json", "addresses")
+    result["partial"] = _count_report_entries(
+        output_dir / "partial_report.json", "partial_dimmers", "partial_other"
+    )
+    return result
+
+
+def run_batch(paths, output_dir, workers=None, password=None, use_cache=True):
+    """Generate many projects in parallel, each into ``<output_dir>/<project name>/``.
+
+    ``config`` and ``ets_to_openhab`` keep module-level state, so every project
+    runs in a fresh worker process (``max_tasks_per_child=1``).
+    """
+    targets = {}
+    for file_path in find_project_files(paths):
+        name = unique = get_project_name(file_path)
+        index = 2
+        while unique in targets.values():
+            unique = f"{name}_{index}"
+            index += 1
+        targets[file_path] = unique
+    if not targets:
+        logger.error("No KNX projects found in %s", ", ".join(map(str, paths)))
+        return []
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        futures = [
+            pool.submit(run_batch_project, file_path, Path(output_dir, name), password, use_cache)
+            for file_path, name in targets.items()
+        ]
+        return [future.result() for future in futures]
+
+
+def format_batch_summary(results):
+    """Per-project summary table of a batch run."""
+    header = ("Project", "Status", "Time [s]", "Unknown", "Partial")
+    rows = [header] + [
+        (
+            Path(r["project"]).name,
+            r["status"],
+            f"{r['seconds']:.2f}",
+            str(r["unknown"]),
+            str(r["partial"]),
+        )
+        for r in results
+    ]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    lines.extend(f"{Path(r['project']).name}: {r['error']}" for r in results if r["error"])
+    return "\n".join(lines)
+
+
 def main():
     """Main function"""
     logging.basicConfig(level=logging.INFO)
@@ -731,7 +1211,47 @@ def main():
     parser.add_argument("--file_path", type=Path, help="Path to the input KNX project.")
     parser.add_argument("--knxPW", type=str, help="Password for KNX project file if protected")
     parser.add_argument("--readDump", action="store_true", help="Read KNX project from JSON dump")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Always parse the KNX project, bypass the cache"
+    )
+    parser.add_argument("--dump-dir", type=Path, help="Directory for the project JSON dump")
+    parser.add_argument(
+        "--dump-compression",
+        choices=sorted(project_dump.COMPRESSION_SUFFIXES),
+        help="Compression of the project JSON dump (default from config.json)",
+    )
+    parser.add_argument(
+        "--batch",
+        nargs="+",
+        type=Path,
+        metavar="PATH",
+        help="Generate many projects (files or directories) in parallel, unless --file_path is set",
+    )
+    parser.add_argument("--workers", type=int, help="Worker processes for --batch (default: CPUs)")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("batch_output"),
+        help="Directory for the per-project output trees of --batch",
+    )
+    parser.add_argument(
+        "--import-profile",
+        action=import_profile.ImportProfileAction,
+        modules=["knxproject_to_openhab", "xknxproject.xknxproj"],
+        help="Print the import time per module of the CLI (and of xknxproject) and exit",
+    )
     args = parser.parse_args()
+    # the next run starts without compiling config.json
+    save_snapshot()
+
+    if args.batch and not args.file_path:
+        results = run_batch(
+            args.batch, args.output_dir, args.workers, args.knxPW, use_cache=not args.no_cache
+        )
+        print(format_batch_summary(results))
+        if not results or any(r["status"] != "ok" for r in results):
+            raise SystemExit(1)
+        return
 
     if not args.file_path:
         try:
@@ -754,32 +1274,15 @@ def main():
                 "Run with --file_path <path> or install python3-tk."
             )
 
-    if args.readDump:
-        with open(args.file_path, encoding="utf-8") as f:
-            project = json.load(f)
-    else:
-        knxproj = XKNXProj(path=args.file_path, password=args.knxPW, language="de-DE")
-        project = knxproj.parse()
-        create_json_dump(project, args.file_path)
-
-    building = create_building(project)
-    addresses = get_addresses(project)
-    house = put_addresses_in_building(building, addresses, project)
-    prj_name = house[0]["name_long"]
-    ip = get_gateway_ip(project)
-    homekit_enabled = is_homekit_enabled(project)
-    alexa_enabled = is_alexa_enabled(project)
-
-    ets_to_openhab.floors = house[0]["floors"]
-    ets_to_openhab.all_addresses = addresses
-    ets_to_openhab.GWIP = ip
-    ets_to_openhab.B_HOMEKIT = homekit_enabled
-    ets_to_openhab.B_ALEXA = alexa_enabled
-    if prj_name:
-        ets_to_openhab.PRJ_NAME = prj_name
-
-    logger.info("Calling ets_to_openhab.main()")
-    ets_to_openhab.main()
+    timer = run_project(
+        args.file_path,
+        read_dump=args.readDump,
+        password=args.knxPW,
+        use_cache=not args.no_cache,
+        dump_dir=args.dump_dir,
+        dump_compression=args.dump_compression,
+    )
+    print(timer.format_table())
 
 
 if __name__ == "__main__":
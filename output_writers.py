@@ -0,0 +1,304 @@
+"""Streaming writers for the generated openHAB files.
+
+The generator writes item, thing and sitemap fragments as they are produced
+instead of concatenating them into one string per file. Templates are split
+once at their ``###name###`` markers; the fragments are written between the
+head and the tail of the template, and line counts are tracked on the way.
+
+A file whose content did not change is not rewritten: openHAB reparses every
+rewritten file and rebinds all of its KNX channels. The content hashes of
+a run are recorded in a manifest next to the generated files.
+
+With PartWriter the items and things can be split into a small root file and
+one part file per floor, so a change in one room only reloads that floor.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+RE_TEMPLATE_MARKER = re.compile(r"###(\w+)###")
+OUTPUT_MANIFEST_NAME = "output_manifest.json"
+RE_PART_KEY = re.compile(r"map\d+")
+
+
+class SplitTemplate:
+    """A template split at its ``###name###`` markers.
+
+    ``parts`` alternates literal text and marker names, starting and ending
+    with literal text (like ``re.split`` with a capturing group).
+    """
+
+    def __init__(self, text):
+        self.parts = RE_TEMPLATE_MARKER.split(text)
+
+    @property
+    def markers(self):
+        """Marker names in template order."""
+        return self.parts[1::2]
+
+    def render(self, values):
+        """Template text with every marker in ``values`` replaced (others are kept)."""
+        return _render(self.parts, values)
+
+    def split(self, body_marker, values=None):
+        """Head and tail around the first ``body_marker``, other markers replaced by ``values``."""
+        values = values or {}
+        if body_marker not in self.markers:
+            raise ValueError(f"Template has no ###{body_marker}### marker")
+        index = 2 * self.markers.index(body_marker) + 1
+        return _render(self.parts[:index], values), _render(self.parts[index + 1 :], values)
+
+
+def _render(parts, values):
+    return "".join(
+        part if i % 2 == 0 else values.get(part, f"###{part}###") for i, part in enumerate(parts)
+    )
+
+
+@lru_cache(maxsize=32)
+def split_template(text):
+    """Split template text once; the same text always gives the same SplitTemplate."""
+    return SplitTemplate(text)
+
+
+@lru_cache(maxsize=32)
+def _read_template(path, mtime_ns):
+    return Path(path).read_text(encoding="utf8")
+
+
+def read_template(path):
+    """Text of a template file, read again only when the file changed."""
+    path = os.path.abspath(path)
+    return _read_template(path, os.stat(path).st_mtime_ns)
+
+
+def file_digest(path):
+    """SHA-256 of a file's content, None if it does not exist."""
+    sha = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(chunk)
+    except FileNotFoundError:
+        return None
+    return sha.hexdigest()
+
+
+class StreamWriter:
+    """Writes a file as ``head``, the streamed fragments and ``tail``.
+
+    The content goes to a temporary file next to ``path`` that replaces
+    ``path`` on close(), so a failed run leaves the previous file untouched.
+    If ``path`` already has the same content it is left alone (``changed``
+    is False then). ``lines`` counts the lines written so far (a file without
+    newline has one), ``digest`` is the SHA-256 of the content once closed.
+    """
+
+    def __init__(self, path, head="", tail=""):
+        self.path = Path(path)
+        self.tail = tail
+        self.newlines = 0
+        self.digest = None
+        self.changed = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp_path = self.path.with_name(
+            f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        self._file = open(self.tmp_path, "w", encoding="utf8")
+        self.write(head)
+
+    @property
+    def lines(self):
+        return self.newlines + 1
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def write(self, fragment):
+        """Append ``fragment`` to the file."""
+        self._file.write(fragment)
+        self.newlines += fragment.count("\n")
+
+    def close(self):
+        """Write the tail and move the file into place; returns the number of lines."""
+        if not self.closed:
+            try:
+                self.write(self.tail)
+                self._file.close()
+                self.digest = file_digest(self.tmp_path)
+                self.changed = self.digest != file_digest(self.path)
+                if self.changed:
+                    os.replace(self.tmp_path, self.path)
+                else:
+                    self.tmp_path.unlink()
+            except BaseException:
+                self.abort()
+                raise
+        return self.lines
+
+    def abort(self):
+        """Drop the temporary file; the previous file at ``path`` is kept."""
+        self._file.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def part_path(path, key):
+    """Path of the part file ``key`` of the root file ``path`` (``knx.items`` -> ``knx_map1.items``)."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}_{key}{path.suffix}")
+
+
+def part_paths(path):
+    """Existing part files of the root file ``path``, sorted by name."""
+    path = Path(path)
+    if not path.parent.is_dir():
+        return []
+    prefix = f"{path.stem}_"
+    return sorted(
+        p
+        for p in path.parent.glob(f"{prefix}*{path.suffix}")
+        if p.is_file() and RE_PART_KEY.fullmatch(p.name[len(prefix) : -len(path.suffix) or None])
+    )
+
+
+def remove_stale_parts(path, keep=()):
+    """Remove the part files of ``path`` not in ``keep``; returns the removed paths."""
+    keep = {Path(p).resolve() for p in keep}
+    removed = []
+    for part in part_paths(path):
+        if part.resolve() in keep:
+            continue
+        try:
+            part.unlink()
+        except OSError as e:
+            logger.warning("Could not remove stale output file %s: %s", part, e)
+            continue
+        logger.info("Removed stale output file %s", part)
+        removed.append(part)
+    return removed
+
+
+class PartWriter:
+    """A root file plus one part file per key next to it (see part_path()).
+
+    Fragments are written to the part opened last with open_part(), or to the
+    root file before the first part is opened. All files are moved into place
+    on close(); part files of earlier runs which were not written again are
+    removed then, so a deleted floor does not stay behind in openHAB.
+    """
+
+    def __init__(self, path, head="", tail=""):
+        self.root = StreamWriter(path, head, tail)
+        self.parts = {}
+        self.removed = []
+        self._current = self.root
+
+    @property
+    def path(self):
+        return self.root.path
+
+    @property
+    def closed(self):
+        return self.root.closed
+
+    def open_part(self, key, head="", tail=""):
+        """Write the following fragments to the part file ``key``."""
+        if key in self.parts:
+            raise ValueError(f"Part {key} of {self.path} already written")
+        self._current = self.parts[key] = StreamWriter(part_path(self.path, key), head, tail)
+        return self._current
+
+    def write(self, fragment):
+        """Append ``fragment`` to the current file."""
+        self._current.write(fragment)
+
+    def writers(self):
+        """The root writer and the part writers as name -> writer (root first)."""
+        return {"": self.root, **self.parts}
+
+    def close(self):
+        """Close all files and remove stale parts; returns the number of lines of the root file."""
+        try:
+            for writer in self.writers().values():
+                writer.close()
+        except BaseException:
+            self.abort()
+            raise
+        self.removed = remove_stale_parts(self.path, [w.path for w in self.parts.values()])
+        return self.root.lines
+
+    def abort(self):
+        """Drop all temporary files; the previous files are kept."""
+        for writer in self.writers().values():
+            writer.abort()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_manifest(directory, writers):
+    """Write the content hashes of closed ``writers`` (name -> writer) as manifest.
+
+    Returns the manifest: per file its path relative to ``directory``, hash,
+    line count and whether it was rewritten, plus the names of the changed and
+    unchanged files.
+    """
+    directory = Path(directory)
+    files = {}
+    for name, writer in writers.items():
+        try:
+            path = writer.path.resolve().relative_to(directory.resolve()).as_posix()
+        except ValueError:
+            path = str(writer.path)
+        files[name] = {
+            "path": path,
+            "sha256": writer.digest,
+            "lines": writer.lines,
+            "changed": writer.changed,
+        }
+    manifest = {
+        "files": files,
+        "changed": [name for name, entry in files.items() if entry["changed"]],
+        "unchanged": [name for name, entry in files.items() if not entry["changed"]],
+    }
+    path = directory / OUTPUT_MANIFEST_NAME
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Failed to write %s: %s", OUTPUT_MANIFEST_NAME, e)
+        tmp_path.unlink(missing_ok=True)
+    if manifest["unchanged"]:
+        logger.info(
+            "%d of %d files unchanged and not rewritten: %s",
+            len(manifest["unchanged"]),
+            len(files),
+            ", ".join(manifest["unchanged"]),
+        )
+    return manifest
@@ -0,0 +1,105 @@
+"""Directories of pickled cache entries with least-recently-used eviction.
+
+Used by project_cache (parsed projects) and fragment_cache (room fragments).
+Entries are pickled values written atomically into the cache directory. The
+modification time of an entry is its last use; when the directory grows beyond
+``max_bytes`` the least recently used entries are removed.
+"""
+
+import logging
+import os
+import pickle
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CACHE_SUFFIX = ".pickle"
+
+_lock = threading.Lock()
+
+
+def entry_path(cache_dir: Path, key: str) -> Path:
+    """File of the entry stored under ``key``."""
+    return Path(cache_dir) / f"{key}{CACHE_SUFFIX}"
+
+
+def entries(cache_dir: Path):
+    """Files of all entries in ``cache_dir``."""
+    cache_dir = Path(cache_dir)
+    if not cache_dir.is_dir():
+        return []
+    return [p for p in cache_dir.iterdir() if p.is_file() and p.suffix == CACHE_SUFFIX]
+
+
+def remove(path: Path):
+    """Delete ``path``, ignoring errors."""
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+def load(cache_dir: Path, key: str, label="cache"):
+    """Return the value stored under ``key`` or None; ``label`` names the cache in logs."""
+    path = entry_path(cache_dir, key)
+    try:
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:  # corrupt or incompatible entry: treat as miss
+        logger.warning("Dropping unreadable %s entry %s: %s", label, path, e)
+        remove(path)
+        return None
+    try:
+        os.utime(path)  # mark as recently used
+    except OSError:
+        pass
+    return value
+
+
+def store(cache_dir: Path, key: str, value, label="cache") -> bool:
+    """Store ``value`` under ``key``. Returns False if it could not be written."""
+    cache_dir = Path(cache_dir)
+    path = entry_path(cache_dir, key)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not write %s entry %s: %s", label, path, e)
+        remove(tmp_path)
+        return False
+    return True
+
+
+def evict(cache_dir: Path, max_bytes: int, label="cache"):
+    """Remove least recently used entries until the cache fits into ``max_bytes``."""
+    with _lock:
+        sized = []
+        for path in entries(cache_dir):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            sized.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in sized)
+        for _, size, path in sorted(sized, key=lambda e: e[0]):
+            if total <= max_bytes:
+                break
+            logger.info("Evicting %s entry %s", label, path.name)
+            remove(path)
+            total -= size
+
+
+def clear(cache_dir: Path, prefix="") -> int:
+    """Remove all entries whose key starts with ``prefix``. Returns the number removed."""
+    removed = 0
+    for path in entries(cache_dir):
+        if path.name.startswith(prefix):
+            remove(path)
+            removed += 1
+    return removed
@@ -0,0 +1,140 @@
+"""Persistent cache of parsed KNX projects.
+
+Parsing a ``.knxproj`` archive with xknxproject takes minutes on small
+hardware. The parsed ``KNXProject`` dict only depends on the archive content,
+the language and the password, so it is stored under a key derived from these
+(plus the xknxproject version) and reused by the CLI, the web jobs and the
+preview endpoints.
+
+Entries are kept in a pickle_cache directory: written atomically and removed
+least recently used first when the directory grows beyond ``max_bytes``.
+
+Invalidation::
+
+    python project_cache.py clear                  # drop all entries
+    python project_cache.py clear <file.knxproj>   # drop entries of one archive
+"""
+
+import argparse
+import hashlib
+import logging
+from pathlib import Path
+
+import cache_dirs
+import pickle_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+CACHE_SUFFIX = pickle_cache.CACHE_SUFFIX
+LABEL = "project cache"
+
+
+def get_cache_dir(cache_dir=None) -> Path:
+    """Return the cache directory (argument, $KNX_PROJECT_CACHE_DIR or cache root)."""
+    return cache_dirs.cache_dir("projects", "KNX_PROJECT_CACHE_DIR", cache_dir)
+
+
+def file_digest(path) -> str:
+    """SHA-256 of a file's content."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _parser_version() -> str:
+    try:
+        from xknxproject.__version__ import __version__
+
+        return __version__
+    except ImportError:
+        return "unknown"
+
+
+def cache_key(archive_digest: str, language: str, password=None) -> str:
+    """Key of a parsed project: archive content, language, password and parser version."""
+    password_fp = hashlib.sha256(password.encode("utf-8")).hexdigest() if password else ""
+    material = "\0".join((archive_digest, language or "", password_fp, _parser_version()))
+    return f"{archive_digest[:16]}-{hashlib.sha256(material.encode('utf-8')).hexdigest()[:32]}"
+
+
+def load(key: str, cache_dir=None):
+    """Return the cached project for ``key`` or None."""
+    return pickle_cache.load(get_cache_dir(cache_dir), key, LABEL)
+
+
+def store(key: str, project, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+    """Store ``project`` under ``key`` and evict old entries beyond ``max_bytes``."""
+    cache_dir = get_cache_dir(cache_dir)
+    if pickle_cache.store(cache_dir, key, project, LABEL):
+        evict(cache_dir, max_bytes)
+
+
+def evict(cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+    """Remove least recently used entries until the cache fits into ``max_bytes``."""
+    pickle_cache.evict(get_cache_dir(cache_dir), max_bytes, LABEL)
+
+
+def clear(cache_dir=None, archive_path=None) -> int:
+    """Remove all entries, or only those of ``archive_path``. Returns the number removed."""
+    prefix = f"{file_digest(archive_path)[:16]}-" if archive_path else ""
+    return pickle_cache.clear(get_cache_dir(cache_dir), prefix)
+
+
+def parse_project(
+    path,
+    password=None,
+    language="de-DE",
+    cache_dir=None,
+    max_bytes=DEFAULT_MAX_BYTES,
+    parser=None,
+    use_cache=True,
+):
+    """Parse a .knxproj archive, reusing a cached result for identical input.
+
+    ``parser`` is called as ``parser(path=..., password=..., language=...)`` and
+    must return an object with ``parse()``; it defaults to ``XKNXProj``.
+    Returns ``(project, from_cache)``.
+    """
+    if parser is None:
+        from xknxproject.xknxproj import XKNXProj
+
+        parser = XKNXProj
+
+    key = None
+    if use_cache:
+        try:
+            key = cache_key(file_digest(path), language, password)
+        except OSError as e:
+            logger.warning("Project cache disabled for %s: %s", path, e)
+        else:
+            project = load(key, cache_dir)
+            if project is not None:
+                logger.info("Loaded parsed project %s from cache", path)
+                return project, True
+
+    project = parser(path=path, password=password, language=language).parse()
+    if key is not None:
+        store(key, project, cache_dir, max_bytes)
+    return project, False
+
+
+def main():
+    """Command line entry point for cache maintenance."""
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Manage the cache of parsed KNX projects")
+    parser.add_argument("--cache-dir", type=Path, help="Cache directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    clear_parser = subparsers.add_parser("clear", help="Remove cached projects")
+    clear_parser.add_argument("archive", nargs="?", type=Path, help="Only entries of this archive")
+    args = parser.parse_args()
+
+    if args.command == "clear":
+        removed = clear(args.cache_dir, args.archive)
+        logger.info("Removed %d cached project(s) from %s", removed, get_cache_dir(args.cache_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""Writing and reading of KNX project JSON dumps.
+
+A dump contains the complete parsed project and easily reaches hundreds of MB.
+``write_project_dump`` writes it pretty-printed or compact, optionally gzip or
+zstd compressed (``.json.gz`` / ``.json.zst``), and can do the compression and
+file I/O in a background thread.
+
+``json.load`` keeps the raw text and the full object graph in memory at the
+same time. ``load_project_dump`` instead streams the file (decompressing it
+transparently), materializes only the top-level sections the pipeline uses,
+one member (e.g. one communication object) at a time, and skips everything
+else without building objects for it.
+"""
+
+import gzip
+import io
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# top-level sections of a KNXProject that are read by the generator
+PROJECT_SECTIONS = (
+    "info",
+    "locations",
+    "group_addresses",
+    "group_ranges",
+    "devices",
+    "communication_objects",
+)
+
+CHUNK_SIZE = 1024 * 1024
+
+COMPRESSION_SUFFIXES = {"none": ".json", "gzip": ".json.gz", "zstd": ".json.zst"}
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+RE_WHITESPACE = re.compile(r"\s*")
+# rest of a string; group 1 is None if the string is cut off at the end of the buffer
+RE_STRING_END = re.compile(r'(?:[^"\\]+|\\.)*(?:(")|\\?\Z)', re.DOTALL)
+# a bracket or a string (same cut-off handling as RE_STRING_END)
+RE_TOKEN = re.compile(r'[{}\[\]]|"(?:[^"\\]+|\\.)*(?:(")|\\?\Z)', re.DOTALL)
+RE_SCALAR = re.compile(r"[^,}\]\s]*")
+
+
+def peak_memory_mb():
+    """Peak resident set size of this process in MB (None if not available)."""
+    try:
+        import resource
+        import sys
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS, in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class _SectionReader:
+    """Minimal incremental scanner over the top-level object of a JSON file."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size=None):
+        """Read the next chunk, dropping consumed text. Returns False at EOF."""
+        if self.eof:
+            return False
+        chunk = self.f.read(size or CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self):
+        """Skip whitespace and return the next character ('' at EOF)."""
+        while True:
+            self.pos = RE_WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"Invalid project dump: expected {char!r} at offset {self.pos}")
+        self.pos += 1
+
+    def _skip_string(self):
+        """Skip a string; ``pos`` points behind the opening quote."""
+        while True:
+            m = RE_STRING_END.match(self.buf, self.pos)
+            if m.group(1):
+                self.pos = m.end()
+                return
+            if not self._fill():
+                raise ValueError("Invalid project dump: unterminated string")
+
+    def _skip_value(self):
+        """Skip the JSON value starting at ``pos`` without building objects."""
+        char = self._peek()
+        if char == '"':
+            self.pos += 1
+            self._skip_string()
+            return
+        if char not in "{[":
+            while True:
+                m = RE_SCALAR.match(self.buf, self.pos)
+                if m.end() < len(self.buf) or not self._fill():
+                    self.pos = m.end()
+                    return
+        depth = 0
+        while True:
+            m = RE_TOKEN.search(self.buf, self.pos)
+            if not m:
+                self.pos = len(self.buf)
+                if not self._fill():
+                    raise ValueError("Invalid project dump: unexpected end of file")
+                continue
+            token = m.group()
+            if token[0] == '"':
+                if not m.group(1):
+                    # string continues in the next chunk
+                    self.pos = m.start()
+                    if not self._fill():
+                        raise ValueError("Invalid project dump: unterminated string")
+                    continue
+            elif token in "{[":
+                depth += 1
+            else:
+                depth -= 1
+            self.pos = m.end()
+            if depth == 0:
+                return
+
+    def _next_member(self, close):
+        """Consume the ``,`` after a member; True if ``close`` ends the container instead."""
+        char = self._peek()
+        self.pos += 1
+        if char == close:
+            return True
+        if char != ",":
+            raise ValueError(f"Invalid project dump: unexpected {char!r} at offset {self.pos}")
+        return False
+
+    def _read_value(self):
+        """Parse the JSON value (a section) starting at ``pos``.
+
+        Objects and arrays are decoded one member at a time, so besides the
+        objects built so far only the text of the current member is buffered.
+        """
+        char = self._peek()
+        if char == "{":
+            self.pos += 1
+            result = {}
+            if self._peek() == "}":
+                self.pos += 1
+                return result
+            while True:
+                key = self._read_key()
+                self._expect(":")
+                result[key] = self._decode()
+                if self._next_member("}"):
+                    return result
+        if char == "[":
+            self.pos += 1
+            result = []
+            if self._peek() == "]":
+                self.pos += 1
+                return result
+            while True:
+                result.append(self._decode())
+                if self._next_member("]"):
+                    return result
+        return self._decode()
+
+    def _decode(self):
+        """Decode the JSON value starting at ``pos`` as a whole.
+
+        The decoder is retried on a growing buffer until the value is complete,
+        so only the text of this value (not of the whole file) is held at once.
+        """
+        if self._peek() not in '"{[':
+            # a number at the end of the buffer may continue in the next chunk
+            while RE_SCALAR.match(self.buf, self.pos).end() == len(self.buf) and self._fill():
+                pass
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # incomplete value: at least double the buffer and try again
+                if self._fill(max(CHUNK_SIZE, len(self.buf) - self.pos)):
+                    continue
+                raise
+            self.pos = end
+            return value
+
+    def _read_key(self):
+        if self._peek() != '"':
+            raise ValueError(f"Invalid project dump: expected key at offset {self.pos}")
+        return self._decode()
+
+    def read_sections(self, sections):
+        """Return a dict of the wanted top-level sections."""
+        result = {}
+        self._expect("{")
+        if self._peek() == "}":
+            return result
+        while True:
+            key = self._read_key()
+            self._expect(":")
+            if key in sections:
+                result[key] = self._read_value()
+                if len(result) == len(sections):
+                    # everything needed is read, the rest of the file is irrelevant
+                    return result
+            else:
+                logger.debug("Skipping project dump section %s", key)
+                self._skip_value()
+            if self._next_member("}"):
+                return result
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def get_dump_path(source_path, dump_dir, compression="none") -> Path:
+    """Path of the dump for ``source_path``: ``<dump_dir>/<name><suffix>``."""
+    return Path(dump_dir) / f"{Path(source_path).name}{COMPRESSION_SUFFIXES[compression]}"
+
+
+def encode_project(project, compact=False) -> bytes:
+    """Serialize a project to UTF-8 JSON (compact or indented)."""
+    if compact:
+        text = json.dumps(project, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = json.dumps(project, indent=2, ensure_ascii=False)
+    return text.encode("utf-8")
+
+
+def _write_file(data: bytes, path: Path, compression: str):
+    if compression == "gzip":
+        data = gzip.compress(data, compresslevel=6, mtime=0)
+    elif compression == "zstd":
+        data = _zstandard().ZstdCompressor(level=3).compress(data)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    logger.info("Wrote project dump %s (%d bytes)", path, len(data))
+
+
+def write_project_dump(
+    project, source_path, dump_dir, compression="none", compact=False, background=False
+):
+    """Write the dump of ``project`` parsed from ``source_path`` into ``dump_dir``.
+
+    The project is serialized immediately, so it may be modified afterwards.
+    With ``background`` compression and writing happen in a thread which is
+    returned (and has to be joined by the caller), otherwise None is returned.
+    """
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown dump compression: {compression}")
+    if compression == "zstd" and _zstandard() is None:
+        logger.warning("zstandard is not installed, writing gzip compressed dump instead")
+        compression = "gzip"
+    path = get_dump_path(source_path, dump_dir, compression)
+    data = encode_project(project, compact)
+
+    def write():
+        try:
+            _write_file(data, path, compression)
+        except OSError as e:
+            logger.error("Failed to write project dump %s: %s", path, e)
+
+    if not background:
+        write()
+        return None
+    thread = threading.Thread(target=write, name="project-dump")
+    thread.start()
+    return thread
+
+
+def open_project_dump(path):
+    """Open a dump for reading text, detecting gzip/zstd compression by magic bytes."""
+    with open(path, "rb") as f:
+        magic = f.read(4)
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if magic == ZSTD_MAGIC:
+        zstandard = _zstandard()
+        if zstandard is None:
+            raise ImportError(f"{path} is zstd compressed; install 'zstandard' to read it")
+        raw = open(path, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(reader, encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def load_project_dump(path, sections=PROJECT_SECTIONS):
+    """Load the given top-level sections of a (possibly compressed) project JSON dump."""
+    with open_project_dump(path) as f:
+        project = _SectionReader(f).read_sections(set(sections))
+    peak = peak_memory_mb()
+    if peak is not None:
+        logger.info("Loaded project dump %s (peak memory %.1f MB)", path, peak)
+    return project
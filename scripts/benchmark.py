@@ -0,0 +1,277 @@
+"""
+Benchmark Suite
+
+Runs the conversion pipeline on the shipped projects, replicated to several
+multiples of their group address count, and records wall/CPU time per stage
+(see stage_timing.py). Every run happens in a fresh process, exactly like a
+--batch run, so module-level state cannot leak between runs.
+
+The ``scaling`` section of the result holds the exponent of each stage between
+the smallest and the largest scale (time ~ GAs ** exponent): ~1 is linear,
+~2 points to a quadratic hot path.
+
+Usage:
+    python scripts/benchmark.py
+    python scripts/benchmark.py --scales 1 10 --repeat 3 --output bench.json
+    python scripts/benchmark.py --baseline bench_baseline.json --threshold 1.3
+"""
+
+import argparse
+import copy
+import datetime
+import json
+import math
+import platform
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+import knxproject_to_openhab  # noqa: E402
+import project_dump  # noqa: E402
+from stage_timing import TIMING_REPORT_NAME  # noqa: E402
+
+DEFAULT_PROJECTS = [
+    PROJECT_ROOT / "tests" / "Charne.knxproj.json",
+    PROJECT_ROOT / "tests" / "upload.knxprojarchive.json",
+    PROJECT_ROOT / "tests" / "fixtures" / "mini_project.json",
+]
+DEFAULT_SCALES = [1, 10, 50]
+# stages faster than this are too noisy for baseline comparison
+MIN_COMPARE_SECONDS = 0.005
+
+
+def _scaled_address(address, copy_index):
+    """Unique group address for a copy: the sub group is shifted by 256 per copy."""
+    parts = address.split("/")
+    if parts[-1].isdigit():
+        parts[-1] = str(int(parts[-1]) + 256 * copy_index)
+        return "/".join(parts)
+    return f"{address}#{copy_index}"
+
+
+def _scale_links(co, copy_index):
+    co["group_address_links"] = [
+        _scaled_address(link, copy_index) for link in co.get("group_address_links", [])
+    ]
+    for sibling in co.get("device_communication_objects", []):
+        _scale_links(sibling, copy_index)
+
+
+def _add_device_copies(spaces, copies):
+    for space in spaces.values():
+        if space.get("devices"):
+            space["devices"] = space["devices"] + [
+                f"{device}#{i}" for i in range(1, copies) for device in space["devices"]
+            ]
+        _add_device_copies(space.get("spaces", {}), copies)
+
+
+def scale_project(project, factor):
+    """Replicate group addresses, communication objects and devices ``factor`` times.
+
+    Copies keep names, rooms and group ranges of the originals, so every room
+    ends up with ``factor`` times the addresses and devices.
+    """
+    scaled = copy.deepcopy(project)
+    if factor <= 1:
+        return scaled
+    group_addresses = scaled["group_addresses"]
+    communication_objects = scaled["communication_objects"]
+    devices = scaled["devices"]
+    for i in range(1, factor):
+        for key, ga in project["group_addresses"].items():
+            ga = copy.deepcopy(ga)
+            ga["address"] = _scaled_address(ga["address"], i)
+            ga["communication_object_ids"] = [
+                f"{co_id}#{i}" for co_id in ga["communication_object_ids"]
+            ]
+            group_addresses[f"{key}#{i}"] = ga
+        for co_id, co in project["communication_objects"].items():
+            co = copy.deepcopy(co)
+            co["device_address"] = f"{co['device_address']}#{i}"
+            _scale_links(co, i)
+            communication_objects[f"{co_id}#{i}"] = co
+        for device_id, device in project["devices"].items():
+            device = copy.deepcopy(device)
+            if "individual_address" in device:
+                device["individual_address"] = f"{device['individual_address']}#{i}"
+            device["communication_object_ids"] = [
+                f"{co_id}#{i}" for co_id in device.get("communication_object_ids", [])
+            ]
+            devices[f"{device_id}#{i}"] = device
+    _add_device_copies(scaled["locations"], factor)
+    return scaled
+
+
+def _run_once(dump_path, output_dir):
+    """Generate one project in a fresh process and return its stage report."""
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+        result = pool.submit(
+            knxproject_to_openhab.run_batch_project, dump_path, output_dir
+        ).result()
+    if result["status"] != "ok":
+        raise RuntimeError(f"Generation failed for {dump_path}: {result['error']}")
+    return json.loads(Path(output_dir, TIMING_REPORT_NAME).read_text(encoding="utf-8"))
+
+
+def benchmark_project(project_path, scales, repeat, work_dir):
+    """Best-of-``repeat`` stage timings of one project for every scale."""
+    project = project_dump.load_project_dump(project_path)
+    name = knxproject_to_openhab.get_project_name(project_path)
+    results = {}
+    for scale in scales:
+        scaled = scale_project(project, scale)
+        dump_path = Path(work_dir, f"{name}_x{scale}.json")
+        dump_path.write_bytes(project_dump.encode_project(scaled, compact=True))
+        stages = {}
+        for run in range(repeat):
+            report = _run_once(dump_path, Path(work_dir, f"{name}_x{scale}_{run}"))
+            for record in report["stages"]:
+                best = stages.get(record["stage"])
+                if best is None or record["wall_s"] < best["wall_s"]:
+                    stages[record["stage"]] = {"wall_s": record["wall_s"], "cpu_s": record["cpu_s"]}
+        results[str(scale)] = {
+            "group_addresses": len(scaled["group_addresses"]),
+            "stages": stages,
+            "total_wall_s": round(sum(s["wall_s"] for s in stages.values()), 6),
+        }
+        print(
+            f"[*] {name} x{scale}: {results[str(scale)]['group_addresses']} GAs, "
+            f"{results[str(scale)]['total_wall_s']:.3f} s"
+        )
+    return results
+
+
+def scaling_exponents(project_results):
+    """Exponent per stage between the smallest and largest scale (None if not measurable)."""
+    scales = sorted(project_results, key=int)
+    if len(scales) < 2:
+        return {}
+    low, high = project_results[scales[0]], project_results[scales[-1]]
+    ga_ratio = high["group_addresses"] / low["group_addresses"]
+    exponents = {}
+    for stage, timing in high["stages"].items():
+        base = low["stages"].get(stage, {}).get("wall_s", 0)
+        if base <= 0 or timing["wall_s"] <= 0 or ga_ratio <= 1:
+            exponents[stage] = None
+        else:
+            exponents[stage] = round(math.log(timing["wall_s"] / base) / math.log(ga_ratio), 2)
+    return exponents
+
+
+def compare_with_baseline(results, baseline, threshold):
+    """List of regressions (stage wall time above ``threshold`` x baseline)."""
+    regressions = []
+    for project, scales in results["results"].items():
+        for scale, current in scales.items():
+            old = baseline.get("results", {}).get(project, {}).get(scale)
+            if not old:
+                continue
+            for stage, timing in current["stages"].items():
+                old_wall = old["stages"].get(stage, {}).get("wall_s")
+                if not old_wall or max(old_wall, timing["wall_s"]) < MIN_COMPARE_SECONDS:
+                    continue
+                ratio = timing["wall_s"] / old_wall
+                if ratio > threshold:
+                    regressions.append(
+                        {
+                            "project": project,
+                            "scale": scale,
+                            "stage": stage,
+                            "baseline_wall_s": old_wall,
+                            "wall_s": timing["wall_s"],
+                            "ratio": round(ratio, 2),
+                        }
+                    )
+    return regressions
+
+
+def format_results(results):
+    """Table of the wall time per stage and scale plus the scaling exponent."""
+    lines = []
+    for project, scales in results["results"].items():
+        stage_names = list(next(iter(scales.values()))["stages"])
+        header = ["Stage"] + [f"x{s}" for s in scales] + ["exp"]
+        rows = [header]
+        for stage in stage_names:
+            row = [stage]
+            for timing in scales.values():
+                wall = timing["stages"].get(stage, {}).get("wall_s")
+                row.append("-" if wall is None else f"{wall:.3f}")
+            exponent = results["scaling"][project].get(stage)
+            row.append("-" if exponent is None else f"{exponent:.2f}")
+            rows.append(row)
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        lines.append(f"\n{project}")
+        for row in rows:
+            lines.append(
+                "  ".join(
+                    cell.ljust(w) if i == 0 else cell.rjust(w)
+                    for i, (cell, w) in enumerate(zip(row, widths))
+                )
+            )
+    return "\n".join(lines)
+
+
+def run_benchmarks(projects, scales, repeat=1):
+    """Run the suite and return the JSON-serializable result."""
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="knx_bench_") as work_dir:
+        for project_path in projects:
+            name = knxproject_to_openhab.get_project_name(project_path)
+            results[name] = benchmark_project(project_path, scales, repeat, work_dir)
+    return {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scales": scales,
+            "repeat": repeat,
+        },
+        "results": results,
+        "scaling": {name: scaling_exponents(scaled) for name, scaled in results.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the KNX to openHAB conversion")
+    parser.add_argument(
+        "--projects", type=Path, nargs="+", default=DEFAULT_PROJECTS, help="Project JSON dumps"
+    )
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per measurement (best wins)")
+    parser.add_argument(
+        "--output", type=Path, default=Path("benchmark_results.json"), help="Result JSON file"
+    )
+    parser.add_argument("--baseline", type=Path, help="Result JSON to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=1.25, help="Allowed slowdown factor vs. baseline"
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.projects, sorted(set(args.scales)), args.repeat)
+    print(format_results(results))
+
+    regressions = []
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        results["regressions"] = regressions
+        for r in regressions:
+            print(
+                f"[REGRESSION] {r['project']} x{r['scale']} {r['stage']}: "
+                f"{r['baseline_wall_s']:.3f} s -> {r['wall_s']:.3f} s ({r['ratio']}x)"
+            )
+
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"\n[*] Results written to {args.output}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
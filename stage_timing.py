@@ -0,0 +1,86 @@
+"""Wall and CPU time per stage of the generation pipeline."""
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+TIMING_REPORT_NAME = "timing_report.json"
+
+
+class StageTimer:
+    """Records wall and CPU time of named pipeline stages.
+
+    CPU time is measured per thread, so concurrent web jobs do not account each
+    other's work. ``on_stage`` is called with the record of every finished stage.
+    Stages may add named counters (e.g. cache hits) to ``counters``, they are
+    included in the report.
+    """
+
+    def __init__(self, on_stage=None):
+        self.stages = []
+        self.counters = {}
+        self.on_stage = on_stage
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as stage ``name`` (also if it raises)."""
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            record = {
+                "stage": name,
+                "wall_s": round(time.perf_counter() - wall_start, 6),
+                "cpu_s": round(time.thread_time() - cpu_start, 6),
+            }
+            self.stages.append(record)
+            logger.debug(
+                "Stage %s: %.3f s wall, %.3f s CPU", name, record["wall_s"], record["cpu_s"]
+            )
+            if self.on_stage:
+                self.on_stage(record)
+
+    def report(self):
+        """Stage records plus totals as a JSON-serializable dict."""
+        return {
+            "stages": self.stages,
+            "total": {
+                "wall_s": round(sum(s["wall_s"] for s in self.stages), 6),
+                "cpu_s": round(sum(s["cpu_s"] for s in self.stages), 6),
+            },
+            "counters": self.counters,
+        }
+
+    def write_report(self, directory):
+        """Write ``timing_report.json`` into ``directory`` and return its path."""
+        path = Path(directory, TIMING_REPORT_NAME)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+        except OSError as e:
+            logger.warning("Failed to write %s: %s", TIMING_REPORT_NAME, e)
+            return None
+        return path
+
+    def format_table(self):
+        """Summary table of all stages for console output."""
+        total = self.report()["total"]
+        rows = [("Stage", "Wall [s]", "CPU [s]")]
+        rows += [(s["stage"], f"{s['wall_s']:.3f}", f"{s['cpu_s']:.3f}") for s in self.stages]
+        rows.append(("total", f"{total['wall_s']:.3f}", f"{total['cpu_s']:.3f}"))
+        widths = [max(len(row[i]) for row in rows) for i in range(3)]
+        lines = [
+            "  ".join(
+                cell.ljust(width) if i == 0 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(row, widths))
+            )
+            for row in rows
+        ]
+        lines.insert(1, "  ".join("-" * width for width in widths))
+        lines.insert(-1, lines[1])
+        return "\n".join(lines)
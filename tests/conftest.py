@@ -2,6 +2,7 @@
 
 import os
 import sys
+import tempfile
 from pathlib import Path
 
 import pytest
@@ -10,6 +11,11 @@ import pytest
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+# Tests mock the openHAB detection, so a cached result must not leak in
+os.environ.setdefault("KNX_OPENHAB_CONF_TTL", "0")
+# Caches written by the tests stay out of the user cache directory
+os.environ.setdefault("KNX_CACHE_DIR", tempfile.mkdtemp(prefix="knx_to_openhab-tests-"))
+
 
 @pytest.fixture(scope="session")
 def project_root_dir():
@@ -43,10 +43,6 @@ class TestBusinessLogic:
         config["general"]["RoomNameAsItIs"] = False
         config["general"]["addMissingItems"] = True
 
-        knxproject_to_openhab.FloorNameAsItIs = False
-        knxproject_to_openhab.RoomNameAsItIs = False
-        knxproject_to_openhab.ADD_MISSING_ITEMS = True
-
     def test_no_room_found_warnings(self, caplog):
         """Test that 'No Room found' warnings are logged for unplaced addresses"""
         # Load test project
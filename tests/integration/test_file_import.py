@@ -41,15 +41,6 @@ class TestFileImport:
         config["general"]["unknown_floorname"] = "unknown"
         config["general"]["unknown_roomname"] = "unknown"
 
-        # Update module level vars
-        knxproject_to_openhab.FloorNameAsItIs = False
-        knxproject_to_openhab.RoomNameAsItIs = False
-        knxproject_to_openhab.ITEM_FLOOR_NAME_SHORT_PREFIX = "="
-        knxproject_to_openhab.ITEM_ROOM_NAME_SHORT_PREFIX = "+"
-        knxproject_to_openhab.ADD_MISSING_ITEMS = True
-        knxproject_to_openhab.UNKNOWN_FLOOR_NAME = "unknown"
-        knxproject_to_openhab.UNKNOWN_ROOM_NAME = "unknown"
-
     @pytest.mark.parametrize("json_file", get_json_files())
     def test_import_json_dump(self, json_file):
         """Test importing a JSON dump and generating the building structure."""
@@ -48,10 +48,6 @@ class TestOutputValidation:
         config["general"]["RoomNameAsItIs"] = False
         config["general"]["addMissingItems"] = True
 
-        knxproject_to_openhab.FloorNameAsItIs = False
-        knxproject_to_openhab.RoomNameAsItIs = False
-        knxproject_to_openhab.ADD_MISSING_ITEMS = True
-
     def _generate_openhab_files(self, tmp_path, project_path: Path):
         """Helper to generate OpenHAB files from test project"""
         # Load test project
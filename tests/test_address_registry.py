@@ -0,0 +1,90 @@
+import copy
+import json
+from pathlib import Path
+
+import knxproject_to_openhab as k2o
+from config import config
+
+TESTS_DIR = Path(__file__).parent
+MINI_PROJECT = TESTS_DIR / "fixtures" / "mini_project.json"
+
+
+def _address(ga, devices=(), links=(), floor=None, room=None):
+    return {
+        "Group name": f"GA {ga}",
+        "Address": ga,
+        "Floor": floor or config["general"]["unknown_floorname"],
+        "Room": room or config["general"]["unknown_roomname"],
+        "communication_object": [
+            {
+                "device_address": dev,
+                "device_communication_objects": [{"group_address_links": list(links)}],
+            }
+            for dev in devices
+        ],
+    }
+
+
+def test_registry_indexes_the_extracted_addresses():
+    with open(MINI_PROJECT, encoding="utf-8") as f:
+        project = json.load(f)
+
+    addresses = k2o.AddressRegistry(k2o.get_addresses(project))
+
+    assert k2o.get_address_registry(addresses) is addresses
+    assert len(addresses) and addresses[0] is next(iter(addresses))
+    for address in addresses:
+        assert addresses.get_address(address["Address"]) is address
+        for co in address["communication_object"]:
+            assert address in addresses.get_by_device(co["device_address"])
+
+
+def test_registry_keeps_indexes_in_sync_on_remove():
+    first = _address("1/1/1", devices=["1.1.1"])
+    second = _address("1/1/2", devices=["1.1.1", "1.1.2"])
+    registry = k2o.AddressRegistry([first, second])
+
+    registry.remove(second)
+
+    assert registry.get_address("1/1/2") is None
+    assert registry.get_by_device("1.1.1") == [first]
+    assert registry.get_by_device("1.1.2") == []
+
+
+def test_registry_only_changes_through_indexed_operations():
+    first = _address("1/1/1", devices=["1.1.1"])
+    duplicate = _address("1/1/1", devices=["1.1.2"])
+    registry = k2o.AddressRegistry([first, duplicate])
+
+    for name in ("insert", "extend", "pop", "clear", "__setitem__", "__delitem__", "__iadd__"):
+        assert not hasattr(registry, name)
+    registry.remove(first)
+
+    assert list(registry) == [duplicate]
+    assert registry.get_address("1/1/1") is duplicate
+
+
+def test_put_address_to_right_place_moves_unknown_subaddresses_only():
+    known = _address("1/1/3", floor="=OG", room="+RM2")
+    unknown = _address("1/1/2")
+    main = _address("1/1/1", devices=["1.1.1"], links=["1/1/2", "1/1/3", "9/9/9"])
+    registry = k2o.AddressRegistry([main, unknown, known])
+
+    k2o.put_address_to_right_place(main, "=EG", "+RM1", registry)
+
+    assert (main["Floor"], main["Room"]) == ("=EG", "+RM1")
+    assert (unknown["Floor"], unknown["Room"]) == ("=EG", "+RM1")
+    assert (known["Floor"], known["Room"]) == ("=OG", "+RM2")
+
+
+def test_placement_follows_the_given_configuration():
+    with open(MINI_PROJECT, encoding="utf-8") as f:
+        project = json.load(f)
+    cfg = copy.deepcopy(config.copy())
+    cfg["regexpattern"]["item_Room"] = r"(?!)"  # never matches
+    cfg["general"]["unknown_roomname"] = "nowhere"
+
+    addresses = k2o.get_addresses(project, configuration=cfg)
+
+    assert {address["Room"] for address in addresses} == {"nowhere"}
+    assert "nowhere" not in {address["Room"] for address in k2o.get_addresses(project)}
@@ -0,0 +1,60 @@
+import ets_to_openhab
+
+
+def _address(ga, cos=1):
+    return {"Address": ga, "Group name": f"GA {ga}", "communication_object": [{}] * cos}
+
+
+def test_consumed_addresses_are_hidden_in_original_order():
+    addresses = [_address("1/1/3"), _address("1/1/1"), _address("1/1/2")]
+    store = ets_to_openhab.AddressStore(addresses)
+
+    store.consume("1/1/1")
+    store.consume("9/9/9")  # unknown addresses are ignored
+
+    assert "1/1/1" not in store
+    assert "1/1/2" in store
+    assert store.get("1/1/1") is None
+    assert store.get("1/1/3") is addresses[0]
+    assert [a["Address"] for a in store] == ["1/1/3", "1/1/2"]
+    assert len(store) == 2
+
+
+def test_linked_keeps_store_order_not_link_order():
+    addresses = [_address("1/1/1"), _address("1/1/2"), _address("1/1/3")]
+    store = ets_to_openhab.AddressStore(addresses)
+    store.consume("1/1/2")
+
+    linked = store.linked(["1/1/3", "1/1/2", "1/1/1", "1/1/3", "9/9/9"])
+
+    assert linked == [addresses[0], addresses[2]]
+
+
+def test_get_address_store_reuses_existing_store():
+    store = ets_to_openhab.AddressStore([_address("1/1/1")])
+    assert ets_to_openhab.get_address_store(store) is store
+    assert isinstance(ets_to_openhab.get_address_store([]), ets_to_openhab.AddressStore)
+
+
+def test_data_of_name_probes_the_name_index():
+    addresses = [
+        _address("1/1/1") | {"Group name": "Licht Dimmen Status"},
+        _address("1/1/2") | {"Group name": "Licht Dimmen"},
+        _address("1/1/3") | {"Group name": "Licht Schalten"},
+        _address("1/1/4") | {"Group name": "Licht DimmenStatus"},
+    ]
+    store = ets_to_openhab.AddressStore(addresses)
+
+    assert ets_to_openhab.name_candidates("Licht Dimmen", ["Status"], "Dimmen") == {
+        "Licht DimmenStatus",
+        "Licht Dimmen Status",
+        "Licht Status",
+    }
+    # first match in store order wins, the base name itself never matches
+    assert ets_to_openhab.data_of_name(store, "Licht Dimmen", "Status") is addresses[0]
+    assert ets_to_openhab.data_of_name(store, "Licht Dimmen", "", "Dimmen") is None
+    assert ets_to_openhab.data_of_name(store, "Licht Dimmen", "Schalten", "Dimmen") is addresses[2]
+
+    store.consume("1/1/1")
+    assert ets_to_openhab.data_of_name(store, "Licht Dimmen", "Status") is addresses[3]
+    assert ets_to_openhab.data_of_name(addresses, "Licht Dimmen", "Status") is addresses[0]
@@ -34,8 +34,8 @@ def test_auto_place_unknowns_device_match():
     unknown = {
         "Group name": "Unbekannt Licht",
         "Address": "1/1/2",
-        "Floor": k2o.UNKNOWN_FLOOR_NAME,
-        "Room": k2o.UNKNOWN_ROOM_NAME,
+        "Floor": config["general"]["unknown_floorname"],
+        "Room": config["general"]["unknown_roomname"],
         "communication_object": [{"device_address": "1.1.1"}],
     }
 
@@ -57,8 +57,8 @@ def test_auto_place_unknowns_name_heuristic():
     unknown = {
         "Group name": "=OG +RM2 Steckdose",
         "Address": "2/1/1",
-        "Floor": k2o.UNKNOWN_FLOOR_NAME,
-        "Room": k2o.UNKNOWN_ROOM_NAME,
+        "Floor": config["general"]["unknown_floorname"],
+        "Room": config["general"]["unknown_roomname"],
         "communication_object": [],
     }
 
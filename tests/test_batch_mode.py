@@ -0,0 +1,53 @@
+import shutil
+from pathlib import Path
+
+import knxproject_to_openhab as k2o
+
+TESTS_DIR = Path(__file__).parent
+MINI_PROJECT = TESTS_DIR / "fixtures" / "mini_project.json"
+
+
+def test_find_project_files_expands_directories(tmp_path):
+    (tmp_path / "a.knxproj").write_text("")
+    (tmp_path / "b.json.gz").write_text("")
+    (tmp_path / "notes.txt").write_text("")
+    single = tmp_path / "a.knxproj"
+
+    files = k2o.find_project_files([tmp_path, single])
+
+    assert files == [tmp_path / "a.knxproj", tmp_path / "b.json.gz"]
+    assert [k2o.is_project_dump(f) for f in files] == [False, True]
+    assert [k2o.get_project_name(f) for f in files] == ["a", "b"]
+
+
+def test_run_batch_isolates_projects(tmp_path):
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    shutil.copy(MINI_PROJECT, other_dir / MINI_PROJECT.name)
+    broken = tmp_path / "broken.json"
+    broken.write_text("{}")
+    output_dir = tmp_path / "out"
+
+    results = k2o.run_batch(
+        [MINI_PROJECT, other_dir / MINI_PROJECT.name, broken], output_dir, workers=2
+    )
+
+    assert [(Path(r["output"]).name, r["status"]) for r in results] == [
+        ("mini_project", "ok"),
+        ("mini_project_2", "ok"),
+        ("broken", "failed"),
+    ]
+    first = (output_dir / "mini_project" / "items" / "knx.items").read_text(encoding="utf-8")
+    second = (output_dir / "mini_project_2" / "items" / "knx.items").read_text(encoding="utf-8")
+    assert first == second
+
+    summary = k2o.format_batch_summary(results)
+    assert summary.splitlines()[0].split() == [
+        "Project",
+        "Status",
+        "Time",
+        "[s]",
+        "Unknown",
+        "Partial",
+    ]
+    assert "broken.json: " in summary
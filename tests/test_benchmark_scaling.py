@@ -0,0 +1,46 @@
+import json
+from pathlib import Path
+
+from scripts import benchmark
+
+MINI_PROJECT = Path(__file__).parent / "fixtures" / "mini_project.json"
+
+
+def _project():
+    with open(MINI_PROJECT, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_scale_project_replicates_with_unique_ids():
+    project = _project()
+
+    scaled = benchmark.scale_project(project, 3)
+
+    assert len(scaled["group_addresses"]) == 3 * len(project["group_addresses"])
+    assert len(scaled["communication_objects"]) == 3 * len(project["communication_objects"])
+    assert len(scaled["devices"]) == 3 * len(project["devices"])
+    addresses = [ga["address"] for ga in scaled["group_addresses"].values()]
+    assert len(set(addresses)) == len(addresses)
+    for co_id, co in project["communication_objects"].items():
+        copy = scaled["communication_objects"][f"{co_id}#2"]
+        assert copy["group_address_links"] == [
+            benchmark._scaled_address(link, 2) for link in co["group_address_links"]
+        ]
+        assert copy["device_address"] in scaled["devices"]
+    # the original project is left untouched
+    assert project == _project()
+
+
+def test_scaling_exponents_and_baseline_comparison():
+    def run(ga_count, wall):
+        return {"group_addresses": ga_count, "stages": {"gen_building": {"wall_s": wall}}}
+
+    results = {"1": run(100, 0.01), "10": run(1000, 1.0)}
+    assert benchmark.scaling_exponents(results) == {"gen_building": 2.0}
+
+    current = {"results": {"p": results}}
+    baseline = {"results": {"p": {"1": run(100, 0.01), "10": run(1000, 0.5)}}}
+    regressions = benchmark.compare_with_baseline(current, baseline, threshold=1.25)
+    assert [(r["scale"], r["stage"], r["ratio"]) for r in regressions] == [
+        ("10", "gen_building", 2.0)
+    ]
@@ -0,0 +1,131 @@
+"""Tests for the compiled config.json snapshot and its on-disk cache."""
+
+import json
+import os
+import re
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import config as config_module  # noqa: E402
+
+RAW_CONFIG = {
+    "defines": {
+        "switch": {
+            "switch_suffix": ["Schalten", "schalten", "An/Aus"],
+            "status_dpts": ["DPST-1-1"],
+        },
+        "drop_words": ["Licht"],
+    },
+    "regexpattern": {"items_Name": "[^A-Za-z0-9_]+"},
+    "datapoint_mappings": {"DPST-9-1": {"item_type": "Number:Temperature"}},
+}
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(RAW_CONFIG), encoding="utf-8")
+    return path
+
+
+@pytest.fixture(autouse=True)
+def no_memo():
+    with patch.dict(config_module._snapshots, clear=True):
+        yield
+
+
+def test_snapshot_is_compiled(config_file, tmp_path):
+    snapshot = config_module.load_snapshot(config_file, cache_dir=tmp_path / "cache")
+
+    assert snapshot["defines"]["switch"]["switch_suffix"] == frozenset({"schalten", "anaus"})
+    assert snapshot["defines"]["switch"]["status_dpts"] == ("DPST-1-1",)
+    assert isinstance(snapshot.patterns["items_Name"], re.Pattern)
+    assert snapshot.datapoint_mappings["DPST-9-1"]["item_type"] == "Number:Temperature"
+
+
+def test_snapshot_is_read_only(config_file, tmp_path):
+    snapshot = config_module.load_snapshot(config_file, cache_dir=tmp_path / "cache")
+
+    with pytest.raises(TypeError):
+        snapshot["defines"]["switch"]["switch_suffix"] = []
+    with pytest.raises(TypeError):
+        snapshot.datapoint_mappings["DPST-1-1"] = {}
+
+
+def test_to_dict_is_an_independent_copy(config_file, tmp_path):
+    snapshot = config_module.load_snapshot(config_file, cache_dir=tmp_path / "cache")
+
+    first = snapshot.to_dict()
+    first["defines"]["drop_words"].append("Strom")
+    first["datapoint_mappings"].clear()
+
+    second = snapshot.to_dict()
+    assert second["defines"]["drop_words"] == ["Licht"]
+    assert "DPST-9-1" in second["datapoint_mappings"]
+
+
+def test_cached_snapshot_skips_compilation(config_file, tmp_path):
+    cache_dir = tmp_path / "cache"
+    config_module.load_snapshot(config_file, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("*.pickle"))) == 1
+
+    config_module._snapshots.clear()
+    with patch.object(config_module, "compile_config", side_effect=AssertionError):
+        snapshot = config_module.load_snapshot(config_file, cache_dir=cache_dir)
+    assert snapshot["defines"]["switch"]["switch_suffix"] == frozenset({"schalten", "anaus"})
+
+
+def test_changed_content_is_compiled_again(config_file, tmp_path):
+    cache_dir = tmp_path / "cache"
+    first = config_module.load_snapshot(config_file, cache_dir=cache_dir)
+
+    changed = dict(RAW_CONFIG, regexpattern={"items_Name": "[^a-z]+"})
+    config_file.write_text(json.dumps(changed), encoding="utf-8")
+    second = config_module.load_snapshot(config_file, cache_dir=cache_dir)
+
+    assert second.digest != first.digest
+    assert second.patterns["items_Name"].pattern == "[^a-z]+"
+
+
+def test_corrupt_cache_entry_is_ignored(config_file, tmp_path):
+    cache_dir = tmp_path / "cache"
+    config_module.load_snapshot(config_file, cache_dir=cache_dir)
+    entry = next(cache_dir.glob("*.pickle"))
+    entry.write_bytes(b"not a pickle")
+
+    config_module._snapshots.clear()
+    snapshot = config_module.load_snapshot(config_file, cache_dir=cache_dir)
+    assert snapshot.patterns["items_Name"].pattern == "[^A-Za-z0-9_]+"
+
+
+def test_main_resets_shared_config_in_place():
+    shared = config_module.config
+    shared["general"]["addMissingItems"] = "changed by an earlier run"
+    shared["leftover"] = True
+
+    config_module.main()
+
+    assert config_module.config is shared
+    assert "leftover" not in shared
+    assert shared["general"]["addMissingItems"] != "changed by an earlier run"
+    assert shared["special_char_map"][ord("ä")] == "ae"
+
+
+def test_import_does_not_write_the_cache(tmp_path):
+    repo = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    env = {**os.environ, "KNX_CACHE_DIR": str(tmp_path / "cache"), "PYTHONPATH": repo}
+    env.pop("KNX_CONFIG_CACHE_DIR", None)
+
+    # config.json is read from the working directory, ets_helpers needs none
+    subprocess.run([sys.executable, "-c", "import config"], cwd=repo, env=env, check=True)
+    subprocess.run([sys.executable, "-c", "import ets_helpers"], cwd=tmp_path, env=env, check=True)
+    assert not (tmp_path / "cache").exists()
+
+    script = "import config; config.save_snapshot()"
+    subprocess.run([sys.executable, "-c", script], cwd=repo, env=env, check=True)
+    assert len(list((tmp_path / "cache" / "config").glob("*.pickle"))) == 1
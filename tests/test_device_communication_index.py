@@ -0,0 +1,59 @@
+import knxproject_to_openhab as k2o
+
+FLAGS = {"read": False, "write": True}
+
+
+def _co(co_id, channel=None, text=None, device="1.1.1"):
+    return {
+        "number": co_id,
+        "device_address": device,
+        "channel": channel,
+        "text": text,
+        "flags": FLAGS,
+    }
+
+
+def _project():
+    communication_objects = {
+        1: _co(1, channel="A", text="Schalten"),
+        2: _co(2, channel="A", text="Status"),
+        3: _co(3, channel="B", text="Schalten"),
+        4: _co(4, text="Zentral"),
+        5: _co(5, text="Zentral"),
+        6: _co(6, channel="B", text="Status"),
+    }
+    devices = {"1.1.1": {"communication_object_ids": [1, 2, 3, 4, 5, 6, 99]}}
+    return communication_objects, devices
+
+
+def test_siblings_match_by_channel_or_text_in_device_order():
+    communication_objects, devices = _project()
+    index = k2o.DeviceCommunicationIndex(communication_objects, devices)
+
+    numbers = [co["number"] for co in index.siblings(communication_objects[1])]
+    assert numbers == [1, 2, 3]
+    numbers = [co["number"] for co in index.siblings(communication_objects[4])]
+    assert numbers == [4, 5]
+
+
+def test_siblings_are_memoized_but_returned_as_new_lists():
+    communication_objects, devices = _project()
+    index = k2o.DeviceCommunicationIndex(communication_objects, devices)
+
+    first = index.siblings(communication_objects[4])
+    devices["1.1.1"]["communication_object_ids"] = []
+    second = index.siblings(communication_objects[5])
+
+    assert first == second
+    assert first is not second
+
+
+def test_extract_communication_objects_enriches_linked_objects():
+    communication_objects, devices = _project()
+    address = {"communication_object_ids": [2, 6]}
+
+    comm_objects = k2o.extract_communication_objects(address, communication_objects, devices)
+
+    assert comm_objects == [communication_objects[2], communication_objects[6]]
+    assert [co["number"] for co in comm_objects[0]["device_communication_objects"]] == [1, 2, 6]
+    assert [co["number"] for co in comm_objects[1]["device_communication_objects"]] == [2, 3, 6]
@@ -0,0 +1,141 @@
+import copy
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import ets_to_openhab
+import fragment_cache
+import knxproject_to_openhab
+
+PROJECT_PATH = Path(__file__).parent / "Charne.knxproj.json"
+REPO_ROOT = Path(__file__).parent.parent
+
+# config digest and fingerprint of the first room, as a new CLI process computes them
+FINGERPRINT_SCRIPT = """
+import json, sys
+import config, ets_to_openhab, knxproject_to_openhab
+project = json.load(open(sys.argv[1], encoding="utf-8"))
+building = knxproject_to_openhab.create_building(project)
+addresses = knxproject_to_openhab.get_addresses(project)
+house = knxproject_to_openhab.put_addresses_in_building(building, addresses, project)
+floor = house[0]["floors"][0]
+context = ets_to_openhab.GenerationContext(floors=house[0]["floors"], addresses=addresses)
+print(context.room_fingerprint(floor, 1, floor["rooms"][0], 1))
+print(context._config_digest)
+"""
+
+
+def _generate(project, cache, mutate=None, floor_workers=None):
+    project = copy.deepcopy(project)
+    building = knxproject_to_openhab.create_building(project)
+    addresses = knxproject_to_openhab.get_addresses(project)
+    house = knxproject_to_openhab.put_addresses_in_building(building, addresses, project)
+    if mutate:
+        mutate(house[0]["floors"])
+    context = ets_to_openhab.GenerationContext(
+        floors=house[0]["floors"],
+        addresses=addresses,
+        homekit=True,
+        alexa=True,
+        fragment_cache=cache,
+        floor_workers=floor_workers,
+    )
+    output = ets_to_openhab.gen_building(context)
+    return (
+        output,
+        context.windows,
+        context.partial_dimmers,
+        context.export_to_influx,
+        [address["Address"] for address in context.all_addresses],
+    )
+
+
+def _rename_first_room(floors):
+    room = next(room for floor in floors for room in floor["rooms"] if room["Addresses"])
+    room["Description"] = "Renamed"
+    room["Addresses"][0]["Group name"] += " Status"
+
+
+def test_unchanged_rooms_are_spliced_from_the_cache(tmp_path):
+    with open(PROJECT_PATH, encoding="utf-8") as f:
+        project = json.load(f)
+    reference = _generate(project, None)
+
+    cold = fragment_cache.FragmentCache(tmp_path)
+    assert _generate(project, cold) == reference
+    rooms = cold.misses
+    assert rooms > 1 and cold.hits == 0
+
+    warm = fragment_cache.FragmentCache(tmp_path)
+    assert _generate(project, warm) == reference
+    assert warm.stats() == {"hits": rooms, "misses": 0}
+
+    changed = fragment_cache.FragmentCache(tmp_path)
+    assert _generate(project, changed, _rename_first_room) == _generate(
+        project, None, _rename_first_room
+    )
+    assert changed.misses >= 1
+    assert changed.hits >= rooms - 2
+
+
+def test_parallel_floors_report_the_workers_hits_and_misses(tmp_path):
+    with open(PROJECT_PATH, encoding="utf-8") as f:
+        project = json.load(f)
+    serial = fragment_cache.FragmentCache(tmp_path / "serial")
+    reference = _generate(project, serial)
+
+    cold = fragment_cache.FragmentCache(tmp_path / "parallel")
+    assert _generate(project, cold, floor_workers=2) == reference
+    # a floor generated again in the parent may hit the entries its worker stored
+    assert cold.hits + cold.misses == serial.misses
+
+    warm = fragment_cache.FragmentCache(tmp_path / "parallel")
+    assert _generate(project, warm, floor_workers=2) == reference
+    assert warm.hits + warm.misses == serial.misses
+    assert warm.hits > cold.hits
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    cache = fragment_cache.FragmentCache(tmp_path)
+    cache.store("key", {"room": 1})
+    assert cache.load("key") == {"room": 1}
+
+    (tmp_path / f"key{fragment_cache.CACHE_SUFFIX}").write_bytes(b"not a pickle")
+    assert cache.load("key") is None
+    assert fragment_cache.clear(tmp_path) == 0
+    assert cache.load("missing") is None
+
+
+def test_digest_handles_shared_and_cyclic_objects():
+    objects = [{"function_text": "Schalten"}, {"function_text": "Status"}]
+    for obj in objects:
+        obj["device_communication_objects"] = objects
+    address = {"Address": "1/1/1", "communication_object": objects}
+
+    assert fragment_cache.digest(address) == fragment_cache.digest(copy.deepcopy(address))
+    changed = copy.deepcopy(address)
+    changed["communication_object"][1]["function_text"] = "Rückmeldung"
+    assert fragment_cache.digest(changed) != fragment_cache.digest(address)
+
+
+def _fingerprint_in_new_process(hash_seed):
+    env = {**os.environ, "PYTHONHASHSEED": hash_seed, "PYTHONPATH": str(REPO_ROOT)}
+    result = subprocess.run(
+        [sys.executable, "-c", FINGERPRINT_SCRIPT, str(PROJECT_PATH)],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.split()
+
+
+def test_fingerprints_do_not_depend_on_the_hash_seed():
+    # the suffix lists of the config are frozensets, which iterate in hash order
+    assert _fingerprint_in_new_process("1") == _fingerprint_in_new_process("2")
+    assert fragment_cache.config_digest(
+        {"defines": {"switch": {"suffix": frozenset({"b", "a", "c"})}}}
+    ) == fragment_cache.config_digest({"defines": {"switch": {"suffix": ["a", "b", "c"]}}})
@@ -0,0 +1,79 @@
+"""Phase order of the datapoint-type dispatch in gen_building()."""
+
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import ets_to_openhab  # noqa: E402
+from config import config  # noqa: E402
+
+
+def _address(address, name, dpt, description="", cos=()):
+    return {
+        "Address": address,
+        "Group name": name,
+        "DatapointType": dpt,
+        "Description": description,
+        "communication_object": list(cos),
+    }
+
+
+@pytest.fixture
+def room_addresses(monkeypatch):
+    addresses = [
+        _address("1/0/1", "EG RM1 Fenster", "DPST-1-19"),
+        _address(
+            "1/0/2",
+            "EG RM1 Heizen Betriebsmodus",
+            "DPST-20-102",
+            cos=[{"function_text": "Betriebsmodus", "flags": {"write": True}}],
+        ),
+        _address("1/0/3", "EG RM1 Stellwert", "DPST-5-010"),
+        _address("1/0/4", "EG RM1 Tuer", "DPST-1-19", description="ignore"),
+        _address("1/0/5", "EG RM1 Unbekannt", "DPST-7-1"),
+    ]
+    room = {"Group name": "RM1", "name_short": "RM1", "Description": "", "Addresses": addresses}
+    floor = {"Group name": "EG", "name_short": "EG", "Description": "", "rooms": [room]}
+    monkeypatch.setattr(ets_to_openhab, "floors", [floor])
+    monkeypatch.setattr(ets_to_openhab, "all_addresses", list(addresses))
+    monkeypatch.setattr(ets_to_openhab, "used_addresses", [])
+    monkeypatch.setattr(ets_to_openhab, "equipments", {})
+    monkeypatch.setattr(ets_to_openhab, "FENSTERKONTAKTE", [])
+    monkeypatch.setattr(ets_to_openhab, "B_HOMEKIT", False)
+    monkeypatch.setattr(ets_to_openhab, "B_ALEXA", False)
+    return addresses
+
+
+def test_composite_devices_are_emitted_before_datapoint_items(room_addresses):
+    _, _, things = ets_to_openhab.gen_building()
+    emitted = [line.split('"')[1] for line in things.splitlines()]
+    # heating (phase 0) first, then the datapoint-only items in room order
+    assert emitted == ["EG RM1 Heizen Betriebsmodus", "EG RM1 Fenster", "EG RM1 Stellwert"]
+
+
+def test_unrouted_and_ignored_addresses_stay_unused(room_addresses):
+    ets_to_openhab.gen_building()
+    assert [a["Address"] for a in ets_to_openhab.all_addresses] == ["1/0/4", "1/0/5"]
+    assert [w["name"] for w in ets_to_openhab.FENSTERKONTAKTE] == ["EG RM1 Fenster"]
+
+
+def test_event_window_rules_use_the_contacts_group(room_addresses):
+    cfg = {**config, "general": {**config["general"], "window_rules": "event"}}
+    context = ets_to_openhab.GenerationContext(
+        floors=ets_to_openhab.floors, addresses=room_addresses, configuration=cfg
+    )
+    items, _, _ = ets_to_openhab.gen_building(context)
+    group = ets_to_openhab.WINDOW_CONTACT_GROUP
+    members = [line.split()[1] for line in items.splitlines() if f",{group})" in line]
+    assert items.startswith(f"Group:Contact:OR(OPEN, CLOSED)   {group} ")
+    assert members == [window["item_name"] for window in context.windows]
+
+    rules = io.StringIO()
+    ets_to_openhab.write_event_window_rules(rules, context.windows)
+    assert f"Member of {group} changed" in rules.getvalue()
+    assert f'"{members[0]}" -> "EG RM1 Fenster"' in rules.getvalue()
+    assert "cron" not in rules.getvalue()
@@ -0,0 +1,52 @@
+import knxproject_to_openhab as k2o
+
+GROUP_RANGES = {
+    "1": {
+        "name": "Beleuchtung",
+        "group_ranges": {
+            "1/0": {"name": "Zentral", "group_ranges": {}},
+            "1/1": {"name": "=EG Erdgeschoss", "group_ranges": {}},
+        },
+    },
+    "2": {
+        "name": "Melden/Sensor OG",
+        "group_ranges": {"2/3": {"name": "Fenster", "group_ranges": {}}},
+    },
+}
+
+
+def _ga(address, name="Licht"):
+    return {"address": address, "name": name}
+
+
+def test_table_is_keyed_by_main_and_middle_group():
+    table = k2o.build_group_range_table(GROUP_RANGES)
+
+    assert set(table) == {("1", "0"), ("1", "1"), ("2", "3")}
+    assert table[("1", "0")]["is_central_function"] is True
+    assert table[("1", "1")]["is_central_function"] is False
+    assert table[("2", "3")]["is_notification_sensor"] is True
+    assert table[("1", "1")]["floor"].group(0) == "=EG"
+
+
+def test_checks_give_same_result_with_and_without_table():
+    table = k2o.build_group_range_table(GROUP_RANGES)
+    for ga in (_ga("1/0/1"), _ga("1/1/2"), _ga("2/3/4"), _ga("1/1/3", "Zentral Aus")):
+        assert k2o.check_is_centralFunction(
+            ga, GROUP_RANGES, table
+        ) == k2o.check_is_centralFunction(ga, GROUP_RANGES)
+        assert k2o.check_is_notification_sensor(
+            ga, GROUP_RANGES, table
+        ) == k2o.check_is_notification_sensor(ga, GROUP_RANGES)
+        with_table = k2o.find_floor_in_address(ga, GROUP_RANGES, table)
+        without_table = k2o.find_floor_in_address(ga, GROUP_RANGES)
+        assert (with_table and with_table.group(0)) == (without_table and without_table.group(0))
+
+
+def test_address_name_takes_precedence_over_group_range():
+    table = k2o.build_group_range_table(GROUP_RANGES)
+
+    assert k2o.check_is_centralFunction(_ga("1/1/3", "Zentral Aus"), GROUP_RANGES, table)
+    assert k2o.find_floor_in_address(_ga("1/1/3", "=OG Licht"), GROUP_RANGES, table).group(0) == (
+        "=OG"
+    )
@@ -0,0 +1,56 @@
+"""Startup import budget of the CLI and the web backend."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import import_profile  # noqa: E402
+
+# Wall-clock import times depend on the machine and its load, so the budget is
+# only checked when $KNX_IMPORT_BUDGET_MS is set (400 suits a quiet developer
+# machine). The module checks below catch heavy imports everywhere.
+IMPORT_BUDGET_MS = os.environ.get("KNX_IMPORT_BUDGET_MS")
+
+HEAVY_MODULES = {"xknxproject", "tkinter", "requests", "concurrent.futures.process"}
+
+
+def test_cli_startup_skips_heavy_modules():
+    records = import_profile.profile_imports(["knxproject_to_openhab"])
+    assert HEAVY_MODULES.isdisjoint(import_profile.imported_modules(records))
+
+
+def test_backend_startup_skips_generator_stack():
+    pytest.importorskip("flask")
+    records = import_profile.profile_imports(["web_ui.backend.app"])
+    modules = import_profile.imported_modules(records)
+    assert HEAVY_MODULES.isdisjoint(modules)
+    assert "knxproject_to_openhab" not in modules
+    assert "ets_to_openhab" not in modules
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(not IMPORT_BUDGET_MS, reason="set $KNX_IMPORT_BUDGET_MS to check the budget")
+def test_cli_startup_within_budget():
+    budget_ms = float(IMPORT_BUDGET_MS)
+    best_us = min(
+        import_profile.total_import_us(
+            import_profile.profile_imports(["knxproject_to_openhab"]), ["knxproject_to_openhab"]
+        )
+        for _ in range(3)
+    )
+    assert best_us > 0
+    assert best_us / 1000 < budget_ms, (
+        f"Importing knxproject_to_openhab took {best_us / 1000:.1f} ms "
+        f"(budget {budget_ms:.0f} ms)"
+    )
+
+
+def test_profile_parses_importtime_output():
+    records = import_profile.profile_imports(["json"])
+    json_record = next(r for r in records if r["module"] == "json" and r["depth"] == 0)
+    assert json_record["cumulative_us"] >= json_record["self_us"] >= 0
+    assert import_profile.total_import_us(records, ["json"]) == json_record["cumulative_us"]
+    assert "json:" in import_profile.format_import_profile(records, ["json"])
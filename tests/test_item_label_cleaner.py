@@ -0,0 +1,73 @@
+"""ItemLabelCleaner must produce exactly the labels of the former inline cleanup."""
+
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from config import config, snapshot
+from ets_helpers import ItemLabelCleaner
+
+TESTS_DIR = Path(__file__).parent
+
+
+def _reference_clean(label, floor_short, room_group_name, room_name, drop_words, label_pattern):
+    item_label_short = label
+    for drop in drop_words:
+        item_label_short = item_label_short.replace(drop, "")
+    if floor_short:
+        item_label_short = item_label_short.replace(floor_short, "")
+    item_label_short = label_pattern.sub("", item_label_short)
+    item_label_short = item_label_short.replace("|", " ")
+    item_label_short = item_label_short.replace("  ", " ")
+    if item_label_short != "":
+        label = item_label_short
+    label = label.replace(room_group_name, room_name)
+    label = re.sub(r"\[.*\]", "", label)
+    label = re.sub(r"\|.*\:", "", label)
+    label = re.sub(r"^\W+|\W+$", "", label)
+    return label.strip()
+
+
+def _project_labels():
+    labels = [
+        "EG Licht Decke",
+        "Licht",
+        "[Info]@ +RM1 Steckdosen Küche",
+        "AUFensterkontakt",  # AUF overlaps Fensterkontakt: config order decides
+        "StroLichtm",  # removing Licht forms Strom
+        "Status | Wert: 5",
+        "Rollo AUF/ZU :(alt) Wohnen",
+        "--- Heizung ---",
+    ]
+    for name in ("Charne.knxproj.json", "upload.knxprojarchive.json"):
+        with open(TESTS_DIR / name, encoding="utf-8") as f:
+            project = json.load(f)
+        labels += [ga["name"] for ga in project["group_addresses"].values()]
+    return labels
+
+
+@pytest.mark.parametrize(
+    "floor_short,room_group_name,room_name", [("EG", "+RM1", "Küche"), ("", "", "")]
+)
+def test_labels_match_former_inline_cleanup(floor_short, room_group_name, room_name):
+    drop_words = config["defines"]["drop_words"]
+    label_pattern = snapshot.patterns["items_Label"]
+    cleaner = ItemLabelCleaner(drop_words, label_pattern)
+
+    for label in _project_labels():
+        expected = _reference_clean(
+            label, floor_short, room_group_name, room_name, drop_words, label_pattern
+        )
+        assert cleaner.clean(label, floor_short, room_group_name, room_name) == expected, label
+
+
+def test_results_are_memoized():
+    cleaner = ItemLabelCleaner(["Licht"], re.compile("x^"))
+
+    assert cleaner.clean("Licht Decke", "EG", "+RM1", "Küche") == "Decke"
+    assert cleaner.clean("Licht Decke", "EG", "+RM1", "Küche") == "Decke"
+    assert cleaner.clean("Licht Decke", "OG", "+RM1", "Küche") == "Decke"
+
+    assert (cleaner.hits, cleaner.misses) == (1, 2)
@@ -0,0 +1,80 @@
+import os
+
+from web_ui.backend.jobs import JobManager
+
+
+def _job_manager(tmp_path, openhab_path):
+    return JobManager(
+        {
+            "jobs_dir": str(tmp_path / "jobs"),
+            "backups_dir": str(tmp_path / "backups"),
+            "cache_dir": str(tmp_path / "cache"),
+            "openhab_path": str(openhab_path),
+        }
+    )
+
+
+def test_deploy_keeps_unchanged_files(tmp_path):
+    live = tmp_path / "openhab"
+    staging = tmp_path / "staging"
+    (live / "items").mkdir(parents=True)
+    staging.mkdir()
+    (live / "items" / "knx.items").write_text("Switch a", encoding="utf-8")
+    (staging / "knx.items").write_text("Switch a", encoding="utf-8")
+    (staging / "knx.things").write_text("Type switch", encoding="utf-8")
+    mapping = {
+        str(staging / "knx.items"): str(live / "items" / "knx.items"),
+        str(staging / "knx.things"): str(live / "things" / "knx.things"),
+    }
+    mgr = _job_manager(tmp_path, live)
+    mgr._jobs["job"] = {"id": "job", "staged": True, "stage_mapping": mapping, "backups": []}
+
+    manifest = mgr._compute_manifest(mapping, str(live))
+    assert manifest["changed"] == ["things/knx.things"]
+    assert manifest["unchanged"] == ["items/knx.items"]
+    assert manifest["files"]["things/knx.things"]["live_sha256"] is None
+
+    os.utime(live / "items" / "knx.items", ns=(0, 0))
+    success, message = mgr.deploy("job")
+
+    assert success
+    assert "1 unchanged" in message
+    assert mgr._jobs["job"]["deploy_result"] == {
+        "changed": ["things/knx.things"],
+        "unchanged": ["items/knx.items"],
+        "removed": [],
+    }
+    assert (live / "items" / "knx.items").stat().st_mtime_ns == 0
+    assert (live / "things" / "knx.things").read_text(encoding="utf-8") == "Type switch"
+
+
+def test_deploy_removes_parts_of_deleted_floors(tmp_path):
+    live = tmp_path / "openhab"
+    staging = tmp_path / "staging"
+    (live / "items").mkdir(parents=True)
+    staging.mkdir()
+    (live / "items" / "knx_map2.items").write_text("Group map2", encoding="utf-8")
+    (staging / "knx_map1.items").write_text("Group map1", encoding="utf-8")
+    mapping = {str(staging / "knx_map1.items"): str(live / "items" / "knx_map1.items")}
+    mgr = _job_manager(tmp_path, live)
+    mgr._jobs["job"] = {
+        "id": "job",
+        "staged": True,
+        "stage_mapping": mapping,
+        "stage_removals": [str(live / "items" / "knx_map2.items")],
+        "backups": [],
+    }
+
+    success, message = mgr.deploy("job")
+
+    assert success
+    assert "1 stale files removed" in message
+    assert mgr._jobs["job"]["deploy_result"]["removed"] == ["items/knx_map2.items"]
+    assert sorted(p.name for p in (live / "items").iterdir()) == ["knx_map1.items"]
+
+
+def test_fragment_cache_defaults_to_the_job_storage_area(tmp_path, monkeypatch):
+    monkeypatch.delenv("KNX_FRAGMENT_CACHE_DIR", raising=False)
+    mgr = _job_manager(tmp_path, tmp_path / "openhab")
+
+    assert mgr.fragment_cache_dir == os.path.join(str(tmp_path / "jobs"), "fragments")
@@ -0,0 +1,106 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import config as config_module
+import ets_to_openhab
+from web_ui.backend.jobs import JobLogHandler, JobManager
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "mini_project.json")
+
+
+def test_job_log_handler_only_takes_records_of_its_thread():
+    messages = []
+    handler = JobLogHandler(messages.append)
+    log = logging.getLogger("test_job_isolation")
+    log.addHandler(handler)
+    try:
+        log.warning("mine")
+        other = threading.Thread(target=log.warning, args=("other",))
+        other.start()
+        other.join()
+        log.error("broken %s", "thing")
+    finally:
+        log.removeHandler(handler)
+    assert messages == [
+        {"type": "info", "level": "warning", "message": "mine"},
+        {"type": "info", "level": "error", "message": "broken thing"},
+    ]
+
+
+def test_generate_requires_a_context():
+    with pytest.raises(TypeError):
+        ets_to_openhab.generate(None)
+
+
+def _job_manager(tmp_path):
+    return JobManager(
+        {
+            "jobs_dir": str(tmp_path / "jobs"),
+            "backups_dir": str(tmp_path / "backups"),
+            "cache_dir": str(tmp_path / "cache"),
+            "openhab_path": str(tmp_path / "openhab"),
+        }
+    )
+
+
+def _wait(mgr, jobs, check=lambda: None):
+    deadline = time.time() + 120
+    while any(mgr.get_job(job["id"])["status"] in ("queued", "running") for job in jobs):
+        check()
+        assert time.time() < deadline
+        time.sleep(0.05)
+    return [mgr.get_job(job["id"]) for job in jobs]
+
+
+def _shared_path_unchanged(openhab_path):
+    assert config_module.config["openhab_path"] == openhab_path
+
+
+def test_concurrent_jobs_leave_the_shared_config_alone(tmp_path):
+    openhab_path = config_module.config["openhab_path"]
+    mgr = _job_manager(tmp_path)
+    src = tmp_path / "project.json"
+    shutil.copy(FIXTURE, src)
+    jobs = [mgr.create_job(str(src), "project.json") for _ in range(2)]
+    _wait(mgr, jobs, lambda: _shared_path_unchanged(openhab_path))
+
+    assert config_module.config["openhab_path"] == openhab_path
+    for job in jobs:
+        done = mgr.get_job(job["id"])
+        assert done["status"] == "completed", done.get("error")
+        staging = os.path.join(done["staging_dir"], "openhab")
+        assert all(
+            staged.startswith(done["staging_dir"]) for staged in done["stage_mapping"]
+        ), done["stage_mapping"]
+        assert os.path.isdir(staging)
+
+
+def test_each_job_reads_the_current_config_json(tmp_path, monkeypatch):
+    config_file = tmp_path / "config.json"
+    raw = json.loads(Path(config_module.CONFIG_FILE).read_text(encoding="utf-8"))
+    raw["general"]["output_split"] = "building"
+    config_file.write_text(json.dumps(raw), encoding="utf-8")
+    load_snapshot = config_module.load_snapshot
+    monkeypatch.setattr(config_module, "load_snapshot", lambda: load_snapshot(config_file))
+    mgr = _job_manager(tmp_path)
+    src = tmp_path / "project.json"
+    shutil.copy(FIXTURE, src)
+
+    (before,) = _wait(mgr, [mgr.create_job(str(src), "project.json")])
+    raw["general"]["output_split"] = "floor"  # saved while the web UI keeps running
+    config_file.write_text(json.dumps(raw), encoding="utf-8")
+    (after,) = _wait(mgr, [mgr.create_job(str(src), "project.json")])
+
+    def staged_names(job):
+        assert job["status"] == "completed", job.get("error")
+        return {Path(staged).name for staged in job["stage_mapping"]}
+
+    assert "knx_map1.items" not in staged_names(before)
+    assert "knx_map1.items" in staged_names(after)
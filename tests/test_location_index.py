@@ -0,0 +1,65 @@
+import knxproject_to_openhab as k2o
+
+
+def _room(name_short, devices=()):
+    return {"name_short": name_short, "Addresses": [], "devices": list(devices)}
+
+
+def _building():
+    return [
+        {
+            "floors": [
+                {"name_short": "=EG", "rooms": [_room("+RM1", ["1.1.1"]), _room("+RM2")]},
+                {"name_short": "=OG", "rooms": [_room("+RM1", ["1.1.1", "1.1.2"])]},
+            ]
+        },
+        {"floors": [{"name_short": "=EG", "rooms": [_room("+RM3", ["1.1.3"])]}]},
+    ]
+
+
+def _address(ga, floor, room):
+    return {"Address": ga, "Floor": floor, "Room": room, "communication_object": []}
+
+
+def test_index_keeps_first_match_in_traversal_order():
+    building = _building()
+    index = k2o.LocationIndex(building, ["1.1.9", "1.1.9"])
+
+    eg, og = building[0]["floors"]
+    second_eg = building[1]["floors"][0]
+    assert index.find_room("=EG", "+RM1") == (eg, eg["rooms"][0])
+    assert index.find_room("=EG", "+RM3") == (second_eg, second_eg["rooms"][0])
+    assert index.find_device_room("1.1.1") == (eg, eg["rooms"][0])
+    assert index.find_device_room("1.1.2") == (og, og["rooms"][0])
+    assert index.find_room("=UG", "+RM1") is None
+    assert index.cabinet_devices == {"1.1.9"}
+
+
+def test_create_floor_room_if_missing_updates_index():
+    building = _building()
+    index = k2o.LocationIndex(building)
+    address = _address("1/1/1", "Zentral", "Zentral")
+
+    assert k2o.create_floor_room_if_missing(building, address, index)
+
+    floor, room = index.find_room("Zentral", "Zentral")
+    assert building[0]["floors"][-1] is floor
+    assert room["Addresses"] == [address]
+
+    # a second address for the same room reuses the created nodes
+    other = _address("1/1/2", "Zentral", "Zentral")
+    assert k2o.place_address_in_building(building, other, index)
+    assert room["Addresses"] == [address, other]
+    assert len(building[0]["floors"]) == 3
+
+
+def test_created_room_in_main_building_wins_over_later_buildings():
+    building = _building()
+    index = k2o.LocationIndex(building)
+    address = _address("1/1/1", "=EG", "+RM3")
+
+    assert k2o.create_floor_room_if_missing(building, address, index)
+
+    floor, room = index.find_room("=EG", "+RM3")
+    assert floor is building[0]["floors"][0]
+    assert room["Addresses"] == [address]
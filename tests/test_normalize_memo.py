@@ -0,0 +1,39 @@
+import json
+from pathlib import Path
+
+import knxproject_to_openhab as k2o
+from config import normalize_cache_stats, normalize_string
+from ets_helpers import get_normalized_function_text
+
+MINI_PROJECT = Path(__file__).parent / "fixtures" / "mini_project.json"
+
+
+def test_normalize_string_is_memoized():
+    normalize_string.cache_clear()
+
+    assert normalize_string("Dimmen, Status") == "dimmenstatus"
+    assert normalize_string("Dimmen, Status") == "dimmenstatus"
+
+    stats = normalize_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+
+def test_function_texts_are_normalized_on_extraction():
+    with open(MINI_PROJECT, encoding="utf-8") as f:
+        project = json.load(f)
+
+    addresses = k2o.get_addresses(project)
+
+    cos = [co for address in addresses for co in address["communication_object"]]
+    dcos = [dco for co in cos for dco in co.get("device_communication_objects", [])]
+    assert cos and dcos
+    for co in cos + dcos:
+        assert co["function_text_normalized"] == normalize_string(co.get("function_text") or "")
+
+
+def test_normalized_function_text_falls_back_to_raw_text():
+    assert get_normalized_function_text({"function_text": "Schalten / Status"}) == "schaltenstatus"
+    assert (
+        get_normalized_function_text({"function_text_normalized": "x", "function_text": "y"}) == "x"
+    )
+    assert get_normalized_function_text({}) == ""
@@ -0,0 +1,101 @@
+"""Tests for the cached, lazily evaluated openHAB location detection."""
+
+import json
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import config as config_module  # noqa: E402
+
+DETECTED = ("/etc/openhab", "openhab", "openhab")
+
+
+@pytest.fixture(autouse=True)
+def fresh_memo():
+    with patch.object(config_module, "_openhab_conf", None):
+        yield
+        if config_module._openhab_conf_refresh is not None:
+            config_module._openhab_conf_refresh.join(timeout=5)
+
+
+def test_detection_result_is_cached_on_disk(tmp_path):
+    with patch.object(config_module, "detect_openhab_conf", return_value=DETECTED) as detect:
+        assert config_module.get_openhab_conf(ttl=60, cache_dir=tmp_path) == DETECTED
+        assert config_module.get_openhab_conf(ttl=60, cache_dir=tmp_path) == DETECTED
+    assert detect.call_count == 1
+
+    entry = json.loads((tmp_path / config_module.OPENHAB_CONF_CACHE_NAME).read_text())
+    assert entry["openhab_conf"] == list(DETECTED)
+
+    config_module._openhab_conf = None  # a new process only has the file
+    with patch.object(config_module, "detect_openhab_conf", side_effect=AssertionError):
+        assert config_module.get_openhab_conf(ttl=60, cache_dir=tmp_path) == DETECTED
+
+
+def test_expired_result_is_refreshed_in_background(tmp_path):
+    cache_file = tmp_path / config_module.OPENHAB_CONF_CACHE_NAME
+    cache_file.write_text(
+        json.dumps({"detected_at": time.time() - 120, "openhab_conf": ["openhab", None, None]})
+    )
+
+    with patch.object(config_module, "detect_openhab_conf", return_value=DETECTED):
+        assert config_module.get_openhab_conf(ttl=60, cache_dir=tmp_path) == (
+            "openhab",
+            None,
+            None,
+        )
+        config_module._openhab_conf_refresh.join(timeout=5)
+        assert config_module.get_openhab_conf(ttl=60, cache_dir=tmp_path) == DETECTED
+    assert json.loads(cache_file.read_text())["openhab_conf"] == list(DETECTED)
+
+
+def test_ttl_zero_always_detects(tmp_path):
+    with patch.object(config_module, "detect_openhab_conf", return_value=DETECTED) as detect:
+        config_module.get_openhab_conf(ttl=0, cache_dir=tmp_path)
+        config_module.get_openhab_conf(ttl=0, cache_dir=tmp_path)
+    assert detect.call_count == 2
+    assert not (tmp_path / config_module.OPENHAB_CONF_CACHE_NAME).exists()
+
+
+def test_paths_are_resolved_on_first_read():
+    cfg = config_module.Config(general={})
+    cfg.defer_openhab_conf({"items_path": "openhab/items/knx.items"})
+    cfg["things_path"] = "/tmp/knx.things"  # assigned before detection: kept
+
+    with patch.object(config_module, "get_openhab_conf", return_value=DETECTED) as get_conf:
+        assert "general" in cfg
+        assert not get_conf.called
+        assert cfg["items_path"] == os.path.join("/etc/openhab", "items", "knx.items")
+    assert get_conf.call_count == 1
+    assert cfg["things_path"] == "/tmp/knx.things"
+    assert cfg.get("target_user") == "openhab"
+    assert cfg.copy()["openhab_path"] == "/etc/openhab"
+
+
+@pytest.mark.parametrize(
+    "read",
+    [dict, list, lambda cfg: json.loads(json.dumps(cfg)), lambda cfg: dict(cfg.items())],
+    ids=["dict", "iter", "json", "items"],
+)
+def test_whole_dict_reads_include_the_openhab_keys(read):
+    cfg = config_module.Config(general={})
+    cfg.defer_openhab_conf({"items_path": "openhab/items/knx.items"})
+
+    with patch.object(config_module, "get_openhab_conf", return_value=DETECTED):
+        assert "items_path" in read(cfg)
+    assert len(cfg) == 5
+
+
+def test_default_cache_is_below_the_cache_root(tmp_path, monkeypatch):
+    monkeypatch.setenv("KNX_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("KNX_CONFIG_CACHE_DIR", raising=False)
+    with patch.object(config_module, "detect_openhab_conf", return_value=DETECTED):
+        assert config_module.get_openhab_conf(ttl=60) == DETECTED
+    cache_file = tmp_path / "config" / config_module.OPENHAB_CONF_CACHE_NAME
+    assert config_module.openhab_conf_cache_path() == cache_file
+    assert json.loads(cache_file.read_text())["openhab_conf"] == list(DETECTED)
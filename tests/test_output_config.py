@@ -202,13 +202,17 @@ class TestOutputConfig:
         mock_proc.stdout = "User: test\nOPENHAB_CONF | /test"
         mock_run.return_value = mock_proc
 
-        # Execute
+        # Execute: importing must not spawn openhab-cli, reading a path must
         import config
 
+        assert not mock_run.called, "openhab-cli should not run on import"
+        config.config["items_path"]
+
         # Verify: Check that subprocess.run was called
         # (We can't check exact args without more complex mocking,
         # but we can verify it was called)
         assert mock_run.called, "openhab-cli should be called"
+        assert mock_run.call_args[0][0] == ["openhab-cli", "info"]
         logger.info(f"✓ openhab-cli was invoked")
 
     @patch("subprocess.run")
@@ -0,0 +1,238 @@
+import json
+import os
+import re
+from pathlib import Path
+
+import pytest
+
+import ets_to_openhab
+import knxproject_to_openhab
+from config import config
+from output_writers import (
+    OUTPUT_MANIFEST_NAME,
+    PartWriter,
+    SplitTemplate,
+    StreamWriter,
+    part_paths,
+    read_template,
+    split_template,
+    write_manifest,
+)
+
+
+def test_template_is_split_at_the_body_marker():
+    template = SplitTemplate('Group Base "###NAME###"\n\n###items###\n# end ###NAME###\n')
+
+    assert template.markers == ["NAME", "items", "NAME"]
+    head, tail = template.split("items", {"NAME": "Home"})
+    assert head == 'Group Base "Home"\n\n'
+    assert tail == "\n# end Home\n"
+    assert template.render({"items": "x"}) == 'Group Base "###NAME###"\n\nx\n# end ###NAME###\n'
+    with pytest.raises(ValueError):
+        template.split("things")
+    assert split_template("a ###b### c") is split_template("a ###b### c")
+
+
+def test_template_file_is_read_again_after_a_change(tmp_path):
+    path = tmp_path / "items.template"
+    path.write_text("one ###items###", encoding="utf8")
+    assert read_template(path) == "one ###items###"
+
+    path.write_text("two ###items###", encoding="utf8")
+    # make sure the modification time differs on coarse file systems
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert read_template(path) == "two ###items###"
+
+
+def test_writer_streams_between_head_and_tail(tmp_path):
+    path = tmp_path / "out" / "knx.items"
+
+    with StreamWriter(path, head="head\n", tail="tail") as writer:
+        writer.write("a\nb\n")
+        writer.write("")
+        assert not path.exists()
+
+    assert path.read_text(encoding="utf8") == "head\na\nb\ntail"
+    assert writer.lines == path.read_text(encoding="utf8").count("\n") + 1
+    assert list(path.parent.iterdir()) == [path]
+
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    path = tmp_path / "knx.things"
+    path.write_text("previous", encoding="utf8")
+
+    with pytest.raises(RuntimeError):
+        with StreamWriter(path, head="new") as writer:
+            writer.write("partial")
+            raise RuntimeError("generation failed")
+
+    assert path.read_text(encoding="utf8") == "previous"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def _output_config(out, output_split="building"):
+    cfg = dict(config)
+    for key, name in [
+        ("items_path", "knx.items"),
+        ("sitemaps_path", "knx.sitemap"),
+        ("things_path", "knx.things"),
+        ("influx_path", "influxdb.persist"),
+        ("fenster_path", "fenster.rules"),
+    ]:
+        cfg[key] = str(out / name)
+    cfg["openhab_path"] = str(out)
+    cfg["general"] = {**config["general"], "output_split": output_split}
+    return cfg
+
+
+def _load_house(project):
+    building = knxproject_to_openhab.create_building(project)
+    addresses = knxproject_to_openhab.get_addresses(project)
+    house = knxproject_to_openhab.put_addresses_in_building(building, addresses, project)
+    return house[0]["floors"], addresses
+
+
+def test_streamed_output_matches_string_output(tmp_path):
+    with open(Path(__file__).parent / "Charne.knxproj.json", encoding="utf-8") as f:
+        project = json.load(f)
+
+    def run(streamed):
+        floors, addresses = _load_house(project)
+        out = tmp_path / ("streamed" if streamed else "strings")
+        cfg = _output_config(out)
+        context = ets_to_openhab.GenerationContext(
+            floors=floors, addresses=addresses, configuration=cfg
+        )
+        if streamed:
+            outputs = ets_to_openhab.gen_building(
+                context, writers=ets_to_openhab.open_output_writers(cfg, context)
+            )
+        else:
+            outputs = ets_to_openhab.gen_building(context)
+        ets_to_openhab.export_output(*outputs, configuration=cfg, context=context)
+        return {p.name: p.read_text(encoding="utf8") for p in out.iterdir()}
+
+    streamed = run(True)
+    assert streamed == run(False)
+    assert {"knx.items", "knx.sitemap", "knx.things"} <= set(streamed)
+
+
+def test_unchanged_file_is_not_rewritten(tmp_path):
+    path = tmp_path / "items" / "knx.items"
+    with StreamWriter(path, head="Group Base\n") as writer:
+        writer.write("Switch a\n")
+    assert writer.changed
+    os.utime(path, ns=(0, 0))
+
+    with StreamWriter(path, head="Group Base\n") as same:
+        same.write("Switch a\n")
+    with StreamWriter(tmp_path / "knx.things") as things:
+        things.write("Type switch\n")
+
+    assert not same.changed
+    assert same.digest == writer.digest
+    assert path.stat().st_mtime_ns == 0
+    manifest = write_manifest(tmp_path, {"items": same, "things": things})
+    assert manifest["unchanged"] == ["items"]
+    assert manifest["changed"] == ["things"]
+    assert manifest["files"]["items"]["path"] == "items/knx.items"
+    assert json.loads((tmp_path / OUTPUT_MANIFEST_NAME).read_text(encoding="utf-8")) == manifest
+
+
+def test_part_writer_writes_one_file_per_key(tmp_path):
+    (tmp_path / "knx_map3.items").write_text("Group map3", encoding="utf8")
+    (tmp_path / "knx_custom.items").write_text("Group custom", encoding="utf8")
+
+    with PartWriter(tmp_path / "knx.items", head="Group Base\n") as writer:
+        writer.write("// root\n")
+        writer.open_part("map1", head="// map1\n")
+        writer.write("Group map1\n")
+        writer.open_part("map2")
+        writer.write("Group map2\n")
+        with pytest.raises(ValueError):
+            writer.open_part("map1")
+
+    assert (tmp_path / "knx.items").read_text(encoding="utf8") == "Group Base\n// root\n"
+    assert (tmp_path / "knx_map1.items").read_text(encoding="utf8") == "// map1\nGroup map1\n"
+    assert [p.name for p in part_paths(tmp_path / "knx.items")] == [
+        "knx_map1.items",
+        "knx_map2.items",
+    ]
+    assert writer.removed == [tmp_path / "knx_map3.items"]
+    assert (tmp_path / "knx_custom.items").exists()
+
+
+def test_floor_split_reloads_only_the_changed_floor(tmp_path):
+    with open(Path(__file__).parent / "Charne.knxproj.json", encoding="utf-8") as f:
+        project = json.load(f)
+
+    def run(output_split, rename=None):
+        floors, addresses = _load_house(project)
+        if rename:
+            floors[rename[0]]["rooms"][rename[1]]["Group name"] = "Renamed"
+        cfg = _output_config(tmp_path, output_split)
+        context = ets_to_openhab.GenerationContext(
+            floors=floors, addresses=addresses, configuration=cfg
+        )
+        writers = ets_to_openhab.open_output_writers(cfg, context)
+        ets_to_openhab.gen_building(context, writers=writers)
+        return ets_to_openhab.export_output(*writers, configuration=cfg, context=context)
+
+    single = run("building")
+    single_items = (tmp_path / "knx.items").read_text(encoding="utf8")
+    manifest = run("floor")
+    floors = len(part_paths(tmp_path / "knx.items"))
+    assert floors > 1
+    assert len(part_paths(tmp_path / "knx.things")) == floors
+    assert {f"items_map{nr}" for nr in range(1, floors + 1)} <= set(manifest["files"])
+
+    root = (tmp_path / "knx.items").read_text(encoding="utf8")
+    map1 = (tmp_path / "knx_map1.items").read_text(encoding="utf8")
+    assert "Group           Base" in root and "channel=" not in root
+    assert map1.startswith("Group   map1 ")
+    assert 'channel="knx:device:bridge:generic_map1:' in map1
+    parts = root + "".join(p.read_text(encoding="utf8") for p in part_paths(tmp_path / "knx.items"))
+    items_lines = [line for line in parts.splitlines() if not line.startswith("Group   equipment_")]
+    single_lines = [
+        line for line in single_items.splitlines() if not line.startswith("Group   equipment_")
+    ]
+    assert len(items_lines) == len(single_lines)
+    things = (tmp_path / "knx_map1.things").read_text(encoding="utf8")
+    assert things.startswith("Thing knx:device:bridge:generic_map1 ")
+
+    floor_nr, room_nr = next(
+        (floor_nr, room_nr)
+        for floor_nr, floor in enumerate(_load_house(project)[0])
+        for room_nr, room in enumerate(floor["rooms"])
+        if room["Addresses"]
+    )
+    manifest = run("floor", (floor_nr, room_nr))
+    assert sorted(manifest["changed"]) == [f"items_map{floor_nr + 1}", "sitemap"]
+
+    assert set(run("building")["files"]) == set(single["files"])
+    assert part_paths(tmp_path / "knx.items") == part_paths(tmp_path / "knx.things") == []
+
+
+def test_floor_parts_define_their_own_equipments_and_homekit_instances(tmp_path):
+    with open(Path(__file__).parent / "Charne.knxproj.json", encoding="utf-8") as f:
+        project = json.load(f)
+    floors, addresses = _load_house(project)
+    cfg = _output_config(tmp_path, "floor")
+    context = ets_to_openhab.GenerationContext(
+        floors=floors, addresses=addresses, homekit=True, configuration=cfg
+    )
+    writers = ets_to_openhab.open_output_writers(cfg, context)
+    ets_to_openhab.gen_building(context, writers=writers)
+    ets_to_openhab.export_output(*writers, configuration=cfg, context=context)
+
+    last_instance = 0
+    for path in part_paths(tmp_path / "knx.items"):
+        text = path.read_text(encoding="utf8")
+        defined = set(re.findall(r"^Group   (equipment_\S+)", text, re.MULTILINE))
+        assert set(re.findall(r"[(,](equipment_[^),]+)", text)) <= defined
+        instances = [int(nr) for nr in re.findall(r"Instance=(\d+)", text)]
+        if instances:
+            assert min(instances) > last_instance
+            last_instance = max(instances)
+    assert last_instance > 1
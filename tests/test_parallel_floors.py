@@ -0,0 +1,101 @@
+"""Serial, parallel and concurrent generation runs must give the same output."""
+
+import importlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import ets_to_openhab
+import knxproject_to_openhab
+
+TESTS_DIR = Path(__file__).parent
+
+
+@pytest.fixture(autouse=True)
+def current_module():
+    """Use the imported ets_to_openhab: other tests drop it from sys.modules,
+    and floor workers can only unpickle functions and classes of that module."""
+    global ets_to_openhab
+    ets_to_openhab = importlib.import_module("ets_to_openhab")
+
+
+def _context(project_path):
+    with open(project_path, encoding="utf-8") as f:
+        project = json.load(f)
+    building = knxproject_to_openhab.create_building(project)
+    addresses = knxproject_to_openhab.get_addresses(project)
+    house = knxproject_to_openhab.put_addresses_in_building(building, addresses, project)
+    return ets_to_openhab.GenerationContext(
+        floors=house[0]["floors"], addresses=addresses, homekit=True, alexa=True
+    )
+
+
+def _generate(project_path, floor_workers):
+    context = _context(project_path)
+    output = ets_to_openhab.gen_building(context, floor_workers=floor_workers)
+    return (
+        output,
+        context.windows,
+        context.partial_dimmers,
+        context.export_to_influx,
+        [address["Address"] for address in context.all_addresses],
+    )
+
+
+@pytest.mark.parametrize("project", ["Charne.knxproj.json", "upload.knxprojarchive.json"])
+def test_parallel_floors_match_serial_output(project):
+    serial = _generate(TESTS_DIR / project, 0)
+    parallel = _generate(TESTS_DIR / project, 3)
+
+    assert parallel == serial
+
+
+def test_floor_workers_are_not_forked(monkeypatch):
+    import concurrent.futures
+
+    start_methods = []
+    pool_class = concurrent.futures.ProcessPoolExecutor
+
+    class RecordingPool(pool_class):
+        def __init__(self, *args, mp_context=None, **kwargs):
+            start_methods.append(mp_context and mp_context.get_start_method())
+            super().__init__(*args, mp_context=mp_context, **kwargs)
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", RecordingPool)
+
+    # from a thread, as in the web backend
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        output = pool.submit(_generate, TESTS_DIR / "Charne.knxproj.json", 2).result()
+
+    assert output == _generate(TESTS_DIR / "Charne.knxproj.json", 0)
+    assert start_methods and start_methods[0] in ("forkserver", "spawn")
+
+
+def test_concurrent_contexts_do_not_share_run_state():
+    projects = [TESTS_DIR / "Charne.knxproj.json", TESTS_DIR / "upload.knxprojarchive.json"] * 2
+    serial = [_generate(project, 0) for project in projects]
+    module_state = (list(ets_to_openhab.FENSTERKONTAKTE), list(ets_to_openhab.export_to_influx))
+
+    with ThreadPoolExecutor(max_workers=len(projects)) as pool:
+        concurrent = list(pool.map(lambda project: _generate(project, 0), projects))
+
+    assert concurrent == serial
+    assert (ets_to_openhab.FENSTERKONTAKTE, ets_to_openhab.export_to_influx) == module_state
+
+
+def test_store_records_the_addresses_a_floor_depends_on():
+    store = ets_to_openhab.AddressStore(
+        [
+            {"Address": "1/1/1", "Group name": "Licht"},
+            {"Address": "1/1/2", "Group name": "Licht Status"},
+            {"Address": "1/1/3", "Group name": "Steckdose"},
+        ]
+    )
+    store.observed = set()
+
+    assert "1/1/1" in store
+    assert store.find_by_name(["Licht Status"])["Address"] == "1/1/2"
+
+    assert store.observed == {"1/1/1", "1/1/2"}
@@ -0,0 +1,31 @@
+import os
+
+import pickle_cache
+
+
+def test_store_load_and_clear_by_prefix(tmp_path):
+    assert pickle_cache.store(tmp_path, "a-1", {"x": 1})
+    assert pickle_cache.store(tmp_path, "b-1", [2])
+
+    assert pickle_cache.load(tmp_path, "a-1") == {"x": 1}
+    assert pickle_cache.load(tmp_path, "missing") is None
+    assert pickle_cache.clear(tmp_path, "a-") == 1
+    assert [path.name for path in pickle_cache.entries(tmp_path)] == ["b-1.pickle"]
+
+
+def test_unreadable_entry_is_dropped(tmp_path):
+    pickle_cache.entry_path(tmp_path, "bad").write_bytes(b"not a pickle")
+
+    assert pickle_cache.load(tmp_path, "bad") is None
+    assert pickle_cache.entries(tmp_path) == []
+
+
+def test_evict_removes_least_recently_used_first(tmp_path):
+    for nr, key in enumerate(("old", "used", "new")):
+        pickle_cache.store(tmp_path, key, b"x" * 1000)
+        os.utime(pickle_cache.entry_path(tmp_path, key), (nr, nr))
+    pickle_cache.load(tmp_path, "used")  # marks it as recently used
+
+    pickle_cache.evict(tmp_path, 2500)
+
+    assert sorted(path.stem for path in pickle_cache.entries(tmp_path)) == ["new", "used"]
@@ -0,0 +1,99 @@
+import os
+
+import project_cache
+
+
+class FakeParser:
+    calls = 0
+
+    def __init__(self, path, password, language):
+        self.path = path
+        self.password = password
+        self.language = language
+
+    def parse(self):
+        FakeParser.calls += 1
+        with open(self.path, "rb") as f:
+            return {"content": f.read().decode(), "language": self.language}
+
+
+def _parse(path, cache_dir, **kwargs):
+    return project_cache.parse_project(path, cache_dir=cache_dir, parser=FakeParser, **kwargs)
+
+
+def test_second_parse_is_served_from_cache(tmp_path):
+    archive = tmp_path / "a.knxproj"
+    archive.write_text("project-a")
+    FakeParser.calls = 0
+
+    first, first_cached = _parse(archive, tmp_path / "cache")
+    second, second_cached = _parse(archive, tmp_path / "cache")
+
+    assert (first_cached, second_cached) == (False, True)
+    assert first == second == {"content": "project-a", "language": "de-DE"}
+    assert FakeParser.calls == 1
+
+
+def test_key_depends_on_content_language_and_password(tmp_path):
+    archive = tmp_path / "a.knxproj"
+    archive.write_text("project-a")
+    cache_dir = tmp_path / "cache"
+    FakeParser.calls = 0
+
+    _parse(archive, cache_dir)
+    _parse(archive, cache_dir, language="en-US")
+    _parse(archive, cache_dir, password="secret")
+    archive.write_text("project-b")
+    project, cached = _parse(archive, cache_dir)
+
+    assert FakeParser.calls == 4
+    assert not cached
+    assert project["content"] == "project-b"
+
+
+def test_lru_eviction_and_clear(tmp_path):
+    cache_dir = tmp_path / "cache"
+    project_cache.store("old", {"x": "a" * 1000}, cache_dir)
+    project_cache.store("new", {"x": "b" * 1000}, cache_dir)
+    old_path = cache_dir / "old.pickle"
+    os.utime(old_path, (1, 1))
+
+    project_cache.evict(cache_dir, max_bytes=1500)
+
+    assert not old_path.exists()
+    assert project_cache.load("new", cache_dir) == {"x": "b" * 1000}
+    assert project_cache.clear(cache_dir) == 1
+    assert project_cache.load("new", cache_dir) is None
+
+
+def test_clear_single_archive(tmp_path):
+    cache_dir = tmp_path / "cache"
+    first = tmp_path / "a.knxproj"
+    first.write_text("project-a")
+    second = tmp_path / "b.knxproj"
+    second.write_text("project-b")
+    _parse(first, cache_dir)
+    _parse(second, cache_dir)
+
+    assert project_cache.clear(cache_dir, first) == 1
+    assert _parse(first, cache_dir)[1] is False
+    assert _parse(second, cache_dir)[1] is True
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    (cache_dir / "broken.pickle").write_bytes(b"not a pickle")
+
+    assert project_cache.load("broken", cache_dir) is None
+    assert not (cache_dir / "broken.pickle").exists()
+
+
+def test_default_cache_dir_is_below_the_cache_root(tmp_path, monkeypatch):
+    monkeypatch.setenv("KNX_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("KNX_PROJECT_CACHE_DIR", raising=False)
+    assert project_cache.get_cache_dir() == tmp_path / "projects"
+
+    monkeypatch.setenv("KNX_PROJECT_CACHE_DIR", str(tmp_path / "own"))
+    assert project_cache.get_cache_dir() == tmp_path / "own"
+    assert project_cache.get_cache_dir(tmp_path / "arg") == tmp_path / "arg"
@@ -0,0 +1,118 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import project_dump
+
+TESTS_DIR = Path(__file__).parent
+CHARNE = TESTS_DIR / "Charne.knxproj.json"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_streaming_loader_matches_json_load(monkeypatch, chunk_size):
+    monkeypatch.setattr(project_dump, "CHUNK_SIZE", chunk_size)
+    with open(TESTS_DIR / "fixtures" / "mini_project.json", encoding="utf-8") as f:
+        expected = json.load(f)
+
+    project = project_dump.load_project_dump(TESTS_DIR / "fixtures" / "mini_project.json")
+
+    assert project == {k: v for k, v in expected.items() if k in project_dump.PROJECT_SECTIONS}
+
+
+def test_large_dump_matches_json_load():
+    with open(CHARNE, encoding="utf-8") as f:
+        expected = json.load(f)
+
+    project = project_dump.load_project_dump(CHARNE)
+
+    assert set(project) == set(project_dump.PROJECT_SECTIONS)
+    for section in project_dump.PROJECT_SECTIONS:
+        assert project[section] == expected[section]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 4096])
+def test_unused_sections_are_skipped(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(project_dump, "CHUNK_SIZE", chunk_size)
+    dump = {
+        "functions": {"a": 'q\\"}{[', "b": ["\\", '"', {"c": []}]},
+        "info": {"comment": 'é\\"x'},
+        "number": 12345,
+        "locations": [1, 2.5, True, None, "}"],
+    }
+    path = tmp_path / "dump.json"
+    path.write_text(json.dumps(dump, indent=2), encoding="utf-8")
+
+    assert project_dump.load_project_dump(path) == {
+        "info": dump["info"],
+        "locations": dump["locations"],
+    }
+    assert project_dump.load_project_dump(path, ("number", "functions")) == {
+        "number": 12345,
+        "functions": dump["functions"],
+    }
+
+
+def test_sections_are_decoded_one_member_at_a_time(tmp_path, monkeypatch):
+    monkeypatch.setattr(project_dump, "CHUNK_SIZE", 64)
+    dump = {
+        "communication_objects": {
+            f"1.1.{i}/O-{i}": {"text": "x" * 40, "nr": i} for i in range(500)
+        },
+        "group_addresses": [{"address": f"1/1/{i}"} for i in range(500)],
+    }
+    path = tmp_path / "dump.json"
+    path.write_text(json.dumps(dump), encoding="utf-8")
+    buffered = []
+    fill = project_dump._SectionReader._fill
+
+    def recording_fill(reader, size=None):
+        filled = fill(reader, size)
+        buffered.append(len(reader.buf))
+        return filled
+
+    monkeypatch.setattr(project_dump._SectionReader, "_fill", recording_fill)
+
+    project = project_dump.load_project_dump(path, ("communication_objects", "group_addresses"))
+
+    assert project == dump
+    # about one member of text is buffered, not a whole section
+    assert max(buffered) < 300
+
+
+def test_truncated_dump_raises(tmp_path):
+    path = tmp_path / "dump.json"
+    path.write_text('{"other": [1, 2], "info": {"comment": ', encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        project_dump.load_project_dump(path)
+
+
+@pytest.mark.parametrize("compression", ["none", "gzip", "zstd"])
+@pytest.mark.parametrize("compact", [False, True])
+def test_written_dump_roundtrips(tmp_path, compression, compact):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    with open(TESTS_DIR / "fixtures" / "mini_project.json", encoding="utf-8") as f:
+        project = json.load(f)
+
+    thread = project_dump.write_project_dump(
+        project, "mini.knxproj", tmp_path, compression, compact, background=True
+    )
+    thread.join()
+
+    path = project_dump.get_dump_path("mini.knxproj", tmp_path, compression)
+    assert path.name == "mini.knxproj" + project_dump.COMPRESSION_SUFFIXES[compression]
+    loaded = project_dump.load_project_dump(path)
+    assert loaded == {k: v for k, v in project.items() if k in project_dump.PROJECT_SECTIONS}
+
+
+def test_dump_is_serialized_before_background_write(tmp_path):
+    project = {"info": {"comment": "before"}}
+
+    thread = project_dump.write_project_dump(project, "p.knxproj", tmp_path, background=True)
+    project["info"]["comment"] = "after"
+    thread.join()
+
+    loaded = project_dump.load_project_dump(tmp_path / "p.knxproj.json", ("info",))
+    assert loaded == {"info": {"comment": "before"}}
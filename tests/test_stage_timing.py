@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from stage_timing import TIMING_REPORT_NAME, StageTimer
+
+
+def test_stages_are_recorded_and_reported(tmp_path):
+    finished = []
+    timer = StageTimer(on_stage=finished.append)
+
+    with timer.stage("first"):
+        sum(range(1000))
+    with pytest.raises(RuntimeError):
+        with timer.stage("failing"):
+            raise RuntimeError("boom")
+
+    assert [s["stage"] for s in timer.stages] == ["first", "failing"]
+    assert finished == timer.stages
+    assert all(s["wall_s"] >= 0 and s["cpu_s"] >= 0 for s in timer.stages)
+
+    path = timer.write_report(tmp_path)
+    assert path.name == TIMING_REPORT_NAME
+    report = json.loads(path.read_text(encoding="utf-8"))
+    assert report["stages"] == timer.stages
+    assert report["total"]["wall_s"] == pytest.approx(sum(s["wall_s"] for s in timer.stages))
+
+    table = timer.format_table().splitlines()
+    assert table[0].split() == ["Stage", "Wall", "[s]", "CPU", "[s]"]
+    assert table[-1].startswith("total")
+
+
+def test_run_project_writes_timing_report(tmp_path, monkeypatch):
+    import knxproject_to_openhab as k2o
+
+    monkeypatch.setitem(k2o.config, "openhab_path", str(tmp_path))
+    for key in k2o.OUTPUT_PATH_KEYS:
+        monkeypatch.setitem(k2o.config, key, str(tmp_path / key / "out"))
+
+    mini_project = Path(__file__).parent / "fixtures" / "mini_project.json"
+    timer = k2o.run_project(mini_project, read_dump=True)
+
+    stages = [s["stage"] for s in timer.stages]
+    assert stages == [
+        "load_dump",
+        "create_building",
+        "get_addresses",
+        "put_addresses_in_building",
+        "gen_building",
+        "check_unused_addresses",
+        "export_output",
+    ]
+    report = json.loads((tmp_path / TIMING_REPORT_NAME).read_text(encoding="utf-8"))
+    assert set(report["counters"]["normalize_string"]) == {"hits", "misses"}
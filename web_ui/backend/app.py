@@ -747,14 +747,16 @@ if FLASK_AVAILABLE:
 
             # Load project (json dump or parse knxproj)
             if temp_path.lower().endswith(".json"):
-                with open(temp_path, "r", encoding="utf8") as file:
-                    project = json.load(file)
+                import project_dump
+
+                project = project_dump.load_project_dump(temp_path)
             else:
-                # Parse knxproj archive using XKNXProj
-                from xknxproject.xknxproj import XKNXProj
+                # Parse knxproj archive (or reuse the cached parse result)
+                import project_cache
 
-                knxproj = XKNXProj(path=temp_path, password=password, language="de-DE")
-                project = knxproj.parse()
+                project, _ = project_cache.parse_project(
+                    temp_path, password=password, language="de-DE", cache_dir=job_mgr.cache_dir
+                )
 
             # Extract project metadata
             import importlib
@@ -899,14 +901,16 @@ if FLASK_AVAILABLE:
 
             # Load project (json dump or parse knxproj)
             if input_path.lower().endswith(".json"):
-                with open(input_path, "r", encoding="utf8") as file:
-                    project = json.load(file)
+                import project_dump
+
+                project = project_dump.load_project_dump(input_path)
             else:
-                # Parse knxproj archive using XKNXProj
-                from xknxproject.xknxproj import XKNXProj
+                # Parse knxproj archive (or reuse the cached parse result)
+                import project_cache
 
-                knxproj = XKNXProj(path=input_path, password=password, language="de-DE")
-                project = knxproj.parse()
+                project, _ = project_cache.parse_project(
+                    input_path, password=password, language="de-DE", cache_dir=job_mgr.cache_dir
+                )
 
             # Extract project metadata
             import importlib
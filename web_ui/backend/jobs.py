@@ -13,19 +13,61 @@ import traceback
 import uuid
 from concurrent.futures import ThreadPoolExecutor
 
+import project_cache
+import project_dump
 from completeness import check_completeness, iter_thing_lines
+from output_writers import file_digest, part_paths
+from stage_timing import TIMING_REPORT_NAME, StageTimer
 
 from .storage import ensure_dirs, load_jobs, save_job, save_jobs
 
 logger = logging.getLogger(__name__)
 
 
+class JobLogHandler(logging.Handler):
+    """Passes the log records of one job thread on as job log messages.
+
+    The generator reports through ``logging``. Filtering by thread keeps the
+    records of concurrent jobs apart; swapping ``sys.stdout`` (which
+    ``contextlib.redirect_stdout`` does as well) is process-wide and cannot.
+    """
+
+    def __init__(self, send, thread_id=None):
+        super().__init__()
+        self.send = send
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+
+    def emit(self, record):
+        if record.thread != self.thread_id:
+            return
+        try:
+            message = record.getMessage()
+        except Exception:
+            self.handleError(record)
+            return
+        if record.levelno >= logging.ERROR:
+            level = "error"
+        elif record.levelno >= logging.WARNING:
+            level = "warning"
+        else:
+            level = "info"
+        self.send({"type": "info", "level": level, "message": message})
+
+
 class JobManager:
     def __init__(self, cfg):
         self.cfg = cfg
         # Use the configured backup directory from config, with a sensible default
         jobs_dir_config = cfg.get("jobs_dir", "var/lib/knx_to_openhab")
         backups_dir_config = cfg.get("backups_dir", "var/backups/knx_to_openhab")
+        # parsed projects: below the shared cache root unless configured
+        cache_dir_config = cfg.get("cache_dir") or str(project_cache.get_cache_dir())
+        # room fragments: in the job storage area unless configured
+        fragment_cache_dir_config = (
+            cfg.get("fragment_cache_dir")
+            or os.environ.get("KNX_FRAGMENT_CACHE_DIR")
+            or os.path.join(jobs_dir_config, "fragments")
+        )
 
         # If paths are relative, make them relative to project root
         project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
@@ -39,6 +81,16 @@ class JobManager:
         else:
             self.backups_dir = backups_dir_config
 
+        if not os.path.isabs(cache_dir_config):
+            self.cache_dir = os.path.join(project_root, cache_dir_config)
+        else:
+            self.cache_dir = cache_dir_config
+
+        if not os.path.isabs(fragment_cache_dir_config):
+            self.fragment_cache_dir = os.path.join(project_root, fragment_cache_dir_config)
+        else:
+            self.fragment_cache_dir = fragment_cache_dir_config
+
         ensure_dirs([self.jobs_dir, self.backups_dir])
         self._jobs = load_jobs(self.jobs_dir)
         self.queues = {}
@@ -153,63 +205,83 @@ class JobManager:
             # Periodic save? For now save at the end or on certain events
         q.put(msg)
 
+    def _log_stage(self, job_id, q, record):
+        """Stream the timing of a finished pipeline stage as a stats event."""
+        self._log_to_queue(
+            job_id,
+            q,
+            {
+                "type": "stats",
+                "level": "info",
+                "message": (
+                    f"stage {record['stage']}: {record['wall_s']:.3f} s wall, "
+                    f"{record['cpu_s']:.3f} s CPU"
+                ),
+                "stage": record,
+            },
+        )
+
     def _run_job(self, job_id):
         job = self._jobs[job_id]
         q = self.queues[job_id]
         job["status"] = "running"
         save_jobs(self.jobs_dir, self._jobs)
 
+        timer = StageTimer(on_stage=lambda record: self._log_stage(job_id, q, record))
+
         # create backup of current openhab folder
         openhab_path = self.cfg.get("openhab_path", "openhab")
-        ts = __import__("time").strftime("%Y%m%d-%H%M%S")
-        backup_name = f"{job_id}-{ts}.tar.gz"
-        backup_path = os.path.join(self.backups_dir, backup_name)
-        try:
-            if os.path.exists(openhab_path):
-                with tarfile.open(backup_path, "w:gz") as tar:
-                    tar.add(openhab_path, arcname=os.path.basename(openhab_path))
-                job["backups"].append({"name": backup_name, "path": backup_path, "ts": ts})
-                save_jobs(self.jobs_dir, self._jobs)
-                self._log_to_queue(
-                    job_id,
-                    q,
-                    {
-                        "type": "backup",
-                        "level": "info",
-                        "message": f"backup created: {backup_name}",
-                    },
-                )
-                # enforce retention immediately after creating backup
-                try:
-                    self.enforce_retention()
-                    self._log_to_queue(
-                        job_id,
-                        q,
-                        {
-                            "type": "info",
-                            "level": "debug",
-                            "message": "retention enforced",
-                        },
-                    )
-                except Exception as re:
+        with timer.stage("backup"):
+            ts = __import__("time").strftime("%Y%m%d-%H%M%S")
+            backup_name = f"{job_id}-{ts}.tar.gz"
+            backup_path = os.path.join(self.backups_dir, backup_name)
+            try:
+                if os.path.exists(openhab_path):
+                    with tarfile.open(backup_path, "w:gz") as tar:
+                        tar.add(openhab_path, arcname=os.path.basename(openhab_path))
+                    job["backups"].append({"name": backup_name, "path": backup_path, "ts": ts})
+                    save_jobs(self.jobs_dir, self._jobs)
                     self._log_to_queue(
                         job_id,
                         q,
                         {
-                            "type": "error",
-                            "level": "warning",
-                            "message": f"retention error: {re}",
+                            "type": "backup",
+                            "level": "info",
+                            "message": f"backup created: {backup_name}",
                         },
                     )
-        except Exception as e:
-            self._log_to_queue(
-                job_id,
-                q,
-                {"type": "error", "level": "error", "message": f"backup failed: {e}"},
-            )
+                    # enforce retention immediately after creating backup
+                    try:
+                        self.enforce_retention()
+                        self._log_to_queue(
+                            job_id,
+                            q,
+                            {
+                                "type": "info",
+                                "level": "debug",
+                                "message": "retention enforced",
+                            },
+                        )
+                    except Exception as re:
+                        self._log_to_queue(
+                            job_id,
+                            q,
+                            {
+                                "type": "error",
+                                "level": "warning",
+                                "message": f"retention error: {re}",
+                            },
+                        )
+            except Exception as e:
+                self._log_to_queue(
+                    job_id,
+                    q,
+                    {"type": "error", "level": "error", "message": f"backup failed: {e}"},
+                )
 
         # Process logic
-        original_openhab_path = None
+        log_handler = JobLogHandler(lambda msg: self._log_to_queue(job_id, q, msg))
+        logging.getLogger().addHandler(log_handler)
         try:
             self._log_to_queue(
                 job_id,
@@ -220,13 +292,8 @@ class JobManager:
                     "message": "start in-process generation",
                 },
             )
-            import copy
             import importlib
 
-            knxmod = importlib.import_module("knxproject_to_openhab")
-            etsmod = importlib.import_module("ets_to_openhab")
-            importlib.reload(etsmod)  # Ensure we use the latest code
-
             # Setup Staging
             staging_dir = os.path.join(self.jobs_dir, job_id, "staging")
             ensure_dirs([staging_dir])
@@ -235,18 +302,17 @@ class JobManager:
             project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
             if project_root not in sys.path:
                 sys.path.insert(0, project_root)
-            import config as global_config_module
+            import config as config_module
 
-            importlib.reload(global_config_module)  # Reload to get fresh config
+            # Every job reads config.json again (a cached snapshot unless it
+            # changed) into its own config; the shared config is never touched
+            snapshot = config_module.load_snapshot()
+            staged_config = config_module.resolve_config(snapshot)
 
-            # Create a copy of the config dict to modify
-            staged_config = copy.copy(global_config_module.config)
-            staged_config["openhab_path"] = os.path.join(staging_dir, "openhab")
+            knxmod = importlib.import_module("knxproject_to_openhab")
+            etsmod = importlib.import_module("ets_to_openhab")
 
-            # Ensure knxproject_to_openhab uses staged openhab_path for reports
-            original_openhab_path = global_config_module.config.get("openhab_path")
-            global_config_module.config["openhab_path"] = staged_config["openhab_path"]
-            knxmod.config["openhab_path"] = staged_config["openhab_path"]
+            staged_config["openhab_path"] = os.path.join(staging_dir, "openhab")
 
             # Define output keys to override
             output_keys = [
@@ -290,165 +356,151 @@ class JobManager:
                     staged_config[key] = staged_path
                     stage_mapping[staged_path] = real_path
 
-            # Capture stdout/stderr for ENTIRE generation process
-            old_stdout = sys.stdout
-            old_stderr = sys.stderr
-            captured_output = io.StringIO()
-            sys.stdout = captured_output
-            sys.stderr = captured_output
-
-            try:
-                # load project (json dump or parse knxproj)
-                if job["input"].lower().endswith(".json"):
-                    with open(job["input"], "r", encoding="utf8") as f:
-                        project = json.load(f)
-                    # Temporarily restore stdout to log message
-                    sys.stdout = old_stdout
-                    self._log_to_queue(
-                        job_id,
-                        q,
-                        {
-                            "type": "info",
-                            "level": "info",
-                            "message": "read project JSON dump",
-                        },
-                    )
-                    sys.stdout = captured_output
-                else:
-                    # try to parse knxproj archive using XKNXProj
-                    from xknxproject.xknxproj import XKNXProj
-
-                    sys.stdout = old_stdout
-                    self._log_to_queue(
-                        job_id,
-                        q,
-                        {
-                            "type": "info",
-                            "level": "info",
-                            "message": "parsing knxproj archive (this may take a while)",
-                        },
-                    )
-                    sys.stdout = captured_output
-                    pwd = job.get("password")
-                    knxproj = XKNXProj(path=job["input"], password=pwd, language="de-DE")
-                    project = knxproj.parse()
-                    sys.stdout = old_stdout
-                    self._log_to_queue(
-                        job_id,
-                        q,
-                        {"type": "info", "level": "info", "message": "parsed knxproj"},
-                    )
-                    sys.stdout = captured_output
-
-                # run the same sequence as the CLI main()
-                building = knxmod.create_building(project)
-                addresses = knxmod.get_addresses(project)
-                sys.stdout = old_stdout
+            # load project (json dump or parse knxproj)
+            if job["input"].lower().endswith(".json"):
+                with timer.stage("load_dump"):
+                    project = project_dump.load_project_dump(job["input"])
                 self._log_to_queue(
                     job_id,
                     q,
                     {
                         "type": "info",
                         "level": "info",
-                        "message": f"{len(addresses)} addresses extracted",
+                        "message": "read project JSON dump",
                     },
                 )
-                sys.stdout = captured_output
-
-                house = knxmod.put_addresses_in_building(building, addresses, project)
-                prj_name = house[0].get("name_long") if house else None
-                ip = knxmod.get_gateway_ip(project)
-                homekit_enabled = knxmod.is_homekit_enabled(project)
-                alexa_enabled = knxmod.is_alexa_enabled(project)
-
-                etsmod.floors = house[0]["floors"] if house else []
-                etsmod.all_addresses = addresses
-                etsmod.GWIP = ip
-                etsmod.B_HOMEKIT = homekit_enabled
-                etsmod.B_ALEXA = alexa_enabled
-                if prj_name:
-                    etsmod.PRJ_NAME = prj_name
-
-                sys.stdout = old_stdout
+            else:
+                # parse knxproj archive (or reuse the cached parse result)
                 self._log_to_queue(
                     job_id,
                     q,
                     {
                         "type": "info",
                         "level": "info",
-                        "message": "generating files (staged)...",
+                        "message": "parsing knxproj archive (this may take a while)",
+                    },
+                )
+                pwd = job.get("password")
+                with timer.stage("parse"):
+                    project, from_cache = project_cache.parse_project(
+                        job["input"], password=pwd, language="de-DE", cache_dir=self.cache_dir
+                    )
+                self._log_to_queue(
+                    job_id,
+                    q,
+                    {
+                        "type": "info",
+                        "level": "info",
+                        "message": (
+                            "loaded parsed knxproj from cache" if from_cache else "parsed knxproj"
+                        ),
                     },
                 )
-                sys.stdout = captured_output
 
-                # ets_to_openhab.main() writes output files to STAGING via injected config
-                etsmod.main(configuration=staged_config)
+            # run the same sequence as the CLI main()
+            with timer.stage("create_building"):
+                building = knxmod.create_building(project, configuration=staged_config)
+            with timer.stage("get_addresses"):
+                addresses = knxmod.get_addresses(project, configuration=staged_config)
+            self._log_to_queue(
+                job_id,
+                q,
+                {
+                    "type": "info",
+                    "level": "info",
+                    "message": f"{len(addresses)} addresses extracted",
+                },
+            )
 
-                # Generate completeness report from staged knx.things
-                try:
-                    report_path = self._write_completeness_report(
-                        staged_config.get("things_path"),
-                        staged_config.get("openhab_path", ""),
-                    )
-                    if report_path:
-                        self._log_to_queue(
-                            job_id,
-                            q,
-                            {
-                                "type": "info",
-                                "level": "info",
-                                "message": f"completeness report written: {report_path}",
-                            },
-                        )
-                except Exception as report_err:
+            with timer.stage("put_addresses_in_building"):
+                house = knxmod.put_addresses_in_building(
+                    building, addresses, project, configuration=staged_config
+                )
+            prj_name = house[0].get("name_long") if house else None
+            ip = knxmod.get_gateway_ip(project, configuration=staged_config)
+            homekit_enabled = knxmod.is_homekit_enabled(project)
+            alexa_enabled = knxmod.is_alexa_enabled(project)
+
+            # All run state lives in the context, so jobs share the warm module
+            context = etsmod.GenerationContext(
+                floors=house[0]["floors"] if house else [],
+                addresses=addresses,
+                gwip=ip,
+                homekit=homekit_enabled,
+                alexa=alexa_enabled,
+                prj_name=prj_name or etsmod.DEFAULT_PRJ_NAME,
+                configuration=staged_config,
+                fragment_cache=etsmod.default_fragment_cache(
+                    staged_config, self.fragment_cache_dir
+                ),
+                snapshot=snapshot,
+            )
+
+            self._log_to_queue(
+                job_id,
+                q,
+                {
+                    "type": "info",
+                    "level": "info",
+                    "message": "generating files (staged)...",
+                },
+            )
+
+            # writes the output files to STAGING; generate() only uses the context
+            etsmod.generate(context, timer)
+
+            # items and things split per floor (general.output_split): stage the
+            # part files too and remember the live parts this run no longer has
+            stage_removals = []
+            for key in ("items_path", "things_path"):
+                real_root = stage_mapping.get(staged_config.get(key))
+                if not real_root:
+                    continue
+                staged_parts = part_paths(staged_config[key])
+                for part in staged_parts:
+                    stage_mapping[str(part)] = os.path.join(os.path.dirname(real_root), part.name)
+                names = {part.name for part in staged_parts}
+                stage_removals += [
+                    str(part) for part in part_paths(real_root) if part.name not in names
+                ]
+            job["stage_removals"] = stage_removals
+
+            # Generate completeness report from staged knx.things
+            try:
+                report_path = self._write_completeness_report(
+                    staged_config.get("things_path"), context.report_dir
+                )
+                if report_path:
                     self._log_to_queue(
                         job_id,
                         q,
                         {
-                            "type": "error",
-                            "level": "warning",
-                            "message": f"completeness report failed: {report_err}",
+                            "type": "info",
+                            "level": "info",
+                            "message": f"completeness report written: {report_path}",
                         },
                     )
+            except Exception as report_err:
+                self._log_to_queue(
+                    job_id,
+                    q,
+                    {
+                        "type": "error",
+                        "level": "warning",
+                        "message": f"completeness report failed: {report_err}",
+                    },
+                )
 
-                # Add reports to stage mapping if present
-                for report in [
-                    "unknown_report.json",
-                    "partial_report.json",
-                    "completeness_report.json",
-                ]:
-                    staged_report = os.path.join(staged_config.get("openhab_path", ""), report)
-                    if staged_report and os.path.exists(staged_report):
-                        real_report = os.path.join(openhab_path, report)
-                        stage_mapping[staged_report] = real_report
-
-            finally:
-                sys.stdout = old_stdout
-                sys.stderr = old_stderr
-
-                # Send captured output line by line to the queue
-                captured = captured_output.getvalue()
-                if captured:
-                    for line in captured.strip().split("\n"):
-                        if line.strip():
-                            level = "info"
-                            message = line.strip()
-                            if message.startswith("WARNING:"):
-                                level = "warning"
-                                message = message[len("WARNING:") :].strip()
-                            elif message.startswith("ERROR:"):
-                                level = "error"
-                                message = message[len("ERROR:") :].strip()
-                            elif "WARNING:" in message and ":" in message:
-                                level = "warning"
-                                parts = message.split(":")
-                                if len(parts) > 2:
-                                    message = ":".join(parts[2:]).strip()
-                            self._log_to_queue(
-                                job_id,
-                                q,
-                                {"type": "info", "level": level, "message": message},
-                            )
+            # Add reports to stage mapping if present
+            for report in [
+                "unknown_report.json",
+                "partial_report.json",
+                "completeness_report.json",
+            ]:
+                staged_report = os.path.join(context.report_dir, report)
+                if os.path.exists(staged_report):
+                    real_report = os.path.join(openhab_path, report)
+                    stage_mapping[staged_report] = real_report
 
             # Save staging info to job
             job["staging_dir"] = staging_dir
@@ -457,7 +509,8 @@ class JobManager:
 
             # Compute statistics by comparing STAGED vs LIVE/BACKUP
             try:
-                detailed_stats = self._compute_staged_stats(stage_mapping, openhab_path)
+                with timer.stage("stats"):
+                    detailed_stats = self._compute_staged_stats(stage_mapping, openhab_path)
                 job["stats"] = detailed_stats
 
                 for fn, stat in sorted(job["stats"].items()):
@@ -484,6 +537,25 @@ class JobManager:
                 # fallback empty stats
                 job["stats"] = {}
 
+            # stage timings go next to the other reports
+            timing_report = timer.write_report(context.report_dir)
+            if timing_report:
+                stage_mapping[str(timing_report)] = os.path.join(openhab_path, TIMING_REPORT_NAME)
+
+            # content hashes of the staged files, compared with the live files
+            job["manifest"] = self._compute_manifest(stage_mapping, openhab_path)
+            if job["manifest"]["unchanged"]:
+                self._log_to_queue(
+                    job_id,
+                    q,
+                    {
+                        "type": "info",
+                        "level": "info",
+                        "message": "unchanged, will not be rewritten on deploy: "
+                        + ", ".join(job["manifest"]["unchanged"]),
+                    },
+                )
+
             job["status"] = "completed"
             self._log_to_queue(
                 job_id,
@@ -512,15 +584,7 @@ class JobManager:
             # TB might be long, but we need it for debugging
             self._log_to_queue(job_id, q, {"type": "error", "level": "error", "message": tb})
         finally:
-            if original_openhab_path is not None:
-                try:
-                    import config as global_config_module
-                    import knxproject_to_openhab as knxmod
-
-                    global_config_module.config["openhab_path"] = original_openhab_path
-                    knxmod.config["openhab_path"] = original_openhab_path
-                except Exception:
-                    pass
+            logging.getLogger().removeHandler(log_handler)
             save_jobs(self.jobs_dir, self._jobs)
             q.put(None)
 
@@ -541,8 +605,10 @@ class JobManager:
         if not things_path or not os.path.exists(things_path):
             return None
 
-        with open(things_path, "r", encoding="utf-8", errors="ignore") as f:
-            things_text = f.read()
+        things_text = ""
+        for path in [things_path, *part_paths(things_path)]:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                things_text += f.read()
 
         missing_required_tuples, recommended_missing_tuples = check_completeness(things_text)
 
@@ -727,6 +793,30 @@ class JobManager:
 
         return stats
 
+    def _compute_manifest(self, stage_mapping, openhab_path):
+        """Content hashes of the staged files and whether they differ from the live files."""
+        files = {}
+        for staged_path, real_path in stage_mapping.items():
+            staged_digest = file_digest(staged_path)
+            live_digest = file_digest(real_path)
+            files[self._live_name(real_path, openhab_path)] = {
+                "sha256": staged_digest,
+                "live_sha256": live_digest,
+                "changed": staged_digest != live_digest,
+            }
+        return {
+            "files": files,
+            "changed": [name for name, entry in files.items() if entry["changed"]],
+            "unchanged": [name for name, entry in files.items() if not entry["changed"]],
+        }
+
+    def _live_name(self, real_path, openhab_path):
+        """Path of a live file relative to the openHAB directory (if it is inside)."""
+        relpath = os.path.relpath(os.path.abspath(real_path), os.path.abspath(openhab_path))
+        if relpath.startswith(".."):
+            return real_path
+        return relpath.replace(os.sep, "/")
+
     def _compute_staged_stats(self, stage_mapping, openhab_path):
         """Compute stats by comparing staged files with live files."""
         stats = {}
@@ -1135,7 +1225,8 @@ class JobManager:
             # Proceed? Or abort? Abort is safer.
             raise Exception(f"Backup failed, aborting deploy: {e}")
 
-        deployed_count = 0
+        changed = []
+        unchanged = []
         try:
             for staged_path, real_path in mapping.items():
                 if os.path.exists(staged_path):
@@ -1145,15 +1236,33 @@ class JobManager:
                     if not os.path.isabs(target):
                         target = os.path.abspath(target)
 
+                    name = self._live_name(target, openhab_path)
+                    # rewriting an unchanged file would make openHAB reload it
+                    if file_digest(staged_path) == file_digest(target):
+                        unchanged.append(name)
+                        continue
                     os.makedirs(os.path.dirname(target), exist_ok=True)
                     shutil.copy2(staged_path, target)
-                    deployed_count += 1
+                    changed.append(name)
                 else:
                     logger.warning(f"Staged file missing: {staged_path}")
 
+            # per-floor files of floors that no longer exist
+            removed = []
+            for path in job.get("stage_removals", []):
+                if os.path.exists(path):
+                    os.remove(path)
+                    removed.append(self._live_name(path, openhab_path))
+
             job["deployed"] = True
+            job["deploy_result"] = {"changed": changed, "unchanged": unchanged, "removed": removed}
             save_jobs(self.jobs_dir, self._jobs)
-            return True, f"Deployed {deployed_count} files."
+            message = f"Deployed {len(changed)} files."
+            if unchanged:
+                message += f" {len(unchanged)} unchanged files kept (no openHAB reload)."
+            if removed:
+                message += f" {len(removed)} stale files removed."
+            return True, message
 
         except Exception as e:
             logger.error(f"Deploy failed: {e}")
@@ -8,8 +8,6 @@ import subprocess
 from datetime import datetime
 from typing import Any, Dict, Optional, Sequence, Tuple
 
-import requests  # type: ignore[import]
-
 
 class Updater:
     """Handles version checking and updates from GitHub using Git commits."""
@@ -105,6 +103,9 @@ class Updater:
         Returns:
             Tuple of (success, commit_info_dict or None)
         """
+        # imported here: requests is slow to import and only needed for this check
+        import requests  # type: ignore[import]
+
         try:
             # Extract owner and repo from URL
             # e.g., https://github.com/diddip21/knx_to_openhab -> diddip21/knx_to_openhab
@@ -161,6 +161,10 @@ function showJobDetail(jobId) {
           <tr><td>Created:</td><td>${new Date(j.created * 1000).toLocaleString()}</td></tr>
           <tr><td>Backups:</td><td>${j.backups.length}</td></tr>
           ${j.backups.length > 0 ? `<tr><td>Latest Backup:</td><td>${j.backups[j.backups.length - 1].name}</td></tr>` : ''}
+          ${j.manifest ? `<tr><td>Changed files:</td><td>${j.manifest.changed.join(', ') || 'none'}</td></tr>` : ''}
+          ${j.manifest && j.manifest.unchanged.length > 0 ? `<tr><td>Unchanged files:</td><td>${j.manifest.unchanged.join(', ')}</td></tr>` : ''}
+          ${j.deploy_result ? `<tr><td>openHAB reloads avoided:</td><td>${j.deploy_result.unchanged.length}</td></tr>` : ''}
+          ${j.stage_removals && j.stage_removals.length > 0 ? `<tr><td>Stale files to remove:</td><td>${j.stage_removals.length}</td></tr>` : ''}
         </table>
       `
 